@@ -0,0 +1,149 @@
+import argparse
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Iterator
+
+from sqlalchemy import ColumnElement, Select, delete, exists, insert, select, union_all
+from sqlalchemy.orm import Session, aliased
+
+from crud_backend.models.archive import ArchivedProject, ArchivedTask
+from crud_backend.models.projects import Project, ProjectStatus
+from crud_backend.models.stats import ProjectTaskStats
+from crud_backend.models.tasks import Task, TaskStatus
+
+# Pares (tabela quente, tabela de arquivo) com as mesmas colunas
+ARCHIVES: dict[type[Any], type[Any]] = {
+    Project: ArchivedProject,
+    Task: ArchivedTask,
+}
+
+
+@dataclass
+class ArchiveReport:
+    tasks: int = 0
+    projects: int = 0
+
+
+def _columns(entity: type[Any]) -> list[str]:
+    return [column.key for column in entity.__table__.columns]
+
+
+def select_rows(
+    entity: type[Any],
+    conditions: Callable[[type[Any]], list[ColumnElement[bool]]],
+    include_archived: bool,
+) -> tuple[Any, Select[Any]]:
+    """Consulta `entity` com os filtros e, com `include_archived`, também o arquivo.
+
+    Retorna a entidade para ordenar e paginar junto com a consulta. Na união os
+    filtros são aplicados em cada tabela, para que cada uma use os próprios índices.
+    """
+    if not include_archived:
+        return entity, select(entity).where(*conditions(entity))
+
+    archive = ARCHIVES[entity]
+    columns = _columns(entity)
+    rows = union_all(
+        select(*(getattr(entity, name) for name in columns)).where(*conditions(entity)),
+        select(*(getattr(archive, name) for name in columns)).where(
+            *conditions(archive)
+        ),
+    ).subquery()
+    archived_entity = aliased(entity, rows)
+
+    return archived_entity, select(archived_entity)
+
+
+def _batches(
+    session: Session, query: Select[tuple[int]], batch_size: int
+) -> Iterator[list[int]]:
+    """Seleciona os IDs a arquivar em lotes, pulando linhas travadas por escritas.
+
+    Sem ORDER BY, para que a busca use o índice parcial das linhas `deleted`.
+    """
+    query = query.limit(batch_size)
+    if session.get_bind().dialect.name == "postgresql":
+        query = query.with_for_update(skip_locked=True)
+
+    while ids := list(session.scalars(query)):
+        yield ids
+        if len(ids) < batch_size:
+            return
+
+
+def _move(session: Session, entity: type[Any], ids: list[int]) -> None:
+    columns = _columns(entity)
+    session.execute(
+        insert(ARCHIVES[entity]).from_select(
+            columns,
+            select(*(getattr(entity, name) for name in columns)).where(
+                entity.id.in_(ids)
+            ),
+        )
+    )
+    session.execute(delete(entity).where(entity.id.in_(ids)))
+
+
+def archive_deleted(
+    session: Session, older_than: timedelta, batch_size: int
+) -> ArchiveReport:
+    """Move para as tabelas de arquivo as linhas `deleted` há mais de `older_than`.
+
+    A idade conta a partir do `updated_at`. Cada lote de até `batch_size` linhas
+    é uma transação própria, mantendo os bloqueios curtos. Um projeto arquivado
+    leva junto as tarefas restantes, e só sai de `projects` quando não sobra
+    nenhuma.
+    """
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - older_than
+    report = ArchiveReport()
+
+    expired_projects = select(Project.id).where(
+        Project.status == ProjectStatus.deleted, Project.updated_at < cutoff
+    )
+    task_batches = [
+        select(Task.id).where(
+            Task.status == TaskStatus.deleted, Task.updated_at < cutoff
+        ),
+        select(Task.id).where(Task.project_id.in_(expired_projects)),
+    ]
+    for query in task_batches:
+        for ids in _batches(session, query, batch_size):
+            _move(session, Task, ids)
+            session.commit()
+            report.tasks += len(ids)
+
+    empty_projects = expired_projects.where(
+        ~exists().where(Task.project_id == Project.id)
+    )
+    for ids in _batches(session, empty_projects, batch_size):
+        session.execute(
+            delete(ProjectTaskStats).where(ProjectTaskStats.project_id.in_(ids))
+        )
+        _move(session, Project, ids)
+        session.commit()
+        report.projects += len(ids)
+
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:  # pragma: no cover
+    from crud_backend.database import engine, settings
+
+    parser = argparse.ArgumentParser(
+        description="Arquiva tarefas e projetos removidos há mais de N dias."
+    )
+    parser.add_argument("--days", type=int, default=settings.ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    with Session(engine) as session:
+        report = archive_deleted(session, timedelta(days=args.days), args.batch_size)
+
+    sys.stdout.write(
+        f"{report.tasks} task(s) and {report.projects} project(s) archived\n"
+    )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
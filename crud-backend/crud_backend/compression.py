@@ -0,0 +1,232 @@
+import zlib
+from typing import Callable, Mapping, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None  # type: ignore[assignment]
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None  # type: ignore[assignment]
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+class Encoder(Protocol):
+    def compress(self, data: bytes) -> bytes:
+        """Comprime mais um pedaço do corpo."""
+
+    def flush(self) -> bytes:
+        """Esvazia o buffer para que o cliente já consiga descomprimir o que chegou."""
+
+    def finish(self) -> bytes:
+        """Encerra o fluxo comprimido."""
+
+
+class GzipEncoder:
+    def __init__(self, level: int) -> None:
+        self._zlib = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._zlib.compress(data)
+
+    def flush(self) -> bytes:
+        return self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._zlib.flush()
+
+
+class BrotliEncoder:
+    def __init__(self, quality: int) -> None:
+        self._brotli = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._brotli.process(data)
+
+    def flush(self) -> bytes:
+        return self._brotli.flush()
+
+    def finish(self) -> bytes:
+        return self._brotli.finish()
+
+
+class ZstdEncoder:
+    def __init__(self, level: int) -> None:
+        self._zstd = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._zstd.compress(data)
+
+    def flush(self) -> bytes:
+        return self._zstd.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._zstd.flush()
+
+
+def available_encoders(
+    gzip_level: int, brotli_quality: int, zstd_level: int
+) -> dict[str, Callable[[], Encoder]]:
+    """Codificações suportadas, da preferida para a menos preferida.
+
+    Brotli e zstd dependem dos pacotes `brotli` e `zstandard`; sem eles só o gzip
+    é oferecido.
+    """
+    encoders: dict[str, Callable[[], Encoder]] = {}
+    if zstandard is not None:
+        encoders["zstd"] = lambda: ZstdEncoder(zstd_level)
+    if brotli is not None:
+        encoders["br"] = lambda: BrotliEncoder(brotli_quality)
+    encoders["gzip"] = lambda: GzipEncoder(gzip_level)
+    return encoders
+
+
+def negotiate(accept_encoding: str, available: list[str]) -> str | None:
+    """Escolhe a codificação de maior `q` aceita pelo cliente; empates seguem `available`."""
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, *params = (part.strip() for part in item.split(";"))
+        weight = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if name:
+            weights[name.lower()] = weight
+
+    default = weights.get("*", 0.0)
+    candidates = [
+        (weights.get(encoding, default), -index, encoding)
+        for index, encoding in enumerate(available)
+    ]
+    weight, _, encoding = max(candidates, default=(0.0, 0, None))
+    return encoding if weight > 0 else None
+
+
+class CompressionMiddleware:
+    """Comprime as respostas de texto e JSON conforme o Accept-Encoding.
+
+    Respostas completas menores que `minimum_size` seguem sem compressão. Em
+    respostas por streaming cada pedaço é comprimido e descarregado assim que
+    chega, sem esperar o fim do corpo.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int,
+        encoders: Mapping[str, Callable[[], Encoder]],
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoders = encoders
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        encoding = negotiate(accept_encoding, list(self.encoders))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(
+            send, encoding, self.encoders[encoding], self.minimum_size
+        )
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(
+        self,
+        send: Send,
+        encoding: str,
+        encoder_factory: Callable[[], Encoder],
+        minimum_size: int,
+    ) -> None:
+        self._send = send
+        self.encoding = encoding
+        self.encoder_factory = encoder_factory
+        self.minimum_size = minimum_size
+        self.start: Message | None = None
+        self.encoder: Encoder | None = None
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Os cabeçalhos só saem quando o primeiro pedaço do corpo decide a compressão
+            self.start = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start is not None:
+            start, self.start = self.start, None
+            headers = MutableHeaders(raw=start["headers"])
+            # A ETag vale para a representação comprimida: é fraca em toda resposta
+            # que negociou uma codificação, inclusive nos 304 e nos corpos pequenos,
+            # para que a validação devolva a mesma ETag que o cliente guardou
+            etag = headers.get("etag")
+            if etag:
+                if not etag.startswith("W/"):
+                    headers["ETag"] = f"W/{etag}"
+                headers.add_vary_header("Accept-Encoding")
+            if not self._should_compress(headers, body, more_body):
+                await self._send(start)
+                await self._send(message)
+                return
+
+            self.encoder = self.encoder_factory()
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            del headers["Content-Length"]
+
+            chunk = self._encode(body, more_body)
+            if not more_body:
+                headers["Content-Length"] = str(len(chunk))
+            await self._send(start)
+            await self._send(
+                {"type": "http.response.body", "body": chunk, "more_body": more_body}
+            )
+            return
+
+        if self.encoder is None:
+            await self._send(message)
+            return
+
+        await self._send(
+            {
+                "type": "http.response.body",
+                "body": self._encode(body, more_body),
+                "more_body": more_body,
+            }
+        )
+
+    def _should_compress(
+        self, headers: MutableHeaders, body: bytes, more_body: bool
+    ) -> bool:
+        if "content-encoding" in headers:
+            return False
+        if not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES):
+            return False
+        return more_body or (bool(body) and len(body) >= self.minimum_size)
+
+    def _encode(self, body: bytes, more_body: bool) -> bytes:
+        assert self.encoder is not None
+        chunk = self.encoder.compress(body)
+        return chunk + (self.encoder.flush() if more_body else self.encoder.finish())
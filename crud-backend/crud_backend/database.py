@@ -1,12 +1,276 @@
-from sqlalchemy import create_engine
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    TypeVar,
+    cast,
+)
+from weakref import WeakKeyDictionary
+
+from anyio import Semaphore, move_on_after
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Engine, create_engine, exc
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import Session
-from typing import Generator
+from sqlalchemy.pool import Pool
+
+from crud_backend.metrics import instrument_engine
+from crud_backend.pool import TimedAsyncAdaptedQueuePool, TimedQueuePool
+from crud_backend.replicas import (
+    READ_METHODS,
+    Replica,
+    ReplicaSet,
+    pinned_to_primary,
+)
+from crud_backend.settings import settings
+from crud_backend.slow_queries import SlowQueryLog
+
+T = TypeVar("T")
+
+pool_options: dict[str, Any] = {
+    "pool_size": settings.DATABASE_POOL_SIZE,
+    "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+    "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+    "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+    "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+}
+
+engine = create_engine(settings.DATABASE_URL, poolclass=TimedQueuePool, **pool_options)
+async_engine = (
+    create_async_engine(
+        settings.DATABASE_URL, poolclass=TimedAsyncAdaptedQueuePool, **pool_options
+    )
+    if settings.DATABASE_ASYNC
+    else None
+)
+
+replicas = ReplicaSet(
+    [
+        Replica(
+            create_engine(url, poolclass=TimedQueuePool, **pool_options),
+            (
+                create_async_engine(
+                    url, poolclass=TimedAsyncAdaptedQueuePool, **pool_options
+                )
+                if settings.DATABASE_ASYNC
+                else None
+            ),
+        )
+        for url in settings.DATABASE_REPLICA_URLS
+    ]
+)
+
+slow_queries = SlowQueryLog(
+    settings.SLOW_QUERY_THRESHOLD,
+    settings.SLOW_QUERY_EXPLAIN_RATE,
+    settings.SLOW_QUERY_BUFFER_SIZE,
+)
+
+# Os comandos do engine assíncrono passam pelo `sync_engine` dele
+async_binds = [async_engine, *(replica.async_engine for replica in replicas.replicas)]
+for bind in [
+    engine,
+    *(replica.engine for replica in replicas.replicas),
+    *(async_bind.sync_engine for async_bind in async_binds if async_bind is not None),
+]:
+    instrument_engine(bind)
+    slow_queries.listen(bind)
+
+
+def pool_capacity() -> int:
+    """Total de conexões que cada pool pode abrir, somando o overflow."""
+    return settings.DATABASE_POOL_SIZE + settings.DATABASE_MAX_OVERFLOW
+
+
+_checkout_gates: WeakKeyDictionary[Engine, Semaphore] = WeakKeyDictionary()
+
+
+def checkout_gate(bind: Engine) -> Semaphore:
+    """Uma vaga por conexão do engine, tomada antes de abrir a sessão síncrona."""
+    gate = _checkout_gates.get(bind)
+    if gate is None:
+        gate = _checkout_gates[bind] = Semaphore(pool_capacity())
+    return gate
+
+
+def get_pool() -> Pool:
+    """Retorna o pool do engine usado pelas rotas."""
+    if async_engine is not None:
+        return async_engine.sync_engine.pool
+    return engine.pool
+
+
+# Threads além das conexões, para fechar sessões e para o trabalho que não usa o banco
+THREADPOOL_HEADROOM = 10
+
+
+def threadpool_limit() -> int:
+    """Calcula o limite do threadpool a partir do tamanho do pool de conexões.
+
+    O checkout já é limitado por `checkout_gate`; o limite fica acima da
+    capacidade do pool para que as sessões com conexão sempre achem thread.
+    """
+    if settings.THREADPOOL_LIMIT is not None:
+        return settings.THREADPOOL_LIMIT
+    return pool_capacity() + THREADPOOL_HEADROOM
+
+
+class ThreadedScalarStream:
+    """Consome um resultado síncrono em lotes, buscando cada lote no threadpool."""
+
+    def __init__(self, result: Any) -> None:
+        self._result = result
+
+    async def partitions(self, size: int | None = None) -> AsyncIterator[list[Any]]:
+        partitions = self._result.partitions(size)
+        while partition := await run_in_threadpool(next, partitions, None):
+            yield partition
+
+
+class ThreadedSession:
+    """Expõe uma Session síncrona com a mesma interface da AsyncSession.
+
+    Cada chamada que faz I/O roda no threadpool, permitindo que as rotas
+    `async def` usem drivers síncronos quando o modo assíncrono está desligado.
+    Com `gate`, a primeira dessas chamadas espera uma vaga no event loop antes de
+    a Session fazer o checkout, e a vaga só é devolvida no `close`.
+    """
+
+    def __init__(self, sync_session: Session, gate: Semaphore | None = None) -> None:
+        self.sync_session = sync_session
+        self._gate = gate
+        self._holds_gate = False
+
+    async def _checkout(self) -> None:
+        if self._gate is None or self._holds_gate:
+            return
+        with move_on_after(settings.DATABASE_POOL_TIMEOUT) as scope:
+            await self._gate.acquire()
+        if scope.cancelled_caught:
+            raise exc.TimeoutError(
+                f"No connection freed up in {settings.DATABASE_POOL_TIMEOUT}s"
+            )
+        self._holds_gate = True
 
-from crud_backend.settings import Settings
+    async def _run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        await self._checkout()
+        return await run_in_threadpool(fn, *args, **kwargs)
 
-engine = create_engine(Settings().DATABASE_URL)
+    def get_bind(self) -> Any:
+        return self.sync_session.get_bind()
 
+    def add(self, instance: object) -> None:
+        self.sync_session.add(instance)
 
-def get_session() -> Generator[Session, None, None]:  # pragma: no cover
-    with Session(engine) as session:
+    def add_all(self, instances: list[Any]) -> None:
+        self.sync_session.add_all(instances)
+
+    async def run_sync(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await self._run(fn, self.sync_session, *args, **kwargs)
+
+    async def execute(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._run(self.sync_session.execute, *args, **kwargs)
+
+    async def scalar(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._run(self.sync_session.scalar, *args, **kwargs)
+
+    async def scalars(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._run(self.sync_session.scalars, *args, **kwargs)
+
+    async def stream_scalars(self, *args: Any, **kwargs: Any) -> ThreadedScalarStream:
+        result = await self.scalars(*args, **kwargs)
+        return ThreadedScalarStream(result)
+
+    async def get(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._run(self.sync_session.get, *args, **kwargs)
+
+    async def refresh(self, instance: object) -> None:
+        await self._run(self.sync_session.refresh, instance)
+
+    async def delete(self, instance: object) -> None:
+        await self._run(self.sync_session.delete, instance)
+
+    async def flush(self) -> None:
+        await self._run(self.sync_session.flush)
+
+    async def commit(self) -> None:
+        await self._run(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await self._run(self.sync_session.rollback)
+
+    async def close(self) -> None:
+        try:
+            await run_in_threadpool(self.sync_session.close)
+        finally:
+            if self._holds_gate:
+                self._holds_gate = False
+                cast(Semaphore, self._gate).release()
+
+
+@asynccontextmanager
+async def open_session(
+    replica: Replica | None = None,
+) -> AsyncIterator[AsyncSession]:
+    """Abre uma sessão na réplica indicada ou, sem ela, no primário."""
+    sync_engine, async_bind = (
+        (replica.engine, replica.async_engine) if replica else (engine, async_engine)
+    )
+
+    if async_bind is not None:
+        async with AsyncSession(async_bind) as session:
+            yield session
+        return
+
+    # A Session síncrona segura a conexão entre as chamadas ao threadpool, mas
+    # devolve a thread. Sem a vaga, novas requisições ocupariam todas as threads
+    # esperando o checkout, e as que já têm conexão ficariam sem thread para o
+    # commit e o close. Esperar pela vaga não ocupa thread
+    threaded_session = ThreadedSession(Session(sync_engine), checkout_gate(sync_engine))
+    try:
+        yield cast(AsyncSession, threaded_session)
+    finally:
+        await threaded_session.close()
+
+
+def read_replica(request: Request) -> Replica | None:
+    """Réplica que atende a requisição; None mantém as consultas no primário.
+
+    Só leituras vão para as réplicas, e nunca logo após uma escrita do mesmo cliente.
+    A escolha fica na requisição para que a sessão e a fábrica usem a mesma réplica.
+    """
+    if request.method not in READ_METHODS or pinned_to_primary(request):
+        return None
+    if not hasattr(request.state, "replica"):
+        request.state.replica = replicas.choose()
+    return request.state.replica
+
+
+async def get_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    async with open_session(read_replica(request)) as session:
+        yield session
+
+
+async def get_primary_session() -> AsyncGenerator[AsyncSession, None]:
+    """Sessão sempre no primário, mesmo em GETs que iriam para uma réplica."""
+    async with open_session() as session:
         yield session
+
+
+def get_session_factory(
+    request: Request,
+) -> Callable[[], AsyncContextManager[AsyncSession]]:
+    """Fornece sessões que vivem além da rota, como nas respostas em streaming.
+
+    O FastAPI fecha as dependências com `yield` antes de enviar o corpo da resposta.
+    """
+    return partial(open_session, read_replica(request))
+
+
+def get_slow_query_log() -> SlowQueryLog:  # pragma: no cover
+    return slow_queries
@@ -0,0 +1,153 @@
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Iterable, Protocol
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from crud_backend.models.clients import Client
+from crud_backend.models.projects import Project
+from crud_backend.settings import settings
+
+
+class CacheBackend(Protocol):
+    """Armazena as entradas do cache.
+
+    Um backend compartilhado (Redis, Memcached) mantém vários workers coerentes,
+    já que a invalidação feita por um vale para todos.
+    """
+
+    async def get(self, key: str) -> Any | None:
+        """Devolve o valor guardado ou None se ausente ou expirado."""
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        """Guarda o valor por `ttl` segundos."""
+
+    async def delete(self, key: str) -> None:
+        """Remove a entrada, se existir."""
+
+
+class MemoryBackend:
+    """LRU com TTL dentro do processo; também serve de backend falso nos testes."""
+
+    def __init__(
+        self, max_entries: int = 10_000, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.max_entries = max_entries
+        self.clock = clock
+        self.entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    async def get(self, key: str) -> Any | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= self.clock():
+            del self.entries[key]
+            return None
+
+        self.entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self.entries[key] = (self.clock() + ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self.entries.pop(key, None)
+
+
+class EntityCache:
+    """Cache read-through da existência de clientes e projetos.
+
+    Guarda só entradas positivas: o ID do cliente e o `client_id` do projeto.
+    As rotas que alteram ou removem essas entidades invalidam a entrada.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    async def _read_through(
+        self,
+        kind: str,
+        ids: Iterable[int],
+        load: Callable[[list[int]], Awaitable[dict[int, Any]]],
+    ) -> dict[int, Any]:
+        found: dict[int, Any] = {}
+        missing = []
+        for entity_id in dict.fromkeys(ids):
+            value = await self.backend.get(f"{kind}:{entity_id}")
+            if value is None:
+                missing.append(entity_id)
+            else:
+                found[entity_id] = value
+
+        self.hits += len(found)
+        self.misses += len(missing)
+
+        if missing:
+            loaded = await load(missing)
+            for entity_id, value in loaded.items():
+                await self.backend.set(f"{kind}:{entity_id}", value, self.ttl)
+            found.update(loaded)
+
+        return found
+
+    @staticmethod
+    def _loader(
+        session: AsyncSession,
+        key: InstrumentedAttribute[int],
+        value: InstrumentedAttribute[int],
+    ) -> Callable[[list[int]], Awaitable[dict[int, Any]]]:
+        async def load(ids: list[int]) -> dict[int, Any]:
+            rows = await session.execute(select(key, value).where(key.in_(ids)))
+            return {entity_id: entity_value for entity_id, entity_value in rows}
+
+        return load
+
+    async def client_exists(self, session: AsyncSession, client_id: int) -> bool:
+        found = await self._read_through(
+            "client", [client_id], self._loader(session, Client.id, Client.id)
+        )
+        return client_id in found
+
+    async def project_client_ids(
+        self, session: AsyncSession, *project_ids: int
+    ) -> dict[int, int]:
+        """Devolve o `client_id` de cada projeto existente, em uma consulta no máximo."""
+        return await self._read_through(
+            "project", project_ids, self._loader(session, Project.id, Project.client_id)
+        )
+
+    async def project_exists(self, session: AsyncSession, project_id: int) -> bool:
+        return project_id in await self.project_client_ids(session, project_id)
+
+    async def invalidate_client(self, client_id: int) -> None:
+        await self.backend.delete(f"client:{client_id}")
+
+    async def invalidate_project(self, project_id: int) -> None:
+        await self.backend.delete(f"project:{project_id}")
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+entity_cache = EntityCache(
+    MemoryBackend(settings.ENTITY_CACHE_MAX_ENTRIES), settings.ENTITY_CACHE_TTL
+)
+
+
+def get_entity_cache() -> EntityCache:  # pragma: no cover
+    return entity_cache
@@ -0,0 +1,104 @@
+from collections import defaultdict
+from typing import Any, Collection, Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute, aliased
+
+from crud_backend.models.clients import Client
+from crud_backend.models.projects import Project
+from crud_backend.models.tasks import Task
+from crud_backend.schemas.clients import ClientExpanded, ClientPublic, ClientView
+from crud_backend.schemas.projects import ProjectExpanded, ProjectPublic, ProjectView
+from crud_backend.schemas.tasks import TaskPublic
+from crud_backend.serialization import from_row, trusted
+
+
+async def load_children(
+    session: AsyncSession,
+    parent_key: InstrumentedAttribute[int],
+    parent_ids: Collection[int],
+    limit: int,
+) -> dict[int, list[Any]]:
+    """Carrega até `limit` filhos de cada pai, em ordem de ID, em uma só consulta.
+
+    O `selectinload` usa o mesmo IN, mas não limita por pai; aqui um `row_number`
+    particionado pela FK corta cada grupo.
+    """
+    if not parent_ids:
+        return {}
+
+    entity = parent_key.class_
+    rank = func.row_number().over(partition_by=parent_key, order_by=entity.id)
+    ranked = (
+        select(entity, rank.label("rank")).where(parent_key.in_(parent_ids)).subquery()
+    )
+    child = aliased(entity, ranked)
+    rows = await session.scalars(
+        select(child).where(ranked.c.rank <= limit).order_by(child.id)
+    )
+
+    children: dict[int, list[Any]] = defaultdict(list)
+    for row in rows:
+        children[getattr(row, parent_key.key)].append(row)
+    return children
+
+
+def _tasks(tasks: Sequence[Task]) -> list[TaskPublic]:
+    return [TaskPublic.model_validate(task) for task in tasks]
+
+
+async def expand_projects(
+    session: AsyncSession, projects: Sequence[Project], view: ProjectView
+) -> list[ProjectExpanded]:
+    """Embute as tarefas pedidas em `expand`, com uma consulta por nível."""
+    tasks = await load_children(
+        session,
+        Task.project_id,
+        [project.id for project in projects],
+        view.expand_limit,
+    )
+
+    return [
+        ProjectExpanded.model_construct(
+            **dict(from_row(ProjectPublic, project, view.selected)),
+            tasks=_tasks(tasks.get(project.id, [])),
+        )
+        for project in projects
+    ]
+
+
+async def expand_clients(
+    session: AsyncSession, clients: Sequence[Client], view: ClientView
+) -> list[ClientExpanded]:
+    """Embute os projetos e, se pedido, as tarefas deles, com uma consulta por nível."""
+    projects = await load_children(
+        session, Project.client_id, [client.id for client in clients], view.expand_limit
+    )
+
+    with_tasks = "projects.tasks" in view.expansions
+    tasks: dict[int, list[Any]] = {}
+    if with_tasks:
+        tasks = await load_children(
+            session,
+            Task.project_id,
+            [project.id for group in projects.values() for project in group],
+            view.expand_limit,
+        )
+
+    def expanded_project(project: Project) -> ProjectExpanded:
+        values: dict[str, Any] = dict(ProjectPublic.model_validate(project))
+        # Sem `projects.tasks`, o campo fica fora da saída (exclude_unset)
+        if with_tasks:
+            values["tasks"] = _tasks(tasks.get(project.id, []))
+        return ProjectExpanded.model_construct(**values)
+
+    return [
+        ClientExpanded.model_construct(
+            **dict(trusted(ClientPublic, client, view.selected)),
+            projects=[
+                expanded_project(project) for project in projects.get(client.id, [])
+            ],
+        )
+        for client in clients
+    ]
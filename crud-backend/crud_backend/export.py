@@ -0,0 +1,68 @@
+import csv
+import io
+from typing import AsyncContextManager, AsyncIterator, Callable, Iterable, Sequence
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crud_backend.schemas.schemas import ExportFormat
+
+EXPORT_BATCH_SIZE = 1000
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+
+def _csv_chunk(rows: Iterable[Sequence[object]]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+async def stream_rows(
+    session_factory: Callable[[], AsyncContextManager[AsyncSession]],
+    query: Select[tuple[object]],
+    schema: type[BaseModel],
+    export_format: ExportFormat,
+) -> AsyncIterator[str]:
+    """Serializa o resultado da consulta lote a lote com um cursor no servidor.
+
+    Apenas um lote de `EXPORT_BATCH_SIZE` linhas fica em memória por vez.
+    """
+    fields = list(schema.model_fields)
+
+    if export_format == ExportFormat.csv:
+        yield _csv_chunk([fields])
+
+    async with session_factory() as session:
+        result = await session.stream_scalars(
+            query.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        async for partition in result.partitions():
+            models = [schema.model_validate(row) for row in partition]
+
+            if export_format == ExportFormat.csv:
+                yield _csv_chunk(
+                    [list(model.model_dump(mode="json").values()) for model in models]
+                )
+            else:
+                yield "".join(model.model_dump_json() + "\n" for model in models)
+
+
+def export_response(
+    rows: AsyncIterator[str], export_format: ExportFormat, filename: str
+) -> StreamingResponse:
+    return StreamingResponse(
+        rows,
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="{filename}.{export_format.value}"'
+            )
+        },
+    )
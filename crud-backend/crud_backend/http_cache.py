@@ -0,0 +1,66 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from http import HTTPStatus
+
+from fastapi import Request, Response
+
+# O navegador guarda a resposta, mas revalida com If-None-Match a cada uso
+CACHE_CONTROL = "private, no-cache"
+
+
+def _etag(*parts: object) -> str:
+    payload = "|".join(map(str, parts)).encode()
+    return f'"{hashlib.blake2b(payload, digest_size=16).hexdigest()}"'
+
+
+def entity_etag(
+    entity: str, entity_id: int, updated_at: datetime, fields: str | None = None
+) -> str:
+    """Gera a ETag da entidade; cada seleção de campos é uma representação."""
+    if fields:
+        return _etag(entity, entity_id, updated_at.isoformat(), fields)
+    return _etag(entity, entity_id, updated_at.isoformat())
+
+
+def list_etag(request: Request, total: int, last_modified: datetime | None) -> str:
+    """Gera a ETag da página a partir da URL, do total e da última alteração."""
+    return _etag(
+        request.url.path,
+        sorted(request.query_params.multi_items()),
+        total,
+        last_modified.isoformat() if last_modified else "",
+    )
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Compara a ETag com o If-None-Match usando a comparação fraca da RFC 9110."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+def _http_date(moment: datetime) -> str:
+    # Os horários do banco são gravados em UTC, sem fuso
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return format_datetime(moment.astimezone(timezone.utc), usegmt=True)
+
+
+def set_validators(
+    response: Response, etag: str, last_modified: datetime | None
+) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    if last_modified is not None:
+        response.headers["Last-Modified"] = _http_date(last_modified)
+
+
+def not_modified(etag: str, last_modified: datetime | None) -> Response:
+    """Responde 304 sem corpo, repetindo os validadores."""
+    response = Response(status_code=HTTPStatus.NOT_MODIFIED)
+    set_validators(response, etag, last_modified)
+    return response
@@ -0,0 +1,238 @@
+import argparse
+import csv
+import io
+import sys
+import time
+from pathlib import Path
+from typing import IO, Any, Iterator, cast
+
+import psycopg
+from anyio import to_thread
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import Connection, Table, exists, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.util import await_only
+
+from crud_backend.models.clients import Client
+from crud_backend.models.projects import Project
+from crud_backend.models.registry import table_of
+from crud_backend.models.tasks import Task
+from crud_backend.schemas.projects import ProjectSchema
+from crud_backend.schemas.schemas import BulkError, ExportFormat, ImportReport
+from crud_backend.schemas.tasks import TaskSchema
+
+IMPORT_CHUNK_SIZE = 5000
+IMPORT_MAX_ERRORS = 1000
+
+
+def _records(stream: IO[str], import_format: ExportFormat) -> Iterator[tuple[int, Any]]:
+    """Lê o arquivo linha a linha, numerando os registros a partir de 1."""
+    if import_format == ExportFormat.csv:
+        for index, row in enumerate(csv.DictReader(stream), start=1):
+            yield index, {key: value for key, value in row.items() if key is not None}
+    else:
+        for index, line in enumerate(stream, start=1):
+            if line.strip():
+                yield index, line
+
+
+def _error_detail(exc: ValidationError) -> str:
+    return "; ".join(
+        (
+            f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+            if error["loc"]
+            else error["msg"]
+        )
+        for error in exc.errors()
+    )
+
+
+async def _copy_async(
+    driver_connection: psycopg.AsyncConnection[Any],
+    statement: str,
+    rows: list[list[Any]],
+) -> None:
+    async with driver_connection.cursor() as cursor:
+        async with cursor.copy(statement) as copy:
+            for row in rows:
+                await copy.write_row(row)
+
+
+def _copy_rows(
+    connection: Connection, table: Table, rows: list[dict[str, Any]]
+) -> None:
+    """Envia o lote pelo `COPY FROM STDIN` do psycopg na transação corrente."""
+    preparer = connection.dialect.identifier_preparer
+    columns = list(rows[0])
+    statement = (
+        f"COPY {preparer.format_table(table)} "
+        f"({', '.join(preparer.quote(column) for column in columns)}) FROM STDIN"
+    )
+    values = [[row[column] for column in columns] for row in rows]
+
+    driver_connection = connection.connection.driver_connection
+    if isinstance(driver_connection, psycopg.AsyncConnection):
+        await_only(_copy_async(driver_connection, statement, values))
+        return
+
+    sync_connection = cast(psycopg.Connection[Any], driver_connection)
+    with sync_connection.cursor() as cursor:
+        with cursor.copy(statement) as copy:
+            for row in values:
+                copy.write_row(row)
+
+
+def _write_chunk(session: Session, table: Table, rows: list[dict[str, Any]]) -> None:
+    connection = session.connection()
+    if connection.dialect.name == "postgresql":
+        _copy_rows(connection, table, rows)
+    else:
+        connection.execute(insert(table), rows)
+    session.commit()
+
+
+class _ChunkReader:
+    """Valida os registros do arquivo e os entrega em lotes de `IMPORT_CHUNK_SIZE`.
+
+    Registros inválidos são contados e os primeiros `IMPORT_MAX_ERRORS` são
+    guardados com o número da linha.
+    """
+
+    def __init__(
+        self,
+        stream: IO[str],
+        import_format: ExportFormat,
+        schema: type[BaseModel],
+        values: dict[str, Any],
+    ) -> None:
+        self.records = _records(stream, import_format)
+        self.schema = schema
+        self.values = values
+        self.started = time.perf_counter()
+        self.rejected = 0
+        self.errors: list[BulkError] = []
+
+    def next_chunk(self) -> list[dict[str, Any]]:
+        chunk: list[dict[str, Any]] = []
+        for index, record in self.records:
+            try:
+                if isinstance(record, str):
+                    model = self.schema.model_validate_json(record)
+                else:
+                    model = self.schema.model_validate(record)
+            except ValidationError as exc:
+                self.rejected += 1
+                if len(self.errors) < IMPORT_MAX_ERRORS:
+                    self.errors.append(
+                        BulkError(index=index, detail=_error_detail(exc))
+                    )
+                continue
+
+            chunk.append({**model.model_dump(mode="json"), **self.values})
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                break
+        return chunk
+
+    def report(self, imported: int) -> ImportReport:
+        seconds = time.perf_counter() - self.started
+        return ImportReport(
+            imported=imported,
+            rejected=self.rejected,
+            seconds=round(seconds, 3),
+            rows_per_second=round(imported / seconds, 1) if seconds else 0.0,
+            errors=self.errors,
+        )
+
+
+def import_rows(
+    session: Session,
+    stream: IO[str],
+    import_format: ExportFormat,
+    schema: type[BaseModel],
+    table: Table,
+    values: dict[str, Any],
+) -> ImportReport:
+    """Valida e grava o arquivo em lotes de `IMPORT_CHUNK_SIZE` registros.
+
+    Cada lote é confirmado ao ser gravado, então apenas um lote fica em memória.
+    """
+    reader = _ChunkReader(stream, import_format, schema, values)
+    imported = 0
+    while chunk := reader.next_chunk():
+        _write_chunk(session, table, chunk)
+        imported += len(chunk)
+
+    return reader.report(imported)
+
+
+async def import_file(
+    session: AsyncSession,
+    stream: IO[str],
+    import_format: ExportFormat,
+    schema: type[BaseModel],
+    table: Table,
+    values: dict[str, Any],
+) -> ImportReport:
+    """Como `import_rows`, mas lê e valida cada lote numa thread.
+
+    Só a gravação passa pela sessão, então no modo assíncrono o event loop não
+    fica preso à leitura do arquivo.
+    """
+    reader = _ChunkReader(stream, import_format, schema, values)
+    imported = 0
+    while chunk := await to_thread.run_sync(reader.next_chunk):
+        await session.run_sync(_write_chunk, table, chunk)
+        imported += len(chunk)
+
+    return reader.report(imported)
+
+
+def text_stream(binary: IO[bytes]) -> IO[str]:
+    """Decodifica o arquivo sob demanda, aceitando o BOM das planilhas."""
+    return io.TextIOWrapper(binary, encoding="utf-8-sig", newline="")
+
+
+def main(argv: list[str] | None = None) -> None:  # pragma: no cover
+    from crud_backend.database import engine
+
+    parser = argparse.ArgumentParser(
+        description="Importa tarefas ou projetos de um arquivo CSV/NDJSON."
+    )
+    parser.add_argument("entity", choices=["tasks", "projects"])
+    parser.add_argument(
+        "parent_id", type=int, help="project_id das tarefas ou client_id dos projetos"
+    )
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", choices=[item.value for item in ExportFormat])
+    args = parser.parse_args(argv)
+
+    try:
+        import_format = ExportFormat(
+            args.format or args.path.suffix.lstrip(".").lower()
+        )
+    except ValueError:
+        parser.error("Unknown file format, use --format")
+
+    schema: type[BaseModel]
+    parent: type[Project] | type[Client]
+    if args.entity == "tasks":
+        schema, table, parent = TaskSchema, table_of(Task), Project
+        values = {"project_id": args.parent_id}
+    else:
+        schema, table, parent = ProjectSchema, table_of(Project), Client
+        values = {"client_id": args.parent_id}
+
+    with Session(engine) as session, args.path.open("rb") as binary:
+        if not session.scalar(select(exists().where(parent.id == args.parent_id))):
+            parser.error(f"{parent.__name__} {args.parent_id} not found")
+
+        report = import_rows(
+            session, text_stream(binary), import_format, schema, table, values
+        )
+
+    sys.stdout.write(report.model_dump_json(indent=2) + "\n")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
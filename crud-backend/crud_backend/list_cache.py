@@ -0,0 +1,239 @@
+import logging
+import time
+import uuid
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import Any, AsyncContextManager, Awaitable, Callable, Sequence
+
+from fastapi import BackgroundTasks, HTTPException, Request, Response
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crud_backend.entity_cache import CacheBackend, MemoryBackend
+from crud_backend.http_cache import etag_matches
+from crud_backend.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Geração esquecida pelo backend vira uma nova, o que só invalida o cache
+GENERATION_TTL = 24 * 60 * 60
+CACHED_HEADERS = ("etag", "last-modified", "cache-control")
+
+PageLoader = Callable[[AsyncSession, bool], Awaitable[Response]]
+
+
+def client_projects(client_id: int) -> str:
+    return f"projects:{client_id}"
+
+
+def project_tasks(project_id: int) -> str:
+    return f"tasks:{project_id}"
+
+
+@dataclass
+class CachedPage:
+    body: bytes
+    headers: dict[str, str]
+    stored_at: float
+
+    def respond(self, request: Request) -> Response:
+        etag = self.headers.get("etag")
+        if etag is not None and etag_matches(request, etag):
+            return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=self.headers)
+
+        return Response(
+            content=self.body, media_type="application/json", headers=self.headers
+        )
+
+
+class ListCache:
+    """Cache das respostas de listagem, versionado por geração do pai.
+
+    A chave junta a rota, os filtros normalizados e a geração atual de cada
+    escopo do pai (`projects:<client_id>`, `tasks:<project_id>`). Cada escrita
+    troca a geração, então as entradas antigas deixam de ser alcançadas. Respostas mais
+    velhas que `ttl` ainda são servidas por `stale_ttl` segundos enquanto são
+    recalculadas em segundo plano. Os corpos ficam em memória até `max_bytes`,
+    descartando os menos usados. Páginas lidas de uma réplica só são guardadas
+    depois de `replica_lag` segundos da última troca de geração, o prazo para a
+    réplica refletir a escrita.
+    """
+
+    def __init__(
+        self,
+        generations: CacheBackend,
+        max_bytes: int,
+        ttl: float,
+        stale_ttl: float,
+        replica_lag: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.generations = generations
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.replica_lag = replica_lag
+        self.clock = clock
+        self.entries: OrderedDict[str, CachedPage] = OrderedDict()
+        self.size = 0
+        self.refreshing: set[str] = set()
+        self.metrics: dict[str, Counter[str]] = {}
+
+    async def generation(self, scope: str) -> str:
+        key = f"generation:{scope}"
+        generation = await self.generations.get(key)
+        if generation is None:
+            generation = uuid.uuid4().hex
+            await self.generations.set(key, generation, GENERATION_TTL)
+        return generation
+
+    async def bump(self, *scopes: str) -> None:
+        """Invalida em O(1) as listagens dos pais informados."""
+        # A geração leva o instante da troca, em tempo de parede para valer entre
+        # processos que compartilham o backend
+        for scope in scopes:
+            await self.generations.set(
+                f"generation:{scope}",
+                f"{uuid.uuid4().hex}:{time.time():.3f}",
+                GENERATION_TTL,
+            )
+
+    def _replica_caught_up(self, generations: Sequence[str]) -> bool:
+        bumped_at = max(
+            float(generation.partition(":")[2] or 0) for generation in generations
+        )
+        return time.time() - bumped_at >= self.replica_lag
+
+    def _lookup(self, key: str) -> tuple[CachedPage | None, bool]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None, False
+
+        age = self.clock() - entry.stored_at
+        if age >= self.ttl + self.stale_ttl:
+            self._discard(key)
+            return None, False
+
+        self.entries.move_to_end(key)
+        return entry, age >= self.ttl
+
+    def _discard(self, key: str) -> None:
+        entry = self.entries.pop(key)
+        self.size -= len(entry.body)
+
+    def _store(self, key: str, response: Response) -> None:
+        body = bytes(response.body)
+        if len(body) > self.max_bytes:
+            return
+
+        if key in self.entries:
+            self._discard(key)
+        self.entries[key] = CachedPage(
+            body=body,
+            headers={
+                name: value
+                for name, value in response.headers.items()
+                if name in CACHED_HEADERS
+            },
+            stored_at=self.clock(),
+        )
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            self._discard(next(iter(self.entries)))
+
+    async def _refresh(
+        self,
+        key: str,
+        session_factory: Callable[[], AsyncContextManager[AsyncSession]],
+        load: PageLoader,
+        storable: Callable[[], bool],
+    ) -> None:
+        try:
+            async with session_factory() as session:
+                response = await load(session, False)
+            if storable():
+                self._store(key, response)
+        except HTTPException:
+            # O pai sumiu; a próxima requisição recebe o erro sem cache
+            if key in self.entries:
+                self._discard(key)
+        except Exception:  # pragma: no cover
+            logger.exception("List cache refresh failed for %s", key)
+        finally:
+            self.refreshing.discard(key)
+
+    async def serve(
+        self,
+        endpoint: str,
+        scopes: Sequence[str],
+        params: BaseModel,
+        request: Request,
+        background_tasks: BackgroundTasks,
+        session_factory: Callable[[], AsyncContextManager[AsyncSession]],
+        load: PageLoader,
+        from_replica: bool = False,
+    ) -> Response:
+        """Responde do cache ou executa `load`, guardando as respostas 200.
+
+        Com `from_replica`, a página lida logo após uma troca de geração não é
+        guardada: a réplica ainda pode estar na anterior, e a página antiga ficaria
+        sob a geração nova.
+        """
+        generations = [await self.generation(scope) for scope in scopes]
+        versions = [
+            f"{scope}@{generation}" for scope, generation in zip(scopes, generations)
+        ]
+        key = "|".join([endpoint, *versions, params.model_dump_json()])
+        metrics = self.metrics.setdefault(endpoint, Counter())
+
+        def storable() -> bool:
+            return not from_replica or self._replica_caught_up(generations)
+
+        entry, stale = self._lookup(key)
+        if entry is not None:
+            metrics["stale_hits" if stale else "hits"] += 1
+            if stale and key not in self.refreshing:
+                self.refreshing.add(key)
+                background_tasks.add_task(
+                    self._refresh, key, session_factory, load, storable
+                )
+            return entry.respond(request)
+
+        metrics["misses"] += 1
+        async with session_factory() as session:
+            response = await load(session, True)
+        if response.status_code == 200 and storable():
+            self._store(key, response)
+        return response
+
+    def stats(self) -> dict[str, Any]:
+        endpoints = {}
+        for endpoint, counter in self.metrics.items():
+            served = counter["hits"] + counter["stale_hits"]
+            lookups = served + counter["misses"]
+            endpoints[endpoint] = {
+                "hits": counter["hits"],
+                "stale_hits": counter["stale_hits"],
+                "misses": counter["misses"],
+                "hit_ratio": served / lookups if lookups else 0.0,
+            }
+
+        return {
+            "entries": len(self.entries),
+            "bytes": self.size,
+            "endpoints": endpoints,
+        }
+
+
+list_cache = ListCache(
+    MemoryBackend(),
+    max_bytes=settings.LIST_CACHE_MAX_BYTES,
+    ttl=settings.LIST_CACHE_TTL,
+    stale_ttl=settings.LIST_CACHE_STALE_TTL,
+    replica_lag=settings.READ_YOUR_WRITES_WINDOW,
+)
+
+
+def get_list_cache() -> ListCache:  # pragma: no cover
+    return list_cache
@@ -1,11 +1,35 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from anyio import create_task_group, to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from http import HTTPStatus
 
-from crud_backend.routes import clients, projects, tasks
+from crud_backend.compression import CompressionMiddleware, available_encoders
+from crud_backend.database import replicas, settings, threadpool_limit
+from crud_backend.metrics import MetricsMiddleware
+from crud_backend.replicas import ReadYourWritesMiddleware
+from crud_backend.routes import admin, clients, health, metrics, projects, tasks
 from crud_backend.schemas.schemas import Message
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Ajusta o threadpool ao pool de conexões, com folga além da capacidade dele
+    to_thread.current_default_thread_limiter().total_tokens = threadpool_limit()
+    async with create_task_group() as task_group:
+        if replicas.replicas:
+            task_group.start_soon(
+                replicas.monitor,
+                settings.DATABASE_REPLICA_CHECK_INTERVAL,
+                settings.DATABASE_REPLICA_CHECK_TIMEOUT,
+            )
+        yield
+        task_group.cancel_scope.cancel()
+
+
+app = FastAPI(lifespan=lifespan)
 
 origins = [
     "http://localhost:3000",
@@ -19,12 +43,34 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    encoders=available_encoders(
+        settings.COMPRESSION_GZIP_LEVEL,
+        settings.COMPRESSION_BROTLI_QUALITY,
+        settings.COMPRESSION_ZSTD_LEVEL,
+    ),
+)
+
+app.add_middleware(
+    ReadYourWritesMiddleware,
+    replicas=replicas,
+    window=settings.READ_YOUR_WRITES_WINDOW,
+)
+
+# Por último para ficar mais externo e medir também os demais middlewares
+app.add_middleware(MetricsMiddleware)
+
 
 @app.get("/", status_code=HTTPStatus.OK, response_model=Message)
 def read_root() -> Message:
     return Message(message="Hello World!")
 
 
+app.include_router(health.router, prefix="/health", tags=["health"])
+app.include_router(metrics.router, tags=["metrics"])
+app.include_router(admin.router, prefix="/admin", tags=["admin"])
 app.include_router(clients.router, prefix="/clients", tags=["clients"])
 app.include_router(
     projects.router, prefix="/clients/{client_id}/projects", tags=["projects"]
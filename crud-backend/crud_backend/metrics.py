@@ -0,0 +1,265 @@
+import bisect
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from threading import Lock
+from time import perf_counter
+from typing import Any, Iterable, Iterator
+
+from sqlalchemy import Engine, event
+from sqlalchemy.pool import Pool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from crud_backend.pool import pool_status
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+UNMATCHED_ROUTE = "<unmatched>"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+STATEMENT_COUNT_BUCKETS = (1.0, 2.0, 3.0, 5.0, 10.0, 20.0, 50.0, 100.0)
+SERIALIZATION_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.1,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _labels(pairs: Iterable[tuple[str, str]]) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+
+
+class Histogram:
+    """Histograma no formato de texto do Prometheus, com uma série por labels."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...],
+        buckets: tuple[float, ...],
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = buckets
+        # Contagem por faixa (a última é +Inf) seguida da soma dos valores
+        self._series: dict[tuple[str, ...], list[float]] = {}
+        self._lock = Lock()
+
+    def observe(self, values: tuple[str, ...], *amounts: float) -> None:
+        with self._lock:
+            series = self._series.get(values)
+            if series is None:
+                series = self._series[values] = [0] * (len(self.buckets) + 2)
+            for amount in amounts:
+                series[bisect.bisect_left(self.buckets, amount)] += 1
+                series[-1] += amount
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            snapshot = {values: list(series) for values, series in self._series.items()}
+
+        for values, series in sorted(snapshot.items()):
+            labels = _labels(zip(self.labels, values))
+            total = 0
+            for bound, count in zip((*map(str, self.buckets), "+Inf"), series):
+                total += int(count)
+                yield f'{self.name}_bucket{{{labels},le="{bound}"}} {total}'
+            yield f"{self.name}_sum{{{labels}}} {series[-1]}"
+            yield f"{self.name}_count{{{labels}}} {total}"
+
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency.",
+    ("method", "route", "status"),
+    LATENCY_BUCKETS,
+)
+STATEMENT_DURATION = Histogram(
+    "db_statement_duration_seconds",
+    "Duration of each SQL statement, by originating route.",
+    ("method", "route"),
+    SQL_BUCKETS,
+)
+STATEMENTS_PER_REQUEST = Histogram(
+    "db_statements_per_request",
+    "SQL statements executed per request.",
+    ("method", "route"),
+    STATEMENT_COUNT_BUCKETS,
+)
+SERIALIZATION_DURATION = Histogram(
+    "serialization_duration_seconds",
+    "Time spent serializing JSON responses.",
+    ("method", "route"),
+    SERIALIZATION_BUCKETS,
+)
+HISTOGRAMS = (
+    REQUEST_DURATION,
+    STATEMENT_DURATION,
+    STATEMENTS_PER_REQUEST,
+    SERIALIZATION_DURATION,
+)
+
+
+@dataclass
+class RequestMetrics:
+    """Medições de uma requisição, atribuídas à rota quando ela termina."""
+
+    scope: Scope
+    statements: list[float] = field(default_factory=list)
+    serialization: list[float] = field(default_factory=list)
+
+
+current_request: ContextVar[RequestMetrics | None] = ContextVar(
+    "current_request", default=None
+)
+
+_route_paths: dict[Any, str] = {}
+
+
+def route_label(scope: Scope) -> str:
+    """Caminho declarado da rota (`/clients/{client_id}`), nunca o da URL."""
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return UNMATCHED_ROUTE
+
+    path = _route_paths.get(endpoint)
+    if path is None:
+        path = next(
+            (
+                route.path
+                for route in scope["app"].routes
+                if getattr(route, "endpoint", None) is endpoint
+            ),
+            UNMATCHED_ROUTE,
+        )
+        _route_paths[endpoint] = path
+    return path
+
+
+def before_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    if current_request.get() is not None:
+        context.metrics_start = perf_counter()
+
+
+def after_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    request = current_request.get()
+    start = getattr(context, "metrics_start", None)
+    if request is not None and start is not None:
+        request.statements.append(perf_counter() - start)
+
+
+def instrument_engine(engine: Engine | type[Engine]) -> None:
+    """Mede os comandos SQL do engine executados durante uma requisição."""
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+
+
+def record_serialization(seconds: float) -> None:
+    request = current_request.get()
+    if request is not None:
+        request.serialization.append(seconds)
+
+
+class MetricsMiddleware:
+    """Mede a latência de cada requisição, por rota e status.
+
+    O tempo de SQL e de serialização acumulado até o fim da resposta, inclusive em
+    streaming, é atribuído à mesma rota.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = RequestMetrics(scope)
+        token = current_request.set(request)
+        status = HTTPStatus.INTERNAL_SERVER_ERROR.value
+        start = perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = perf_counter() - start
+            current_request.reset(token)
+
+            labels = (scope["method"], route_label(scope))
+            REQUEST_DURATION.observe((*labels, str(status)), elapsed)
+            STATEMENTS_PER_REQUEST.observe(labels, len(request.statements))
+            if request.statements:
+                STATEMENT_DURATION.observe(labels, *request.statements)
+            if request.serialization:
+                SERIALIZATION_DURATION.observe(labels, *request.serialization)
+
+
+def _pool_lines(pools: dict[str, Pool]) -> Iterator[str]:
+    statuses = {name: pool_status(pool) for name, pool in pools.items()}
+
+    yield "# HELP db_pool_connections Connections in the pool, by state."
+    yield "# TYPE db_pool_connections gauge"
+    for name, status in statuses.items():
+        for state in ("checked_out", "idle", "overflow"):
+            if status[state] is not None:
+                labels = _labels([("pool", name), ("state", state)])
+                yield f"db_pool_connections{{{labels}}} {status[state]}"
+
+    yield "# HELP db_pool_size Configured pool size."
+    yield "# TYPE db_pool_size gauge"
+    for name, status in statuses.items():
+        if status["size"] is not None:
+            yield f'db_pool_size{{pool="{_escape(name)}"}} {status["size"]}'
+
+    yield "# HELP db_pool_checkouts_total Connection checkouts."
+    yield "# TYPE db_pool_checkouts_total counter"
+    for name, status in statuses.items():
+        yield f'db_pool_checkouts_total{{pool="{_escape(name)}"}} {status["checkouts"]}'
+
+    yield "# HELP db_pool_checkout_wait_seconds_total Time spent waiting on checkout."
+    yield "# TYPE db_pool_checkout_wait_seconds_total counter"
+    for name, status in statuses.items():
+        wait = status["checkout_wait_seconds"]
+        yield f'db_pool_checkout_wait_seconds_total{{pool="{_escape(name)}"}} {wait}'
+
+
+def render_metrics(pools: dict[str, Pool]) -> str:
+    """Todas as métricas no formato de texto do Prometheus."""
+    lines = [line for histogram in HISTOGRAMS for line in histogram.render()]
+    lines.extend(_pool_lines(pools))
+    return "\n".join(lines) + "\n"
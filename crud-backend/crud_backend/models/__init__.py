@@ -1,4 +1,6 @@
 from .clients import *
 from .registry import *
 from .projects import *
+from .stats import *
 from .tasks import *
+from .archive import *
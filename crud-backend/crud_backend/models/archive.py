@@ -0,0 +1,46 @@
+from datetime import datetime
+
+from sqlalchemy import Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from crud_backend.models.projects import ProjectStatus
+from crud_backend.models.registry import table_registry
+from crud_backend.models.tasks import TaskStatus
+
+
+@table_registry.mapped_as_dataclass
+class ArchivedProject:
+    """Guarda os projetos removidos há mais tempo, fora da tabela `projects`.
+
+    Sem chave estrangeira: o cliente pode ser removido depois do arquivamento.
+    """
+
+    __tablename__ = "archived_projects"
+    __table_args__ = (Index("ix_archived_projects_client_id_id", "client_id", "id"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    title: Mapped[str]
+    description: Mapped[str]
+    status: Mapped[ProjectStatus]
+    created_at: Mapped[datetime]
+    updated_at: Mapped[datetime]
+    client_id: Mapped[int]
+    archived_at: Mapped[datetime] = mapped_column(init=False, server_default=func.now())
+
+
+@table_registry.mapped_as_dataclass
+class ArchivedTask:
+    """Guarda as tarefas removidas há mais tempo, fora da tabela `tasks`."""
+
+    __tablename__ = "archived_tasks"
+    __table_args__ = (Index("ix_archived_tasks_project_id_id", "project_id", "id"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    title: Mapped[str]
+    description: Mapped[str]
+    assigned_to: Mapped[str]
+    status: Mapped[TaskStatus]
+    created_at: Mapped[datetime]
+    updated_at: Mapped[datetime]
+    project_id: Mapped[int]
+    archived_at: Mapped[datetime] = mapped_column(init=False, server_default=func.now())
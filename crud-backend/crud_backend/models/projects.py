@@ -1,10 +1,11 @@
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import ForeignKey, func
+from sqlalchemy import ForeignKey, Index, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from crud_backend.models.registry import table_registry
+from crud_backend.models.registry import table_of, table_registry
+from crud_backend.search import register_substring_search
 
 
 class ProjectStatus(str, Enum):
@@ -16,10 +17,46 @@ class ProjectStatus(str, Enum):
     deleted = "deleted"
 
 
+# Linhas `deleted` ficam fora do índice por status e são as únicas no índice lido
+# pelo arquivamento, que as move para `archived_projects`
+_LIVE = text("status <> 'deleted'")
+_DELETED = text("status = 'deleted'")
+
+
 @table_registry.mapped_as_dataclass
 class Project:
     """Representa o projeto no banco de dados."""
     __tablename__ = "projects"
+    __table_args__ = (
+        Index("ix_projects_client_id_id", "client_id", "id"),
+        Index(
+            "ix_projects_client_id_status_id",
+            "client_id",
+            "status",
+            "id",
+            sqlite_where=_LIVE,
+            postgresql_where=_LIVE,
+        ),
+        Index("ix_projects_client_id_updated_at", "client_id", "updated_at"),
+        Index(
+            "ix_projects_deleted_updated_at",
+            "updated_at",
+            sqlite_where=_DELETED,
+            postgresql_where=_DELETED,
+        ),
+        Index(
+            "ix_projects_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_projects_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
     title: Mapped[str]
@@ -36,5 +73,7 @@ class Project:
     tasks: Mapped[list["Task"]] = relationship(init=False, back_populates="project")
 
 
+register_substring_search(table_of(Project), "title", "description")
+
 from crud_backend.models.clients import Client  # noqa
 from crud_backend.models.tasks import Task  # noqa
@@ -1,3 +1,11 @@
+from typing import cast
+
+from sqlalchemy import Table, inspect
 from sqlalchemy.orm import registry
 
 table_registry = registry()
+
+
+def table_of(entity: type) -> Table:
+    """Tabela da classe mapeada; o mypy não enxerga o `__table__` das dataclasses."""
+    return cast(Table, inspect(entity).local_table)
@@ -0,0 +1,109 @@
+from typing import Any
+
+from sqlalchemy import Connection, ForeignKey, Table, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from crud_backend.models.registry import table_of, table_registry
+from crud_backend.models.tasks import Task, TaskStatus
+
+
+@table_registry.mapped_as_dataclass
+class ProjectTaskStats:
+    """Guarda a quantidade de tarefas do projeto em cada status.
+
+    Os contadores são mantidos por triggers na tabela de tarefas.
+    """
+
+    __tablename__ = "project_task_stats"
+
+    project_id: Mapped[int] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    pending: Mapped[int] = mapped_column(default=0, server_default="0")
+    doing: Mapped[int] = mapped_column(default=0, server_default="0")
+    completed: Mapped[int] = mapped_column(default=0, server_default="0")
+    paused: Mapped[int] = mapped_column(default=0, server_default="0")
+    deleted: Mapped[int] = mapped_column(default=0, server_default="0")
+
+
+STATS_TABLE = ProjectTaskStats.__tablename__
+STATS_FUNCTION = f"{STATS_TABLE}_sync"
+
+
+def _status_flags(row: str) -> list[str]:
+    return [
+        f"CASE WHEN {row}.status = '{status.name}' THEN 1 ELSE 0 END"
+        for status in TaskStatus
+    ]
+
+
+def _increment(row: str) -> str:
+    columns = ", ".join(status.name for status in TaskStatus)
+    assignments = ", ".join(
+        f"{status.name} = {STATS_TABLE}.{status.name} + excluded.{status.name}"
+        for status in TaskStatus
+    )
+    return (
+        f"INSERT INTO {STATS_TABLE} (project_id, {columns}) "
+        f"VALUES ({row}.project_id, {', '.join(_status_flags(row))}) "
+        f"ON CONFLICT (project_id) DO UPDATE SET {assignments}"
+    )
+
+
+def _decrement(row: str) -> str:
+    assignments = ", ".join(
+        f"{status.name} = {status.name} - {flag}"
+        for status, flag in zip(TaskStatus, _status_flags(row))
+    )
+    return f"UPDATE {STATS_TABLE} SET {assignments} WHERE project_id = {row}.project_id"
+
+
+def stats_ddl(dialect: str) -> list[str]:
+    """Gera as triggers que atualizam os contadores a cada escrita em `tasks`."""
+    table = Task.__tablename__
+
+    if dialect == "sqlite":
+        return [
+            f"CREATE TRIGGER IF NOT EXISTS {table}_stats_ai AFTER INSERT ON {table} "
+            f"BEGIN {_increment('new')}; END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_stats_ad AFTER DELETE ON {table} "
+            f"BEGIN {_decrement('old')}; END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_stats_au "
+            f"AFTER UPDATE OF status, project_id ON {table} "
+            "WHEN old.status IS NOT new.status OR old.project_id IS NOT new.project_id "
+            f"BEGIN {_decrement('old')}; {_increment('new')}; END",
+        ]
+
+    return [
+        f"CREATE OR REPLACE FUNCTION {STATS_FUNCTION}() RETURNS trigger "
+        "LANGUAGE plpgsql AS $$ BEGIN "
+        "IF TG_OP = 'UPDATE' AND OLD.status = NEW.status "
+        "AND OLD.project_id = NEW.project_id THEN RETURN NULL; END IF; "
+        f"IF TG_OP IN ('UPDATE', 'DELETE') THEN {_decrement('OLD')}; END IF; "
+        f"IF TG_OP IN ('UPDATE', 'INSERT') THEN {_increment('NEW')}; END IF; "
+        "RETURN NULL; END $$",
+        f"CREATE TRIGGER {table}_stats AFTER INSERT OR DELETE "
+        f"OR UPDATE OF status, project_id ON {table} "
+        f"FOR EACH ROW EXECUTE FUNCTION {STATS_FUNCTION}()",
+    ]
+
+
+def _create_stats_triggers(target: Table, connection: Connection, **kw: Any) -> None:
+    dialect = connection.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        for statement in stats_ddl(dialect):
+            connection.exec_driver_sql(statement)
+
+
+def _drop_stats_function(target: Table, connection: Connection, **kw: Any) -> None:
+    if connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(f"DROP FUNCTION IF EXISTS {STATS_FUNCTION}()")
+
+
+def _register_stats_triggers() -> None:
+    table = table_of(Task)
+    event.listen(table, "after_create", _create_stats_triggers)
+    event.listen(table, "after_drop", _drop_stats_function)
+
+
+_register_stats_triggers()
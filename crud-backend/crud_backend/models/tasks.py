@@ -1,10 +1,13 @@
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import ForeignKey, func
+from sqlalchemy import ForeignKey, Index, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from crud_backend.models.registry import table_registry
+from crud_backend.models.registry import table_of, table_registry
+from crud_backend.partitioning import PARTITION_KEYS, partition_by, register_partitions
+from crud_backend.search import register_substring_search
+from crud_backend.settings import settings
 
 
 class TaskStatus(str, Enum):
@@ -16,23 +19,84 @@ class TaskStatus(str, Enum):
     deleted = "deleted"
 
 
+# Linhas `deleted` ficam fora do índice por status e são as únicas no índice lido
+# pelo arquivamento, que as move para `archived_tasks`
+_LIVE = text("status <> 'deleted'")
+_DELETED = text("status = 'deleted'")
+
+# No Postgres particionado a chave da partição também entra na PK
+_PARTITION_KEY = PARTITION_KEYS.get(settings.TASKS_PARTITIONING)
+
+
 @table_registry.mapped_as_dataclass
 class Task:
     """Representa a tarefa no banco de dados."""
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_project_id_id", "project_id", "id"),
+        Index(
+            "ix_tasks_project_id_status_id",
+            "project_id",
+            "status",
+            "id",
+            sqlite_where=_LIVE,
+            postgresql_where=_LIVE,
+        ),
+        Index("ix_tasks_project_id_updated_at", "project_id", "updated_at"),
+        Index(
+            "ix_tasks_deleted_updated_at",
+            "updated_at",
+            sqlite_where=_DELETED,
+            postgresql_where=_DELETED,
+        ),
+        Index(
+            "ix_tasks_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_tasks_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_tasks_assigned_to_trgm",
+            "assigned_to",
+            postgresql_using="gin",
+            postgresql_ops={"assigned_to": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        {"postgresql_partition_by": partition_by(settings.TASKS_PARTITIONING)},
+    )
+    __mapper_args__ = {"primary_key": ["id"]}
 
-    id: Mapped[int] = mapped_column(init=False, primary_key=True)
+    id: Mapped[int] = mapped_column(init=False, primary_key=True, autoincrement=True)
     title: Mapped[str]
     description: Mapped[str]
     assigned_to: Mapped[str]
     status: Mapped[TaskStatus]
-    created_at: Mapped[datetime] = mapped_column(init=False, server_default=func.now())
+    created_at: Mapped[datetime] = mapped_column(
+        init=False,
+        server_default=func.now(),
+        primary_key=_PARTITION_KEY == "created_at",
+    )
     updated_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now(), onupdate=func.now()
     )
-    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"))
+    project_id: Mapped[int] = mapped_column(
+        ForeignKey("projects.id"), primary_key=_PARTITION_KEY == "project_id"
+    )
 
     project: Mapped["Project"] = relationship(init=False, back_populates="tasks")
 
 
+register_substring_search(table_of(Task), "title", "description", "assigned_to")
+register_partitions(
+    table_of(Task),
+    settings.TASKS_PARTITIONING,
+    settings.TASKS_HASH_PARTITIONS,
+    settings.TASKS_PARTITION_MONTHS_AHEAD,
+)
+
 from crud_backend.models.projects import Project  # noqa
@@ -0,0 +1,111 @@
+import base64
+import binascii
+import json
+from typing import TYPE_CHECKING, Any, Sequence, TypeVar
+
+from sqlalchemy import ColumnElement, Select, func, null, select
+from sqlalchemy.orm import InstrumentedAttribute
+
+if TYPE_CHECKING:
+    from crud_backend.schemas.schemas import CountedPage, FilterPage
+
+T = TypeVar("T")
+
+
+def encode_cursor(last_id: int) -> str:
+    """Gera o cursor opaco que aponta para depois do registro `last_id`."""
+    payload = json.dumps({"id": last_id}).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Recupera o ID contido no cursor, levantando ValueError se for inválido."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded))["id"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(last_id, int):
+        raise ValueError("Invalid cursor")
+
+    return last_id
+
+
+def paginate(
+    query: Select[Any], id_column: InstrumentedAttribute[int], page: "FilterPage"
+) -> Select[Any]:
+    """Ordena por ID e aplica a página por cursor (keyset) ou por offset.
+
+    Busca um registro a mais que o limite para saber se existe próxima página.
+    """
+    query = query.order_by(id_column)
+
+    if page.cursor is not None:
+        query = query.where(id_column > decode_cursor(page.cursor))
+    else:
+        query = query.offset(page.offset)
+
+    return query.limit(page.limit + 1)
+
+
+def _page_metadata(
+    query: Select[Any], updated_column: InstrumentedAttribute[Any]
+) -> tuple[ColumnElement[Any], ColumnElement[Any]]:
+    def aggregate(column: ColumnElement[Any]) -> ColumnElement[Any]:
+        return query.with_only_columns(
+            column, maintain_column_froms=True
+        ).scalar_subquery()
+
+    return aggregate(func.count()), aggregate(func.max(updated_column))
+
+
+def paginate_with_total(
+    query: Select[Any],
+    id_column: InstrumentedAttribute[int],
+    updated_column: InstrumentedAttribute[Any],
+    page: "CountedPage",
+    *columns: ColumnElement[Any],
+) -> Select[Any]:
+    """Pagina a consulta trazendo em cada linha
+    `(registro, total, last_modified, *columns)`.
+
+    O total e a última alteração são subconsultas escalares não correlacionadas
+    sobre os registros filtrados, ignorando cursor e limite. Cada uma é calculada
+    uma única vez, e a página continua lendo pelo índice até o limite. Sem
+    `include_total` as colunas são nulas e nada é agregado.
+    """
+    metadata = (
+        _page_metadata(query, updated_column)
+        if page.include_total
+        else (null(), null())
+    )
+    return paginate(query.add_columns(*metadata, *columns), id_column, page)
+
+
+def page_metadata(
+    query: Select[Any],
+    updated_column: InstrumentedAttribute[Any],
+    page: "CountedPage",
+    *columns: ColumnElement[Any],
+) -> Select[Any]:
+    """Consulta só `(total, last_modified, *columns)`, sem trazer a página.
+
+    Usada quando a página vem vazia e para validar o If-None-Match.
+    """
+    metadata = (
+        _page_metadata(query, updated_column)
+        if page.include_total
+        else (null(), null())
+    )
+    return select(*metadata, *columns)
+
+
+def split_page(rows: Sequence[T], page: "FilterPage") -> tuple[list[T], str | None]:
+    """Separa os registros da página e o cursor da próxima, se houver."""
+    items = list(rows[: page.limit])
+
+    if len(rows) <= page.limit or not items:
+        return items, None
+
+    return items, encode_cursor(getattr(items[-1], "id"))
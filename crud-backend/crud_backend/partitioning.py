@@ -0,0 +1,138 @@
+import argparse
+import sys
+from datetime import date
+from typing import Any, Literal
+
+from sqlalchemy import Connection, Table, event, text
+
+PartitionMode = Literal["none", "hash", "range"]
+
+# Coluna que define a partição em cada estratégia; precisa fazer parte da PK
+PARTITION_KEYS: dict[PartitionMode, str] = {
+    "hash": "project_id",
+    "range": "created_at",
+}
+
+
+def partition_by(mode: PartitionMode) -> str | None:
+    """Cláusula PARTITION BY da tabela, ou None quando não há particionamento."""
+    if mode == "hash":
+        return "HASH (project_id)"
+    if mode == "range":
+        return "RANGE (created_at)"
+    return None
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_bounds(
+    table: str, mode: PartitionMode, modulus: int, first: date, last: date
+) -> dict[str, str]:
+    """Nome e limites (`FOR VALUES ...`) de cada partição.
+
+    No modo `hash` são sempre `modulus` partições; no `range` uma por mês, do mês
+    de `first` ao de `last`, mais a partição DEFAULT que recebe as datas fora delas.
+    """
+    if mode == "hash":
+        return {
+            f"{table}_p{remainder:02d}": (
+                f"FOR VALUES WITH (MODULUS {modulus}, REMAINDER {remainder})"
+            )
+            for remainder in range(modulus)
+        }
+
+    bounds = {}
+    month = first.replace(day=1)
+    while month <= last:
+        following = add_months(month, 1)
+        bounds[f"{table}_{month:%Y_%m}"] = (
+            f"FOR VALUES FROM ('{month}') TO ('{following}')"
+        )
+        month = following
+    bounds[f"{table}_default"] = "DEFAULT"
+    return bounds
+
+
+def create_partitions(
+    connection: Connection,
+    table: str,
+    mode: PartitionMode,
+    modulus: int,
+    months_ahead: int,
+    today: date | None = None,
+) -> list[str]:
+    """Cria as partições que ainda não existem e retorna os nomes criados.
+
+    No modo `range` cobre do mês atual até `months_ahead` meses à frente. Datas
+    além disso caem na partição DEFAULT em vez de falhar, mas o Postgres não cria a
+    partição de um mês que já tenha linhas na DEFAULT: o comando deve rodar antes
+    da virada do último mês criado.
+    """
+    if mode == "none":
+        return []
+
+    today = today or date.today()
+    existing = set(
+        connection.scalars(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = CAST(:table AS regclass)"
+            ),
+            {"table": table},
+        )
+    )
+    bounds = partition_bounds(
+        table, mode, modulus, today, add_months(today, months_ahead)
+    )
+
+    created = []
+    for name, bound in bounds.items():
+        if name not in existing:
+            connection.execute(
+                text(f"CREATE TABLE {name} PARTITION OF {table} {bound}")
+            )
+            created.append(name)
+    return created
+
+
+def register_partitions(
+    table: Table, mode: PartitionMode, modulus: int, months_ahead: int
+) -> None:
+    """Cria as partições junto com a tabela no `create_all` do Postgres."""
+
+    def create(target: Table, connection: Connection, **kwargs: Any) -> None:
+        if connection.dialect.name == "postgresql":
+            create_partitions(connection, target.name, mode, modulus, months_ahead)
+
+    event.listen(table, "after_create", create)
+
+
+def main(argv: list[str] | None = None) -> None:  # pragma: no cover
+    from crud_backend.database import engine, settings
+
+    parser = argparse.ArgumentParser(
+        description="Cria as partições futuras da tabela de tarefas."
+    )
+    parser.add_argument(
+        "--months-ahead", type=int, default=settings.TASKS_PARTITION_MONTHS_AHEAD
+    )
+    args = parser.parse_args(argv)
+
+    with engine.begin() as connection:
+        created = create_partitions(
+            connection,
+            "tasks",
+            settings.TASKS_PARTITIONING,
+            settings.TASKS_HASH_PARTITIONS,
+            args.months_ahead,
+        )
+
+    sys.stdout.write(f"{len(created)} partition(s) created\n")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
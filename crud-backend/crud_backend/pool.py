@@ -0,0 +1,58 @@
+from threading import Lock
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    Pool,
+    PoolProxiedConnection,
+    QueuePool,
+)
+
+
+class CheckoutTimerMixin:
+    """Acumula o número de checkouts e o tempo gasto esperando por conexões."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.checkout_wait = 0.0
+        self._stats_lock = Lock()
+
+    def connect(self) -> PoolProxiedConnection:
+        start = perf_counter()
+        try:
+            return super().connect()  # type: ignore[misc]
+        finally:
+            elapsed = perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.checkout_wait += elapsed
+
+
+class TimedQueuePool(CheckoutTimerMixin, QueuePool):
+    """QueuePool que mede o tempo de espera no checkout."""
+
+
+class TimedAsyncAdaptedQueuePool(CheckoutTimerMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool que mede o tempo de espera no checkout."""
+
+
+def pool_status(pool: Pool) -> dict[str, Any]:
+    """Retorna a ocupação atual do pool e as métricas acumuladas de checkout."""
+    status: dict[str, Any] = {
+        "size": None,
+        "checked_out": None,
+        "idle": None,
+        "overflow": None,
+        "checkouts": getattr(pool, "checkouts", 0),
+        "checkout_wait_seconds": round(getattr(pool, "checkout_wait", 0.0), 6),
+    }
+
+    if isinstance(pool, QueuePool):
+        status["size"] = pool.size()
+        status["checked_out"] = pool.checkedout()
+        status["idle"] = pool.checkedin()
+        status["overflow"] = max(pool.overflow(), 0)
+
+    return status
@@ -0,0 +1,16 @@
+from typing import Any, Callable, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def query_budget(statements: int) -> Callable[[F], F]:
+    """Declara quantos comandos SQL a rota pode executar por requisição.
+
+    O limite é verificado pelos testes, que contam os comandos enviados ao banco.
+    """
+
+    def decorator(endpoint: F) -> F:
+        setattr(endpoint, "query_budget", statements)
+        return endpoint
+
+    return decorator
@@ -0,0 +1,135 @@
+import math
+import time
+from dataclasses import dataclass
+from itertools import count
+from typing import Any
+
+import anyio
+from anyio import to_thread
+from sqlalchemy import Engine, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import Pool
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from crud_backend.pool import pool_status
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Prazo (epoch) até o qual as leituras do cliente ficam no primário
+PIN_COOKIE = "read_primary_until"
+
+
+@dataclass
+class Replica:
+    """Réplica de leitura; `async_engine` só existe no modo assíncrono."""
+
+    engine: Engine
+    async_engine: AsyncEngine | None = None
+    healthy: bool = True
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
+
+    @property
+    def pool(self) -> Pool:
+        if self.async_engine is not None:
+            return self.async_engine.sync_engine.pool
+        return self.engine.pool
+
+    async def ping(self) -> None:
+        if self.async_engine is not None:
+            async with self.async_engine.connect() as connection:
+                await connection.execute(select(1))
+            return
+
+        await to_thread.run_sync(self._ping, abandon_on_cancel=True)
+
+    def _ping(self) -> None:
+        with self.engine.connect() as connection:
+            connection.execute(select(1))
+
+
+class ReplicaSet:
+    """Distribui as leituras entre as réplicas saudáveis, em rodízio."""
+
+    def __init__(self, replicas: list[Replica]) -> None:
+        self.replicas = replicas
+        self._turn = count()
+
+    def choose(self) -> Replica | None:
+        """Próxima réplica saudável, ou None para ler do primário."""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._turn) % len(healthy)]
+
+    async def check(self, timeout: float) -> None:
+        """Testa cada réplica com `SELECT 1`; as que falham saem do rodízio."""
+        for replica in self.replicas:
+            try:
+                with anyio.fail_after(timeout):
+                    await replica.ping()
+            except (SQLAlchemyError, OSError, TimeoutError):
+                replica.healthy = False
+            else:
+                replica.healthy = True
+
+    async def monitor(
+        self, interval: float, timeout: float
+    ) -> None:  # pragma: no cover
+        while True:
+            await self.check(timeout)
+            await anyio.sleep(interval)
+
+    def status(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "name": replica.name,
+                "healthy": replica.healthy,
+                "pool": pool_status(replica.pool),
+            }
+            for replica in self.replicas
+        ]
+
+
+def pinned_to_primary(connection: HTTPConnection) -> bool:
+    """Indica se o cliente escreveu há pouco e ainda deve ler do primário."""
+    try:
+        return float(connection.cookies.get(PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware:
+    """Mantém as leituras no primário por `window` segundos após uma escrita.
+
+    O prazo vai num cookie, então vale para qualquer instância da API. Clientes em
+    outra origem só o guardam e reenviam com credenciais (`withCredentials` no axios).
+    Sem réplicas configuradas as respostas passam sem alteração.
+    """
+
+    def __init__(self, app: ASGIApp, replicas: ReplicaSet, window: float) -> None:
+        self.app = app
+        self.replicas = replicas
+        self.window = window
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        writes = scope["type"] == "http" and scope["method"] not in READ_METHODS
+        if not writes or not self.replicas.replicas:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_pin(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                MutableHeaders(scope=message).append(
+                    "set-cookie",
+                    f"{PIN_COOKIE}={time.time() + self.window:.3f}; "
+                    f"Max-Age={math.ceil(self.window)}; Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_pin)
@@ -0,0 +1,36 @@
+from http import HTTPStatus
+from secrets import compare_digest
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+from crud_backend.database import get_slow_query_log, settings
+from crud_backend.schemas.admin import SlowQueryList, SlowQueryPublic
+from crud_backend.slow_queries import SlowQueryLog
+
+
+def require_admin(x_admin_token: Annotated[str | None, Header()] = None) -> None:
+    """Exige o `ADMIN_TOKEN`; sem ele configurado as rotas não existem."""
+    if settings.ADMIN_TOKEN is None:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Not Found")
+    if x_admin_token is None or not compare_digest(
+        x_admin_token.encode(), settings.ADMIN_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=HTTPStatus.UNAUTHORIZED, detail="Invalid admin token"
+        )
+
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@router.get("/slow-queries", response_model=SlowQueryList)
+def list_slow_queries(
+    log: SlowQueryLog = Depends(get_slow_query_log),
+) -> SlowQueryList:
+    """Lista as consultas lentas mais recentes, da mais nova para a mais antiga."""
+    return SlowQueryList(
+        queries=[
+            SlowQueryPublic.model_validate(entry) for entry in reversed(log.entries)
+        ]
+    )
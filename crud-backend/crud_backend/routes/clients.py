@@ -1,33 +1,75 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
 from http import HTTPStatus
-from typing import Annotated
+from typing import Annotated, Any, cast
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    CursorResult,
+    delete,
+    exists,
+    func,
+    insert,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
-from crud_backend.schemas.clients import ClientPublic, ClientSchema, ClientList
-from crud_backend.schemas.schemas import FilterPage, Message
+from crud_backend.schemas.clients import (
+    ClientBulkResult,
+    ClientExpanded,
+    ClientExpandedList,
+    ClientPublic,
+    ClientSchema,
+    ClientList,
+    ClientView,
+    ClientSummary,
+    FilterClients,
+    RecentTask,
+)
+from crud_backend.schemas.projects import ProjectPublic
+from crud_backend.schemas.schemas import BULK_MAX_ITEMS, BulkError, Message
 from crud_backend.database import get_session
+from crud_backend.entity_cache import EntityCache, get_entity_cache
+from crud_backend.expand import expand_clients
+from crud_backend.list_cache import ListCache, client_projects, get_list_cache
+from crud_backend.http_cache import (
+    entity_etag,
+    etag_matches,
+    not_modified,
+    set_validators,
+)
 from crud_backend.models.clients import Client
-
+from crud_backend.models.projects import Project, ProjectStatus
+from crud_backend.models.stats import ProjectTaskStats
+from crud_backend.models.tasks import Task, TaskStatus
+from crud_backend.pagination import paginate, split_page
+from crud_backend.query_budget import query_budget
+from crud_backend.serialization import json_response, load_fields, trusted
 
 router = APIRouter()
 
 
 @router.post("/", status_code=HTTPStatus.CREATED, response_model=ClientPublic)
-def create_client(
-    client: ClientSchema, session: Session = Depends(get_session)
-) -> ClientPublic:
+@query_budget(2)
+async def create_client(
+    client: ClientSchema, session: AsyncSession = Depends(get_session)
+) -> Response:
     """Cria um novo cliente."""
-    db_client_email = session.scalar(select(Client).where(Client.email == client.email))
-    if db_client_email:
+    duplicates = (
+        await session.execute(
+            select(Client.email, Client.phone).where(
+                or_(Client.email == client.email, Client.phone == client.phone)
+            )
+        )
+    ).all()
+
+    if any(email == client.email for email, _ in duplicates):
         raise HTTPException(
             status_code=HTTPStatus.BAD_REQUEST, detail="Email already exists"
         )
 
-    db_client_phone = session.scalar(select(Client).where(Client.phone == client.phone))
-    if db_client_phone:
+    if duplicates:
         raise HTTPException(
             status_code=HTTPStatus.BAD_REQUEST, detail="Phone already exists"
         )
@@ -35,70 +77,278 @@ def create_client(
     db_client = Client(company=client.company, email=client.email, phone=client.phone)
 
     session.add(db_client)
-    session.commit()
-    session.refresh(db_client)
+    await session.flush()
+    client_public = trusted(ClientPublic, db_client)
+    await session.commit()
+
+    return json_response(client_public, HTTPStatus.CREATED)
+
+
+@router.post("/bulk", status_code=HTTPStatus.CREATED, response_model=ClientBulkResult)
+@query_budget(2)
+async def create_clients_bulk(
+    clients: Annotated[list[ClientSchema], Body(max_length=BULK_MAX_ITEMS)],
+    session: AsyncSession = Depends(get_session),
+) -> ClientBulkResult | Response:
+    """Cria vários clientes em uma única inserção, reportando os conflitos por item."""
+    if not clients:
+        return ClientBulkResult(created=[], errors=[])
+
+    unique_fields = ("email", "phone", "company")
+    existing = (
+        await session.execute(
+            select(Client.email, Client.phone, Client.company).where(
+                or_(
+                    *(
+                        getattr(Client, field).in_(
+                            {getattr(client, field) for client in clients}
+                        )
+                        for field in unique_fields
+                    )
+                )
+            )
+        )
+    ).all()
+    taken = {
+        field: {getattr(row, field) for row in existing} for field in unique_fields
+    }
+
+    errors = []
+    rows = []
+    for index, client in enumerate(clients):
+        conflict = next(
+            (
+                field
+                for field in unique_fields
+                if getattr(client, field) in taken[field]
+            ),
+            None,
+        )
+        if conflict:
+            errors.append(
+                BulkError(index=index, detail=f"{conflict.capitalize()} already exists")
+            )
+            continue
+
+        for field in unique_fields:
+            taken[field].add(getattr(client, field))
+        rows.append(client.model_dump())
 
-    return ClientPublic.model_validate(db_client)
+    created = []
+    if rows:
+        try:
+            db_clients = await session.scalars(insert(Client).returning(Client), rows)
+            created = [
+                trusted(ClientPublic, client)
+                for client in sorted(db_clients, key=lambda client: client.id)
+            ]
+        except IntegrityError:
+            await session.rollback()
+            raise HTTPException(
+                status_code=HTTPStatus.CONFLICT, detail="Email or Phone already exists"
+            )
+        await session.commit()
 
+    return json_response(
+        ClientBulkResult(created=created, errors=errors), HTTPStatus.CREATED
+    )
 
-@router.get("/", response_model=ClientList)
-def read_clients(
-    filter: Annotated[FilterPage, Query()], session: Session = Depends(get_session)
-) -> ClientList:
+
+@router.get("/", response_model=ClientExpandedList)
+@query_budget(3)
+async def read_clients(
+    filter: Annotated[FilterClients, Query()],
+    session: AsyncSession = Depends(get_session),
+) -> Response:
     """Recupera uma lista de clientes com paginação."""
-    clients = session.scalars(select(Client).limit(filter.limit).offset(filter.offset))
+    query = select(Client).options(*load_fields(Client, filter.selected))
+    rows = (await session.scalars(paginate(query, Client.id, filter))).all()
+    clients, next_cursor = split_page(rows, filter)
+
+    if filter.expansions:
+        client_list = ClientExpandedList(
+            clients=await expand_clients(session, clients, filter),
+            next_cursor=next_cursor,
+        )
+        return json_response(client_list, exclude_unset=True)
 
-    client_public_list = [ClientPublic.model_validate(client) for client in clients]
+    client_public_list = [
+        trusted(ClientPublic, client, filter.selected) for client in clients
+    ]
 
-    return ClientList(clients=client_public_list)
+    return json_response(
+        ClientList(clients=client_public_list, next_cursor=next_cursor)
+    )
 
 
-@router.get("/{client_id}", response_model=ClientPublic)
-def read_client(
-    client_id: int, session: Session = Depends(get_session)
-) -> ClientPublic:
+@router.get("/{client_id}", response_model=ClientExpanded)
+@query_budget(3)
+async def read_client(
+    client_id: int,
+    request: Request,
+    view: Annotated[ClientView, Query()],
+    session: AsyncSession = Depends(get_session),
+) -> Response:
     """Recupera um cliente específico pelo ID."""
-    db_client = session.scalar(select(Client).where(Client.id == client_id))
+    db_client = await session.scalar(
+        select(Client)
+        .options(*load_fields(Client, view.selected, "updated_at"))
+        .where(Client.id == client_id)
+    )
 
     if not db_client:
         raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Client not found")
 
-    return ClientPublic.model_validate(db_client)
+    if view.expansions:
+        # Os filhos não entram na ETag, então a resposta expandida não é validada
+        (expanded,) = await expand_clients(session, [db_client], view)
+        return json_response(expanded, exclude_unset=True)
 
+    etag = entity_etag("client", db_client.id, db_client.updated_at, view.fields)
+    if etag_matches(request, etag):
+        return not_modified(etag, db_client.updated_at)
 
-@router.patch("/{client_id}", response_model=ClientPublic)
-def patch_client(
-    client_id: int, client: ClientSchema, session: Session = Depends(get_session)
-) -> ClientPublic:
-    """Atualiza um cliente existente."""
-    db_client = session.scalar(select(Client).where(Client.id == client_id))
+    response = json_response(trusted(ClientPublic, db_client, view.selected))
+    set_validators(response, etag, db_client.updated_at)
 
-    if not db_client:
+    return response
+
+
+@router.get("/{client_id}/summary", response_model=ClientSummary)
+@query_budget(4)
+async def read_client_summary(
+    client_id: int,
+    recent: Annotated[int, Query(ge=0, le=50)] = 5,
+    session: AsyncSession = Depends(get_session),
+) -> Response:
+    """Resume os projetos e tarefas do cliente em um número fixo de consultas."""
+    # A contagem por status também traz o cliente; sem linhas, ele não existe
+    project_rows = (
+        await session.execute(
+            select(Client, Project.status, func.count(Project.id))
+            .outerjoin(Project, Project.client_id == Client.id)
+            .where(Client.id == client_id)
+            .group_by(Client.id, Project.status)
+        )
+    ).all()
+    if not project_rows:
         raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Client not found")
 
-    try:
-        for key, value in client.model_dump(exclude_unset=True).items():
-            setattr(db_client, key, value)
-        session.commit()
-        session.refresh(db_client)
+    project_counts = dict.fromkeys(ProjectStatus, 0)
+    for _, status, count in project_rows:
+        if status is not None:
+            project_counts[status] = count
+
+    # As tarefas são somadas a partir dos contadores por projeto
+    task_totals = (
+        await session.execute(
+            select(
+                *(
+                    func.coalesce(func.sum(getattr(ProjectTaskStats, status.name)), 0)
+                    for status in TaskStatus
+                )
+            )
+            .join(Project, Project.id == ProjectTaskStats.project_id)
+            .where(Project.client_id == client_id)
+        )
+    ).one()
+
+    recent_projects = await session.scalars(
+        select(Project)
+        .where(Project.client_id == client_id)
+        .order_by(Project.updated_at.desc(), Project.id.desc())
+        .limit(recent)
+    )
+    recent_tasks = await session.scalars(
+        select(Task)
+        .join(Project, Project.id == Task.project_id)
+        .where(Project.client_id == client_id)
+        .order_by(Task.updated_at.desc(), Task.id.desc())
+        .limit(recent)
+    )
+
+    summary = ClientSummary(
+        client=trusted(ClientPublic, project_rows[0][0]),
+        projects=project_counts,
+        tasks=dict(zip(TaskStatus, task_totals)),
+        recent_projects=[
+            ProjectPublic.model_validate(project) for project in recent_projects
+        ],
+        recent_tasks=[RecentTask.model_validate(task) for task in recent_tasks],
+    )
+
+    return json_response(summary)
 
-        return ClientPublic.model_validate(db_client)
 
+@router.patch("/{client_id}", response_model=ClientPublic)
+@query_budget(1)
+async def patch_client(
+    client_id: int,
+    client: ClientSchema,
+    session: AsyncSession = Depends(get_session),
+    cache: EntityCache = Depends(get_entity_cache),
+) -> Response:
+    """Atualiza um cliente existente."""
+    try:
+        db_client = await session.scalar(
+            update(Client)
+            .where(Client.id == client_id)
+            .values(**client.model_dump(exclude_unset=True))
+            .returning(Client)
+            .execution_options(populate_existing=True)
+        )
     except IntegrityError:
+        await session.rollback()
         raise HTTPException(
             status_code=HTTPStatus.CONFLICT, detail="Email or Phone already exists"
         )
 
+    if not db_client:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Client not found")
+
+    client_public = trusted(ClientPublic, db_client)
+    await session.commit()
+    await cache.invalidate_client(client_id)
+
+    return json_response(client_public)
+
+
+def _client_has_projects() -> HTTPException:
+    return HTTPException(status_code=HTTPStatus.CONFLICT, detail="Client has projects")
+
 
 @router.delete("/{client_id}", response_model=Message)
-def delete_client(client_id: int, session: Session = Depends(get_session)) -> Message:
-    """Remove um cliente pelo ID."""
-    db_client = session.scalar(select(Client).where(Client.id == client_id))
+@query_budget(2)
+async def delete_client(
+    client_id: int,
+    session: AsyncSession = Depends(get_session),
+    cache: EntityCache = Depends(get_entity_cache),
+    list_cache: ListCache = Depends(get_list_cache),
+) -> Message:
+    """Remove um cliente pelo ID, recusando clientes que ainda têm projetos."""
+    # O DELETE em Core não passa pelos relacionamentos do ORM: a checagem dos
+    # projetos vai no próprio comando, inclusive no SQLite sem FKs
+    try:
+        result = cast(
+            CursorResult[Any],
+            await session.execute(
+                delete(Client).where(
+                    Client.id == client_id,
+                    ~exists().where(Project.client_id == client_id),
+                )
+            ),
+        )
+    except IntegrityError:
+        await session.rollback()
+        raise _client_has_projects()
 
-    if not db_client:
+    if not result.rowcount:
+        if await session.scalar(select(exists().where(Client.id == client_id))):
+            raise _client_has_projects()
         raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Client not found")
 
-    session.delete(db_client)
-    session.commit()
+    await session.commit()
+    await cache.invalidate_client(client_id)
+    await list_cache.bump(client_projects(client_id))
 
     return Message(message="Client deleted!")
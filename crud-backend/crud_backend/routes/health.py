@@ -0,0 +1,51 @@
+from http import HTTPStatus
+
+from anyio import to_thread
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crud_backend.database import get_pool, get_primary_session, replicas
+from crud_backend.entity_cache import EntityCache, get_entity_cache
+from crud_backend.list_cache import ListCache, get_list_cache
+from crud_backend.pool import pool_status
+from crud_backend.schemas.health import (
+    CacheStats,
+    ListCacheStats,
+    PoolStatus,
+    ReadinessStatus,
+    ReplicaStatus,
+)
+
+router = APIRouter()
+
+
+@router.get("/ready", response_model=ReadinessStatus)
+async def readiness(
+    session: AsyncSession = Depends(get_primary_session),
+    cache: EntityCache = Depends(get_entity_cache),
+    list_cache: ListCache = Depends(get_list_cache),
+) -> ReadinessStatus:
+    """Verifica a conexão com o primário e informa a ocupação do pool e dos caches.
+
+    As réplicas aparecem com o estado do último teste, sem afetar a prontidão:
+    sem nenhuma saudável as leituras voltam ao primário.
+    """
+    try:
+        await session.execute(select(1))
+    except SQLAlchemyError:
+        raise HTTPException(
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE, detail="Database unavailable"
+        )
+
+    limiter = to_thread.current_default_thread_limiter()
+
+    return ReadinessStatus(
+        status="ready",
+        threadpool_limit=int(limiter.total_tokens),
+        pool=PoolStatus(**pool_status(get_pool())),
+        replicas=[ReplicaStatus(**status) for status in replicas.status()],
+        entity_cache=CacheStats(**cache.stats()),
+        list_cache=ListCacheStats(**list_cache.stats()),
+    )
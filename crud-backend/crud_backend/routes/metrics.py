@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Response
+
+from crud_backend.database import get_pool, replicas
+from crud_backend.metrics import CONTENT_TYPE, render_metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    """Expõe as métricas da instância no formato de texto do Prometheus."""
+    pools = {
+        "primary": get_pool(),
+        **{
+            f"replica-{index}": replica.pool
+            for index, replica in enumerate(replicas.replicas)
+        },
+    }
+    return Response(render_metrics(pools), media_type=CONTENT_TYPE)
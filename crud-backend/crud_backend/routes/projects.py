@@ -1,150 +1,531 @@
 from http import HTTPStatus
-from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException, Query
-
-from sqlalchemy import func, select
-from sqlalchemy.orm import Session
-
-from crud_backend.database import get_session
+from typing import Annotated, Any, AsyncContextManager, Callable, cast
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Body,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+)
+from fastapi.responses import StreamingResponse
+
+from sqlalchemy import CursorResult, delete, exists, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from crud_backend.archive import select_rows
+from crud_backend.database import (
+    get_session,
+    get_session_factory,
+    read_replica,
+)
+from crud_backend.entity_cache import EntityCache, get_entity_cache
+from crud_backend.expand import expand_projects
+from crud_backend.export import export_response, stream_rows
+from crud_backend.http_cache import (
+    entity_etag,
+    etag_matches,
+    list_etag,
+    not_modified,
+    set_validators,
+)
+from crud_backend.importer import import_file, text_stream
+from crud_backend.list_cache import (
+    ListCache,
+    client_projects,
+    get_list_cache,
+    project_tasks,
+)
 from crud_backend.models.clients import Client
-from crud_backend.models.projects import Project
+from crud_backend.models.projects import Project, ProjectStatus
+from crud_backend.models.registry import table_of
+from crud_backend.models.stats import ProjectTaskStats
+from crud_backend.models.tasks import Task, TaskStatus
+from crud_backend.pagination import page_metadata, paginate_with_total, split_page
+from crud_backend.query_budget import query_budget
+from crud_backend.search import substring_match
+from crud_backend.serialization import from_row, json_response, load_fields, trusted
 from crud_backend.schemas.projects import (
     FilterProject,
+    ProjectBulkResult,
+    ProjectExpanded,
+    ProjectExpandedList,
+    ProjectExportFilter,
+    ProjectPredicate,
     ProjectList,
+    ProjectView,
     ProjectPublic,
     ProjectSchema,
+    ProjectTaskStatsPublic,
     ProjectUpdate,
 )
-from crud_backend.schemas.schemas import Message
+from crud_backend.schemas.schemas import (
+    BULK_MAX_ITEMS,
+    ExportFormat,
+    ImportReport,
+    Message,
+)
 
 router = APIRouter()
 
 
+def _client_not_found() -> HTTPException:
+    return HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Client not found")
+
+
+def _project_not_found() -> HTTPException:
+    return HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Project not found")
+
+
+def _project_has_tasks() -> HTTPException:
+    return HTTPException(status_code=HTTPStatus.CONFLICT, detail="Project has tasks")
+
+
+async def _missing_project_error(
+    session: AsyncSession, client_id: int
+) -> HTTPException:
+    """Diferencia cliente inexistente de projeto inexistente após um miss."""
+    client_exists = await session.scalar(select(exists().where(Client.id == client_id)))
+    return _project_not_found() if client_exists else _client_not_found()
+
+
+async def _stale_client_error(
+    session: AsyncSession, cache: EntityCache, client_id: int
+) -> HTTPException:
+    """Trata a FK violada quando o cache confirmou um cliente já removido."""
+    await session.rollback()
+    await cache.invalidate_client(client_id)
+    return _client_not_found()
+
+
+def _project_conditions(
+    predicate: ProjectPredicate, dialect: str, entity: type[Any] = Project
+) -> list[ColumnElement[bool]]:
+    """Converte os filtros de projeto em condições SQL sobre `entity`."""
+    conditions = []
+    case_insensitive = predicate.case_insensitive
+
+    if predicate.title:
+        conditions.append(
+            substring_match(entity.title, predicate.title, case_insensitive, dialect)
+        )
+
+    if predicate.description:
+        conditions.append(
+            substring_match(
+                entity.description, predicate.description, case_insensitive, dialect
+            )
+        )
+
+    if predicate.status:
+        conditions.append(entity.status == predicate.status)
+        if predicate.status != ProjectStatus.deleted:
+            # Redundante, mas permite usar o índice parcial sem as linhas `deleted`
+            conditions.append(entity.status != ProjectStatus.deleted)
+
+    return conditions
+
+
 @router.post("/", status_code=HTTPStatus.CREATED, response_model=ProjectPublic)
-def create_project(
-    client_id: int, project: ProjectSchema, session: Session = Depends(get_session)
-) -> ProjectPublic:
+@query_budget(2)
+async def create_project(
+    client_id: int,
+    project: ProjectSchema,
+    session: AsyncSession = Depends(get_session),
+    cache: EntityCache = Depends(get_entity_cache),
+    list_cache: ListCache = Depends(get_list_cache),
+) -> Response:
     """Cria um novo projeto."""
-    db_client = session.scalar(select(Client).where(Client.id == client_id))
-    if not db_client:
-        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Client not found")
+    if not await cache.client_exists(session, client_id):
+        raise _client_not_found()
 
     project_data = project.model_dump()
     project_data["client_id"] = client_id
     db_project = Project(**project_data)
 
     session.add(db_project)
-    session.commit()
-    session.refresh(db_project)
+    try:
+        await session.flush()
+    except IntegrityError:
+        raise await _stale_client_error(session, cache, client_id)
+    project_public = ProjectPublic.model_validate(db_project)
+    await session.commit()
+    await list_cache.bump(client_projects(client_id))
 
-    return ProjectPublic.model_validate(db_project)
+    return json_response(project_public, HTTPStatus.CREATED)
 
 
-@router.get("/", response_model=ProjectList)
-def list_projects(
+@router.post("/bulk", status_code=HTTPStatus.CREATED, response_model=ProjectBulkResult)
+@query_budget(2)
+async def create_projects_bulk(
     client_id: int,
-    project_filter: Annotated[FilterProject, Query()],
-    session: Session = Depends(get_session),
-) -> ProjectList:
-    """Recupera uma lista de projetos com paginação."""
-    db_client = session.scalar(select(Client).where(Client.id == client_id))
-    if not db_client:
-        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Client not found")
+    projects: Annotated[list[ProjectSchema], Body(max_length=BULK_MAX_ITEMS)],
+    session: AsyncSession = Depends(get_session),
+    cache: EntityCache = Depends(get_entity_cache),
+    list_cache: ListCache = Depends(get_list_cache),
+) -> ProjectBulkResult | Response:
+    """Cria vários projetos do cliente em uma única inserção."""
+    if not await cache.client_exists(session, client_id):
+        raise _client_not_found()
+
+    if not projects:
+        return ProjectBulkResult(created=[])
+
+    try:
+        db_projects = await session.scalars(
+            insert(Project).returning(Project),
+            [{**project.model_dump(), "client_id": client_id} for project in projects],
+        )
+    except IntegrityError:
+        raise await _stale_client_error(session, cache, client_id)
+    created = [
+        trusted(ProjectPublic, project)
+        for project in sorted(db_projects, key=lambda project: project.id)
+    ]
+    await session.commit()
+    await list_cache.bump(client_projects(client_id))
 
-    query = select(Project).where(Project.client_id == client_id)
+    return json_response(ProjectBulkResult(created=created), HTTPStatus.CREATED)
 
-    if project_filter.title:
-        query = query.filter(Project.title.contains(project_filter.title))
 
-    if project_filter.description:
-        query = query.filter(Project.description.contains(project_filter.description))
+@router.post("/import", status_code=HTTPStatus.CREATED, response_model=ImportReport)
+# Sem query_budget: além da consulta do cliente, cada lote de IMPORT_CHUNK_SIZE
+# linhas é um INSERT/COPY, então o total cresce com o arquivo
+async def import_projects(
+    client_id: int,
+    file: UploadFile,
+    format: ExportFormat = ExportFormat.ndjson,
+    session: AsyncSession = Depends(get_session),
+    cache: EntityCache = Depends(get_entity_cache),
+    list_cache: ListCache = Depends(get_list_cache),
+) -> ImportReport:
+    """Importa projetos do cliente de um arquivo CSV/NDJSON em lotes."""
+    if not await cache.client_exists(session, client_id):
+        raise _client_not_found()
+
+    try:
+        report = await import_file(
+            session,
+            text_stream(file.file),
+            format,
+            ProjectSchema,
+            table_of(Project),
+            {"client_id": client_id},
+        )
+    except IntegrityError:
+        raise await _stale_client_error(session, cache, client_id)
+    # Os lotes já gravados valem mesmo quando há linhas rejeitadas
+    await list_cache.bump(client_projects(client_id))
 
-    if project_filter.status:
-        query = query.filter(Project.status == project_filter.status)
+    return report
 
-    total = session.scalar(select(func.count()).select_from(query.subquery()))
 
-    projects = session.scalars(
-        query.offset(project_filter.offset).limit(project_filter.limit)
+async def _project_page(
+    session: AsyncSession,
+    request: Request,
+    client_id: int,
+    project_filter: FilterProject,
+    conditional: bool,
+) -> Response:
+    """Executa a listagem, devolvendo a página serializada ou um 304."""
+    dialect = session.get_bind().dialect.name
+    source, query = select_rows(
+        Project,
+        lambda entity: [
+            entity.client_id == client_id,
+            *_project_conditions(project_filter, dialect, entity),
+        ],
+        project_filter.include_archived,
+    )
+    client_exists = exists().where(Client.id == client_id)
+
+    metadata = None
+    revalidating = conditional and "if-none-match" in request.headers
+    if revalidating and project_filter.include_total:
+        # A revalidação usa só a agregação, sem ler a página
+        metadata = (
+            await session.execute(
+                page_metadata(query, source.updated_at, project_filter, client_exists)
+            )
+        ).one()
+        total, last_modified, found = metadata
+        if not found:
+            raise _client_not_found()
+
+        etag = list_etag(request, total, last_modified)
+        if etag_matches(request, etag):
+            return not_modified(etag, last_modified)
+
+    # O total, a última alteração e a existência do cliente vêm na própria página
+    rows = (
+        await session.execute(
+            paginate_with_total(
+                query, source.id, source.updated_at, project_filter, client_exists
+            ).options(*load_fields(source, project_filter.selected))
+        )
     ).all()
+    if rows:
+        _, total, last_modified, found = rows[0]
+    elif metadata is None:
+        total, last_modified, found = (
+            await session.execute(
+                page_metadata(query, source.updated_at, project_filter, client_exists)
+            )
+        ).one()
+    if not found:
+        raise _client_not_found()
+
+    projects, next_cursor = split_page([row[0] for row in rows], project_filter)
+
+    if project_filter.expansions:
+        project_list = ProjectExpandedList(
+            projects=await expand_projects(session, projects, project_filter),
+            total=total,
+            next_cursor=next_cursor,
+        )
+        return json_response(project_list, exclude_unset=True)
 
     project_public_list = [
-        ProjectPublic.model_validate(project) for project in projects
+        from_row(ProjectPublic, project, project_filter.selected)
+        for project in projects
     ]
 
-    return ProjectList(projects=project_public_list, total=total)
+    response = json_response(
+        ProjectList(projects=project_public_list, total=total, next_cursor=next_cursor)
+    )
+    if project_filter.include_total:
+        set_validators(
+            response, list_etag(request, total, last_modified), last_modified
+        )
 
+    return response
 
-@router.get("/{project_id}", response_model=ProjectPublic)
-def read_project(
-    client_id: int, project_id: int, session: Session = Depends(get_session)
-) -> ProjectPublic:
-    """Recupera um projeto específico pelo ID."""
-    db_client = session.scalar(select(Client).where(Client.id == client_id))
-    if not db_client:
-        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Client not found")
 
-    db_project = session.scalar(
-        select(Project).where(Project.id == project_id, Project.client_id == client_id)
+@router.get("/", response_model=ProjectExpandedList)
+@query_budget(3)
+async def list_projects(
+    client_id: int,
+    project_filter: Annotated[FilterProject, Query()],
+    request: Request,
+    background_tasks: BackgroundTasks,
+    session: AsyncSession = Depends(get_session),
+    session_factory: Callable[[], AsyncContextManager[AsyncSession]] = Depends(
+        get_session_factory
+    ),
+    list_cache: ListCache = Depends(get_list_cache),
+) -> Response:
+    """Recupera uma lista de projetos com paginação."""
+    if project_filter.expansions:
+        # As tarefas embutidas não mudam a ETag nem a geração do cliente
+        return await _project_page(session, request, client_id, project_filter, False)
+
+    return await list_cache.serve(
+        "list_projects",
+        [client_projects(client_id)],
+        project_filter,
+        request,
+        background_tasks,
+        session_factory,
+        lambda session, conditional: _project_page(
+            session, request, client_id, project_filter, conditional
+        ),
+        from_replica=read_replica(request) is not None,
     )
-    if not db_project:
-        raise HTTPException(
-            status_code=HTTPStatus.NOT_FOUND, detail="Project not found"
+
+
+@router.get("/export", response_class=StreamingResponse)
+@query_budget(2)
+async def export_projects(
+    client_id: int,
+    project_filter: Annotated[ProjectExportFilter, Query()],
+    session: AsyncSession = Depends(get_session),
+    session_factory: Callable[[], AsyncContextManager[AsyncSession]] = Depends(
+        get_session_factory
+    ),
+    cache: EntityCache = Depends(get_entity_cache),
+) -> StreamingResponse:
+    """Exporta os projetos do cliente em NDJSON ou CSV, sem paginação."""
+    if not await cache.client_exists(session, client_id):
+        raise _client_not_found()
+
+    dialect = session.get_bind().dialect.name
+    source, query = select_rows(
+        Project,
+        lambda entity: [
+            entity.client_id == client_id,
+            *_project_conditions(project_filter, dialect, entity),
+        ],
+        project_filter.include_archived,
+    )
+
+    return export_response(
+        stream_rows(
+            session_factory,
+            query.order_by(source.id),
+            ProjectPublic,
+            project_filter.format,
+        ),
+        project_filter.format,
+        f"client-{client_id}-projects",
+    )
+
+
+@router.get("/{project_id}", response_model=ProjectExpanded)
+@query_budget(2)
+async def read_project(
+    client_id: int,
+    project_id: int,
+    request: Request,
+    view: Annotated[ProjectView, Query()],
+    session: AsyncSession = Depends(get_session),
+) -> Response:
+    """Recupera um projeto específico pelo ID."""
+    row = (
+        await session.execute(
+            select(Client.id, Project)
+            .outerjoin(
+                Project, (Project.client_id == Client.id) & (Project.id == project_id)
+            )
+            .where(Client.id == client_id)
+            .options(*load_fields(Project, view.selected, "updated_at"))
         )
+    ).first()
+
+    if row is None:
+        raise _client_not_found()
+
+    _, db_project = row
+    if db_project is None:
+        raise _project_not_found()
+
+    if view.expansions:
+        # As tarefas não entram na ETag, então a resposta expandida não é validada
+        (expanded,) = await expand_projects(session, [db_project], view)
+        return json_response(expanded, exclude_unset=True)
+
+    etag = entity_etag("project", db_project.id, db_project.updated_at, view.fields)
+    if etag_matches(request, etag):
+        return not_modified(etag, db_project.updated_at)
+
+    response = json_response(from_row(ProjectPublic, db_project, view.selected))
+    set_validators(response, etag, db_project.updated_at)
+
+    return response
+
+
+@router.get("/{project_id}/stats", response_model=ProjectTaskStatsPublic)
+@query_budget(1)
+async def read_project_stats(
+    client_id: int, project_id: int, session: AsyncSession = Depends(get_session)
+) -> ProjectTaskStatsPublic:
+    """Recupera a contagem de tarefas do projeto por status."""
+    row = (
+        await session.execute(
+            select(Client.id, Project.id, ProjectTaskStats)
+            .outerjoin(
+                Project, (Project.client_id == Client.id) & (Project.id == project_id)
+            )
+            .outerjoin(ProjectTaskStats, ProjectTaskStats.project_id == Project.id)
+            .where(Client.id == client_id)
+        )
+    ).first()
+
+    if row is None:
+        raise _client_not_found()
 
-    return ProjectPublic.model_validate(db_project)
+    _, found_project_id, stats = row
+    if found_project_id is None:
+        raise _project_not_found()
+
+    # Projetos sem tarefas ainda não têm linha de contadores
+    counts = (
+        {status.name: getattr(stats, status.name) for status in TaskStatus}
+        if stats
+        else {}
+    )
+
+    return ProjectTaskStatsPublic(
+        project_id=project_id, total=sum(counts.values()), **counts
+    )
 
 
 @router.patch("/{project_id}", response_model=ProjectPublic)
-def patch_project(
+@query_budget(2)
+async def patch_project(
     client_id: int,
     project: ProjectUpdate,
     project_id: int,
-    session: Session = Depends(get_session),
-) -> ProjectPublic:
+    session: AsyncSession = Depends(get_session),
+    cache: EntityCache = Depends(get_entity_cache),
+    list_cache: ListCache = Depends(get_list_cache),
+) -> Response:
     """Atualiza um projeto existente."""
-    db_client = session.scalar(select(Client).where(Client.id == client_id))
-    if not db_client:
-        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Client not found")
-
-    db_project = session.scalar(
-        select(Project).where(Project.client_id == client_id, Project.id == project_id)
-    )
-
-    if not db_project:
-        raise HTTPException(
-            status_code=HTTPStatus.NOT_FOUND, detail="Project not found"
+    values = project.model_dump(exclude_unset=True)
+    where = (Project.client_id == client_id, Project.id == project_id)
+
+    if values:
+        db_project = await session.scalar(
+            update(Project)
+            .where(*where)
+            .values(**values)
+            .returning(Project)
+            .execution_options(populate_existing=True)
         )
+    else:
+        db_project = await session.scalar(select(Project).where(*where))
 
-    for key, value in project.model_dump(exclude_unset=True).items():
-        setattr(db_project, key, value)
+    if not db_project:
+        raise await _missing_project_error(session, client_id)
 
-    session.add(db_project)
-    session.commit()
-    session.refresh(db_project)
+    project_public = ProjectPublic.model_validate(db_project)
+    await session.commit()
+    await cache.invalidate_project(project_id)
+    await list_cache.bump(client_projects(client_id))
 
-    return ProjectPublic.model_validate(db_project)
+    return json_response(project_public)
 
 
 @router.delete("/{project_id}", response_model=Message)
-def delete_project(
-    project_id: int, client_id: int, session: Session = Depends(get_session)
+@query_budget(2)
+async def delete_project(
+    project_id: int,
+    client_id: int,
+    session: AsyncSession = Depends(get_session),
+    cache: EntityCache = Depends(get_entity_cache),
+    list_cache: ListCache = Depends(get_list_cache),
 ) -> Message:
-    """Remove um projeto pelo ID."""
-    db_client = session.scalar(select(Client).where(Client.id == client_id))
-    if not db_client:
-        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Client not found")
-
-    project = session.scalar(
-        select(Project).where(Project.client_id == client_id, Project.id == project_id)
-    )
-
-    if not project:
-        raise HTTPException(
-            status_code=HTTPStatus.NOT_FOUND, detail="Project not found"
+    """Remove um projeto pelo ID, recusando projetos que ainda têm tarefas."""
+    where = (Project.client_id == client_id, Project.id == project_id)
+    try:
+        result = cast(
+            CursorResult[Any],
+            await session.execute(
+                delete(Project).where(
+                    *where, ~exists().where(Task.project_id == project_id)
+                )
+            ),
         )
-
-    session.delete(project)
-    session.commit()
+    except IntegrityError:
+        await session.rollback()
+        raise _project_has_tasks()
+
+    if not result.rowcount:
+        client_exists, project_exists = (
+            await session.execute(
+                select(exists().where(Client.id == client_id), exists().where(*where))
+            )
+        ).one()
+        if project_exists:
+            raise _project_has_tasks()
+        raise _project_not_found() if client_exists else _client_not_found()
+
+    await session.commit()
+    await cache.invalidate_project(project_id)
+    await list_cache.bump(client_projects(client_id), project_tasks(project_id))
 
     return Message(message="Project deleted successfully")
@@ -1,152 +1,548 @@
 from http import HTTPStatus
-from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Annotated, Any, AsyncContextManager, Callable, cast
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Body,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+)
+from fastapi.responses import StreamingResponse
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import CursorResult, delete, exists, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from crud_backend.models.tasks import Task
+from crud_backend.archive import select_rows
+from crud_backend.models.tasks import Task, TaskStatus
 from crud_backend.models.projects import Project
-from crud_backend.schemas.schemas import Message
+from crud_backend.models.registry import table_of
+from crud_backend.pagination import page_metadata, paginate_with_total, split_page
+from crud_backend.query_budget import query_budget
+from crud_backend.search import substring_match
+from crud_backend.serialization import from_row, json_response, load_fields, trusted
+from crud_backend.schemas.schemas import (
+    BULK_MAX_ITEMS,
+    BulkAffected,
+    ExportFormat,
+    ImportReport,
+    Message,
+)
 from crud_backend.schemas.tasks import (
+    TaskBulkResult,
+    TaskBulkUpdate,
+    TaskExportFilter,
+    TaskFields,
+    TaskPredicate,
+    TaskSelection,
     TaskSchema,
     TaskUpdate,
     TaskPublic,
     TaskList,
     FilterTasks,
 )
-from crud_backend.database import get_session
-
+from crud_backend.database import (
+    get_session,
+    get_session_factory,
+    read_replica,
+)
+from crud_backend.entity_cache import EntityCache, get_entity_cache
+from crud_backend.export import export_response, stream_rows
+from crud_backend.http_cache import (
+    entity_etag,
+    etag_matches,
+    list_etag,
+    not_modified,
+    set_validators,
+)
+from crud_backend.importer import import_file, text_stream
+from crud_backend.list_cache import ListCache, get_list_cache, project_tasks
 
 router = APIRouter()
 
 
+def _project_not_found() -> HTTPException:
+    return HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Project not found")
+
+
+def _task_not_found() -> HTTPException:
+    return HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Task not found")
+
+
+def _target_project_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=HTTPStatus.NOT_FOUND, detail="Target project not found"
+    )
+
+
+async def _missing_task_error(session: AsyncSession, project_id: int) -> HTTPException:
+    """Diferencia projeto inexistente de tarefa inexistente após um miss."""
+    project_exists = await session.scalar(
+        select(exists().where(Project.id == project_id))
+    )
+    return _task_not_found() if project_exists else _project_not_found()
+
+
+async def _stale_project_error(
+    session: AsyncSession, cache: EntityCache, project_id: int
+) -> HTTPException:
+    """Trata a FK violada quando o cache confirmou um projeto já removido."""
+    await session.rollback()
+    await cache.invalidate_project(project_id)
+    return _project_not_found()
+
+
+def _task_conditions(
+    predicate: TaskPredicate, dialect: str, entity: type[Any] = Task
+) -> list[ColumnElement[bool]]:
+    """Converte os filtros de tarefa em condições SQL sobre `entity`."""
+    conditions = []
+    case_insensitive = predicate.case_insensitive
+
+    if predicate.title:
+        conditions.append(
+            substring_match(entity.title, predicate.title, case_insensitive, dialect)
+        )
+
+    if predicate.description:
+        conditions.append(
+            substring_match(
+                entity.description, predicate.description, case_insensitive, dialect
+            )
+        )
+
+    if predicate.status:
+        conditions.append(entity.status == predicate.status)
+        if predicate.status != TaskStatus.deleted:
+            # Redundante, mas permite usar o índice parcial sem as linhas `deleted`
+            conditions.append(entity.status != TaskStatus.deleted)
+
+    if predicate.assigned_to:
+        conditions.append(
+            substring_match(
+                entity.assigned_to, predicate.assigned_to, case_insensitive, dialect
+            )
+        )
+
+    return conditions
+
+
+def _selection_conditions(
+    project_id: int, selection: TaskSelection, dialect: str
+) -> list[ColumnElement[bool]]:
+    conditions = [Task.project_id == project_id]
+
+    if selection.ids is not None:
+        conditions.append(Task.id.in_(selection.ids))
+
+    return conditions + _task_conditions(selection, dialect)
+
+
 @router.post("/", status_code=HTTPStatus.CREATED, response_model=TaskPublic)
-def create_task(
-    project_id: int, task: TaskSchema, session: Session = Depends(get_session)
-) -> TaskPublic:
+@query_budget(2)
+async def create_task(
+    project_id: int,
+    task: TaskSchema,
+    session: AsyncSession = Depends(get_session),
+    cache: EntityCache = Depends(get_entity_cache),
+    list_cache: ListCache = Depends(get_list_cache),
+) -> Response:
     """Cria uma nova tarefa."""
-    db_project = session.scalar(select(Project).where(Project.id == project_id))
-    if not db_project:
-        raise HTTPException(
-            status_code=HTTPStatus.NOT_FOUND, detail="Project not found"
-        )
+    if not await cache.project_exists(session, project_id):
+        raise _project_not_found()
 
     task_data = task.model_dump()
     task_data["project_id"] = project_id
     db_task = Task(**task_data)
 
     session.add(db_task)
-    session.commit()
-    session.refresh(db_task)
+    try:
+        await session.flush()
+    except IntegrityError:
+        raise await _stale_project_error(session, cache, project_id)
+    task_public = TaskPublic.model_validate(db_task)
+    await session.commit()
+    await list_cache.bump(project_tasks(project_id))
 
-    return TaskPublic.model_validate(db_task)
+    return json_response(task_public, HTTPStatus.CREATED)
 
 
-@router.get("/", response_model=TaskList)
-def list_tasks(
+@router.post("/bulk", status_code=HTTPStatus.CREATED, response_model=TaskBulkResult)
+@query_budget(2)
+async def create_tasks_bulk(
     project_id: int,
-    task_filter: Annotated[FilterTasks, Query()],
-    session: Session = Depends(get_session),
-) -> TaskList:
-    """Recupera uma lista de tarefas com paginação."""
-    db_project = session.scalar(select(Project).where(Project.id == project_id))
-    if not db_project:
+    tasks: Annotated[list[TaskSchema], Body(max_length=BULK_MAX_ITEMS)],
+    session: AsyncSession = Depends(get_session),
+    cache: EntityCache = Depends(get_entity_cache),
+    list_cache: ListCache = Depends(get_list_cache),
+) -> TaskBulkResult | Response:
+    """Cria várias tarefas do projeto em uma única inserção."""
+    if not await cache.project_exists(session, project_id):
+        raise _project_not_found()
+
+    if not tasks:
+        return TaskBulkResult(created=[])
+
+    try:
+        db_tasks = await session.scalars(
+            insert(Task).returning(Task),
+            [{**task.model_dump(), "project_id": project_id} for task in tasks],
+        )
+    except IntegrityError:
+        raise await _stale_project_error(session, cache, project_id)
+    # A inserção multi-linha gera IDs crescentes na ordem enviada
+    created = [
+        trusted(TaskPublic, task) for task in sorted(db_tasks, key=lambda task: task.id)
+    ]
+    await session.commit()
+    await list_cache.bump(project_tasks(project_id))
+
+    return json_response(TaskBulkResult(created=created), HTTPStatus.CREATED)
+
+
+@router.post("/import", status_code=HTTPStatus.CREATED, response_model=ImportReport)
+# Sem query_budget: além da consulta do projeto, cada lote de IMPORT_CHUNK_SIZE
+# linhas é um INSERT/COPY, então o total cresce com o arquivo
+async def import_tasks(
+    project_id: int,
+    file: UploadFile,
+    format: ExportFormat = ExportFormat.ndjson,
+    session: AsyncSession = Depends(get_session),
+    cache: EntityCache = Depends(get_entity_cache),
+    list_cache: ListCache = Depends(get_list_cache),
+) -> ImportReport:
+    """Importa tarefas de um arquivo CSV/NDJSON em lotes."""
+    if not await cache.project_exists(session, project_id):
+        raise _project_not_found()
+
+    try:
+        report = await import_file(
+            session,
+            text_stream(file.file),
+            format,
+            TaskSchema,
+            table_of(Task),
+            {"project_id": project_id},
+        )
+    except IntegrityError:
+        raise await _stale_project_error(session, cache, project_id)
+    # Os lotes já gravados valem mesmo quando há linhas rejeitadas
+    await list_cache.bump(project_tasks(project_id))
+
+    return report
+
+
+@router.patch("/bulk", response_model=BulkAffected)
+@query_budget(2)
+async def update_tasks_bulk(
+    project_id: int,
+    bulk_update: TaskBulkUpdate,
+    session: AsyncSession = Depends(get_session),
+    cache: EntityCache = Depends(get_entity_cache),
+    list_cache: ListCache = Depends(get_list_cache),
+) -> BulkAffected:
+    """Atualiza de uma vez as tarefas selecionadas por IDs ou filtros."""
+    target_id = bulk_update.project_id or project_id
+    existing = await cache.project_client_ids(session, project_id, target_id)
+    if project_id not in existing:
+        raise _project_not_found()
+    if target_id not in existing:
+        raise _target_project_not_found()
+
+    values = bulk_update.values.model_dump(exclude_unset=True)
+    if bulk_update.project_id is not None:
+        values["project_id"] = bulk_update.project_id
+
+    conditions = _selection_conditions(
+        project_id, bulk_update.where, session.get_bind().dialect.name
+    )
+    try:
+        result = cast(
+            CursorResult[Any],
+            await session.execute(
+                update(Task)
+                .where(*conditions)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            ),
+        )
+    except IntegrityError:
+        await session.rollback()
+        # Só a FK de project_id vira 404: o cache confirmou um projeto de destino
+        # já removido
+        if bulk_update.project_id is not None and not await session.scalar(
+            select(exists().where(Project.id == target_id))
+        ):
+            await cache.invalidate_project(target_id)
+            raise _target_project_not_found()
         raise HTTPException(
-            status_code=HTTPStatus.NOT_FOUND, detail="Project not found"
+            status_code=HTTPStatus.CONFLICT, detail="Tasks could not be updated"
         )
+    await session.commit()
+    await list_cache.bump(project_tasks(project_id), project_tasks(target_id))
+
+    return BulkAffected(affected=result.rowcount)
 
-    query = session.query(Task).filter(Task.project_id == project_id)
 
-    if task_filter.title:
-        query = query.filter(Task.title.contains(task_filter.title))
+@router.delete("/bulk", response_model=BulkAffected)
+@query_budget(2)
+async def delete_tasks_bulk(
+    project_id: int,
+    selection: TaskSelection,
+    session: AsyncSession = Depends(get_session),
+    cache: EntityCache = Depends(get_entity_cache),
+    list_cache: ListCache = Depends(get_list_cache),
+) -> BulkAffected:
+    """Remove de uma vez as tarefas selecionadas por IDs ou filtros."""
+    conditions = _selection_conditions(
+        project_id, selection, session.get_bind().dialect.name
+    )
+    result = cast(
+        CursorResult[Any],
+        await session.execute(
+            delete(Task).where(*conditions).execution_options(synchronize_session=False)
+        ),
+    )
 
-    if task_filter.description:
-        query = query.filter(Task.description.contains(task_filter.description))
+    if not result.rowcount:
+        if not await cache.project_exists(session, project_id):
+            raise _project_not_found()
 
-    if task_filter.status:
-        query = query.filter(Task.status == task_filter.status)
+    await session.commit()
+    await list_cache.bump(project_tasks(project_id))
 
-    if task_filter.assigned_to:
-        query = query.filter(Task.assigned_to.contains(task_filter.assigned_to))
+    return BulkAffected(affected=result.rowcount)
 
-    tasks = session.scalars(
-        query.offset(task_filter.offset).limit(task_filter.limit)
+
+async def _task_page(
+    session: AsyncSession,
+    request: Request,
+    project_id: int,
+    task_filter: FilterTasks,
+    conditional: bool,
+) -> Response:
+    """Executa a listagem, devolvendo a página serializada ou um 304."""
+    dialect = session.get_bind().dialect.name
+    source, query = select_rows(
+        Task,
+        lambda entity: [
+            entity.project_id == project_id,
+            *_task_conditions(task_filter, dialect, entity),
+        ],
+        task_filter.include_archived,
+    )
+    project_exists = exists().where(Project.id == project_id)
+
+    metadata = None
+    revalidating = conditional and "if-none-match" in request.headers
+    if revalidating and task_filter.include_total:
+        # A revalidação usa só a agregação, sem ler a página
+        metadata = (
+            await session.execute(
+                page_metadata(query, source.updated_at, task_filter, project_exists)
+            )
+        ).one()
+        total, last_modified, found = metadata
+        if not found:
+            raise _project_not_found()
+
+        etag = list_etag(request, total, last_modified)
+        if etag_matches(request, etag):
+            return not_modified(etag, last_modified)
+
+    # Cada linha carrega o total, a última alteração e a existência do projeto;
+    # só páginas vazias consultam de novo
+    rows = (
+        await session.execute(
+            paginate_with_total(
+                query, source.id, source.updated_at, task_filter, project_exists
+            ).options(*load_fields(source, task_filter.selected))
+        )
     ).all()
+    if rows:
+        _, total, last_modified, found = rows[0]
+    elif metadata is None:
+        total, last_modified, found = (
+            await session.execute(
+                page_metadata(query, source.updated_at, task_filter, project_exists)
+            )
+        ).one()
+    if not found:
+        raise _project_not_found()
+
+    tasks, next_cursor = split_page([row[0] for row in rows], task_filter)
+
+    task_public_list = [
+        from_row(TaskPublic, task, task_filter.selected) for task in tasks
+    ]
+
+    response = json_response(
+        TaskList(tasks=task_public_list, total=total, next_cursor=next_cursor)
+    )
+    if task_filter.include_total:
+        set_validators(
+            response, list_etag(request, total, last_modified), last_modified
+        )
 
-    task_public_list = [TaskPublic.model_validate(task) for task in tasks]
+    return response
 
-    return TaskList(tasks=task_public_list)
+
+@router.get("/", response_model=TaskList)
+@query_budget(2)
+async def list_tasks(
+    project_id: int,
+    task_filter: Annotated[FilterTasks, Query()],
+    request: Request,
+    background_tasks: BackgroundTasks,
+    session_factory: Callable[[], AsyncContextManager[AsyncSession]] = Depends(
+        get_session_factory
+    ),
+    list_cache: ListCache = Depends(get_list_cache),
+) -> Response:
+    """Recupera uma lista de tarefas com paginação."""
+    return await list_cache.serve(
+        "list_tasks",
+        [project_tasks(project_id)],
+        task_filter,
+        request,
+        background_tasks,
+        session_factory,
+        lambda session, conditional: _task_page(
+            session, request, project_id, task_filter, conditional
+        ),
+        from_replica=read_replica(request) is not None,
+    )
+
+
+@router.get("/export", response_class=StreamingResponse)
+@query_budget(2)
+async def export_tasks(
+    project_id: int,
+    task_filter: Annotated[TaskExportFilter, Query()],
+    session: AsyncSession = Depends(get_session),
+    session_factory: Callable[[], AsyncContextManager[AsyncSession]] = Depends(
+        get_session_factory
+    ),
+    cache: EntityCache = Depends(get_entity_cache),
+) -> StreamingResponse:
+    """Exporta as tarefas do projeto em NDJSON ou CSV, sem paginação."""
+    if not await cache.project_exists(session, project_id):
+        raise _project_not_found()
+
+    dialect = session.get_bind().dialect.name
+    source, query = select_rows(
+        Task,
+        lambda entity: [
+            entity.project_id == project_id,
+            *_task_conditions(task_filter, dialect, entity),
+        ],
+        task_filter.include_archived,
+    )
+
+    return export_response(
+        stream_rows(
+            session_factory, query.order_by(source.id), TaskPublic, task_filter.format
+        ),
+        task_filter.format,
+        f"project-{project_id}-tasks",
+    )
 
 
 @router.get("/{task_id}", response_model=TaskPublic)
-def read_task(
-    project_id: int, task_id: int, session: Session = Depends(get_session)
-) -> TaskPublic:
+@query_budget(1)
+async def read_task(
+    project_id: int,
+    task_id: int,
+    request: Request,
+    fieldset: Annotated[TaskFields, Query()],
+    session: AsyncSession = Depends(get_session),
+) -> Response:
     """Recupera uma tarefa específica pelo ID."""
-    db_project = session.scalar(select(Project).where(Project.id == project_id))
-    if not db_project:
-        raise HTTPException(
-            status_code=HTTPStatus.NOT_FOUND, detail="Project not found"
+    row = (
+        await session.execute(
+            select(Project.id, Task)
+            .outerjoin(Task, (Task.project_id == Project.id) & (Task.id == task_id))
+            .where(Project.id == project_id)
+            .options(*load_fields(Task, fieldset.selected, "updated_at"))
         )
+    ).first()
 
-    db_task = session.scalar(
-        select(Task).where(Task.id == task_id, Task.project_id == project_id)
-    )
-    if not db_task:
-        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Task not found")
+    if row is None:
+        raise _project_not_found()
+
+    _, db_task = row
+    if db_task is None:
+        raise _task_not_found()
+
+    etag = entity_etag("task", db_task.id, db_task.updated_at, fieldset.fields)
+    if etag_matches(request, etag):
+        return not_modified(etag, db_task.updated_at)
 
-    return TaskPublic.model_validate(db_task)
+    response = json_response(from_row(TaskPublic, db_task, fieldset.selected))
+    set_validators(response, etag, db_task.updated_at)
+
+    return response
 
 
 @router.patch("/{task_id}", response_model=TaskPublic)
-def patch_task(
+@query_budget(2)
+async def patch_task(
     project_id: int,
     task_id: int,
     task: TaskUpdate,
-    session: Session = Depends(get_session),
-) -> TaskPublic:
+    session: AsyncSession = Depends(get_session),
+    list_cache: ListCache = Depends(get_list_cache),
+) -> Response:
     """Atualiza uma tarefa existente."""
-    db_project = session.scalar(select(Project).where(Project.id == project_id))
-    if not db_project:
-        raise HTTPException(
-            status_code=HTTPStatus.NOT_FOUND, detail="Project not found"
+    values = task.model_dump(exclude_unset=True)
+    where = (Task.project_id == project_id, Task.id == task_id)
+
+    if values:
+        db_task = await session.scalar(
+            update(Task)
+            .where(*where)
+            .values(**values)
+            .returning(Task)
+            .execution_options(populate_existing=True)
         )
+    else:
+        db_task = await session.scalar(select(Task).where(*where))
 
-    db_task = session.scalar(
-        select(Task).where(Task.project_id == project_id, Task.id == task_id)
-    )
     if not db_task:
-        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Task not found")
-
-    for key, value in task.model_dump(exclude_unset=True).items():
-        setattr(db_task, key, value)
+        raise await _missing_task_error(session, project_id)
 
-    session.add(db_task)
-    session.commit()
-    session.refresh(db_task)
+    task_public = TaskPublic.model_validate(db_task)
+    await session.commit()
+    await list_cache.bump(project_tasks(project_id))
 
-    return TaskPublic.model_validate(db_task)
+    return json_response(task_public)
 
 
 @router.delete("/{task_id}", response_model=Message)
-def delete_task(
-    project_id: int, task_id: int, session: Session = Depends(get_session)
+@query_budget(2)
+async def delete_task(
+    project_id: int,
+    task_id: int,
+    session: AsyncSession = Depends(get_session),
+    list_cache: ListCache = Depends(get_list_cache),
 ) -> Message:
     """Remove uma tarefa pelo ID."""
-    db_project = session.scalar(select(Project).where(Project.id == project_id))
-    if not db_project:
-        raise HTTPException(
-            status_code=HTTPStatus.NOT_FOUND, detail="Project not found"
-        )
-
-    db_task = session.scalar(
-        select(Task).where(Task.project_id == project_id, Task.id == task_id)
+    result = cast(
+        CursorResult[Any],
+        await session.execute(
+            delete(Task).where(Task.project_id == project_id, Task.id == task_id)
+        ),
     )
-    if not db_task:
-        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Task not found")
 
-    session.delete(db_task)
-    session.commit()
+    if not result.rowcount:
+        raise await _missing_task_error(session, project_id)
+
+    await session.commit()
+    await list_cache.bump(project_tasks(project_id))
 
     return Message(message="Task deleted successfully")
@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+
+class SlowQueryPublic(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    captured_at: datetime
+    duration: float
+    method: str | None
+    route: str | None
+    sql: str
+    parameters: str
+    plan: str | None
+
+
+class SlowQueryList(BaseModel):
+    queries: list[SlowQueryPublic]
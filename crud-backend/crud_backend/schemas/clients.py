@@ -1,5 +1,13 @@
+from typing import Generic, TypeVar
+
 from pydantic import BaseModel, ConfigDict, EmailStr
 
+from crud_backend.models.projects import ProjectStatus
+from crud_backend.models.tasks import TaskStatus
+from crud_backend.schemas.projects import ProjectExpanded, ProjectPublic
+from crud_backend.schemas.schemas import BulkError, Expandable, Fieldset, FilterPage
+from crud_backend.schemas.tasks import TaskPublic
+
 
 class ClientSchema(BaseModel):
     company: str
@@ -18,5 +26,47 @@ class ClientPublic(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
-class ClientList(BaseModel):
-    clients: list[ClientPublic]
+class ClientExpanded(ClientPublic):
+    projects: list[ProjectExpanded] | None = None
+
+
+class ClientView(Fieldset, Expandable):
+    fieldset_schema = ClientPublic
+    expandable = ("projects", "projects.tasks")
+
+
+class FilterClients(FilterPage, ClientView):
+    pass
+
+
+ClientItem = TypeVar("ClientItem", bound=ClientPublic)
+
+
+class ClientPage(BaseModel, Generic[ClientItem]):
+    clients: list[ClientItem]
+    next_cursor: str | None = None
+
+
+class ClientList(ClientPage[ClientPublic]):
+    pass
+
+
+class ClientExpandedList(ClientPage[ClientExpanded]):
+    pass
+
+
+class ClientBulkResult(BaseModel):
+    created: list[ClientPublic]
+    errors: list[BulkError]
+
+
+class RecentTask(TaskPublic):
+    project_id: int
+
+
+class ClientSummary(BaseModel):
+    client: ClientPublic
+    projects: dict[ProjectStatus, int]
+    tasks: dict[TaskStatus, int]
+    recent_projects: list[ProjectPublic]
+    recent_tasks: list[RecentTask]
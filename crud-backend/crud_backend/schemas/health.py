@@ -0,0 +1,41 @@
+from pydantic import BaseModel
+
+
+class PoolStatus(BaseModel):
+    size: int | None
+    checked_out: int | None
+    idle: int | None
+    overflow: int | None
+    checkouts: int
+    checkout_wait_seconds: float
+
+
+class ReplicaStatus(BaseModel):
+    name: str
+    healthy: bool
+    pool: PoolStatus
+
+
+class CacheStats(BaseModel):
+    hits: int
+    misses: int
+    hit_ratio: float
+
+
+class EndpointCacheStats(CacheStats):
+    stale_hits: int
+
+
+class ListCacheStats(BaseModel):
+    entries: int
+    bytes: int
+    endpoints: dict[str, EndpointCacheStats]
+
+
+class ReadinessStatus(BaseModel):
+    status: str
+    threadpool_limit: int
+    pool: PoolStatus
+    replicas: list[ReplicaStatus]
+    entity_cache: CacheStats
+    list_cache: ListCacheStats
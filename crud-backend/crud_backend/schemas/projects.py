@@ -1,8 +1,17 @@
 from datetime import datetime
+from typing import Generic, TypeVar
+
 from pydantic import BaseModel
 
 from crud_backend.models.projects import ProjectStatus
-from crud_backend.schemas.schemas import FilterPage
+from crud_backend.schemas.schemas import (
+    ArchiveFilter,
+    CountedPage,
+    Expandable,
+    ExportFilter,
+    Fieldset,
+)
+from crud_backend.schemas.tasks import TaskPublic
 
 
 class ProjectSchema(BaseModel):
@@ -20,15 +29,61 @@ class ProjectPublic(ProjectSchema):
         from_attributes = True
 
 
-class ProjectList(BaseModel):
-    projects: list[ProjectPublic]
+class ProjectExpanded(ProjectPublic):
+    tasks: list[TaskPublic] | None = None
+
+
+class ProjectView(Fieldset, Expandable):
+    fieldset_schema = ProjectPublic
+    expandable = ("tasks",)
+
+
+ProjectItem = TypeVar("ProjectItem", bound=ProjectPublic)
+
+
+class ProjectPage(BaseModel, Generic[ProjectItem]):
+    projects: list[ProjectItem]
     total: int | None
+    next_cursor: str | None = None
+
+
+class ProjectList(ProjectPage[ProjectPublic]):
+    pass
+
 
+class ProjectExpandedList(ProjectPage[ProjectExpanded]):
+    pass
 
-class FilterProject(FilterPage):
+
+class ProjectBulkResult(BaseModel):
+    """Itens criados, na ordem enviada; um item inválido rejeita o lote inteiro."""
+
+    created: list[ProjectPublic]
+
+
+class ProjectTaskStatsPublic(BaseModel):
+    project_id: int
+    pending: int = 0
+    doing: int = 0
+    completed: int = 0
+    paused: int = 0
+    deleted: int = 0
+    total: int = 0
+
+
+class ProjectPredicate(BaseModel):
     title: str | None = None
     description: str | None = None
     status: ProjectStatus | None = None
+    case_insensitive: bool = False
+
+
+class FilterProject(CountedPage, ProjectPredicate, ArchiveFilter, ProjectView):
+    pass
+
+
+class ProjectExportFilter(ExportFilter, ProjectPredicate, ArchiveFilter):
+    pass
 
 
 class ProjectUpdate(BaseModel):
@@ -1,10 +1,127 @@
-from pydantic import BaseModel
+from enum import Enum
+from typing import ClassVar
+
+from pydantic import BaseModel, Field, field_validator
+
+from crud_backend.pagination import decode_cursor
+
+BULK_MAX_ITEMS = 1000
+
+# Máximo de filhos embutidos por registro em cada nível de `expand`
+EXPAND_LIMIT = 20
+EXPAND_MAX_LIMIT = 100
 
 
 class Message(BaseModel):
     message: str
 
 
+class BulkError(BaseModel):
+    index: int
+    detail: str
+
+
+class BulkAffected(BaseModel):
+    affected: int
+
+
+class ImportReport(BaseModel):
+    imported: int
+    rejected: int
+    seconds: float
+    rows_per_second: float
+    errors: list[BulkError]
+
+
+class ExportFormat(str, Enum):
+    """Representa o formato do arquivo exportado."""
+
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class ExportFilter(BaseModel):
+    format: ExportFormat = ExportFormat.ndjson
+
+
+class ArchiveFilter(BaseModel):
+    include_archived: bool = False
+
+
 class FilterPage(BaseModel):
     offset: int = 0
     limit: int = 100
+    cursor: str | None = None
+
+    @field_validator("cursor")
+    @classmethod
+    def validate_cursor(cls, cursor: str | None) -> str | None:
+        if cursor is not None:
+            decode_cursor(cursor)
+        return cursor
+
+
+class CountedPage(FilterPage):
+    include_total: bool = True
+
+
+class Fieldset(BaseModel):
+    """Restringe a resposta aos campos pedidos em `fields=id,title`."""
+
+    fields: str | None = None
+
+    # Schema de saída contra o qual os campos pedidos são validados
+    fieldset_schema: ClassVar[type[BaseModel]]
+
+    @field_validator("fields")
+    @classmethod
+    def validate_fields(cls, fields: str | None) -> str | None:
+        if fields is None:
+            return None
+
+        names = {name.strip() for name in fields.split(",")} - {""}
+        unknown = names - set(cls.fieldset_schema.model_fields)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        if not names:
+            raise ValueError("Provide at least one field")
+
+        # Na ordem do schema, para que pedidos equivalentes compartilhem o cache
+        return ",".join(
+            name for name in cls.fieldset_schema.model_fields if name in names
+        )
+
+    @property
+    def selected(self) -> tuple[str, ...] | None:
+        return tuple(self.fields.split(",")) if self.fields else None
+
+
+class Expandable(BaseModel):
+    """Embute coleções relacionadas na resposta (`expand=projects,projects.tasks`)."""
+
+    expand: str | None = None
+    expand_limit: int = Field(default=EXPAND_LIMIT, ge=1, le=EXPAND_MAX_LIMIT)
+
+    # Caminhos aceitos, do nível mais raso ao mais profundo
+    expandable: ClassVar[tuple[str, ...]]
+
+    @field_validator("expand")
+    @classmethod
+    def validate_expand(cls, expand: str | None) -> str | None:
+        if expand is None:
+            return None
+
+        names = {name.strip() for name in expand.split(",")} - {""}
+        unknown = names - set(cls.expandable)
+        if unknown:
+            raise ValueError(f"Unknown expansions: {', '.join(sorted(unknown))}")
+        if not names:
+            raise ValueError("Provide at least one expansion")
+
+        # `projects.tasks` também embute `projects`
+        names |= {name.rpartition(".")[0] for name in names} - {""}
+        return ",".join(name for name in cls.expandable if name in names)
+
+    @property
+    def expansions(self) -> frozenset[str]:
+        return frozenset(self.expand.split(",")) if self.expand else frozenset()
@@ -1,8 +1,14 @@
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 
 from crud_backend.models.tasks import TaskStatus
-from crud_backend.schemas.schemas import FilterPage
+from crud_backend.schemas.schemas import (
+    BULK_MAX_ITEMS,
+    ArchiveFilter,
+    CountedPage,
+    ExportFilter,
+    Fieldset,
+)
 
 
 class TaskSchema(BaseModel):
@@ -21,15 +27,36 @@ class TaskPublic(TaskSchema):
         from_attributes = True
 
 
+class TaskFields(Fieldset):
+    fieldset_schema = TaskPublic
+
+
 class TaskList(BaseModel):
     tasks: list[TaskPublic]
+    total: int | None = None
+    next_cursor: str | None = None
+
+
+class TaskBulkResult(BaseModel):
+    """Itens criados, na ordem enviada; um item inválido rejeita o lote inteiro."""
 
+    created: list[TaskPublic]
 
-class FilterTasks(FilterPage):
+
+class TaskPredicate(BaseModel):
     title: str | None = None
     description: str | None = None
     status: TaskStatus | None = None
     assigned_to: str | None = None
+    case_insensitive: bool = False
+
+
+class FilterTasks(CountedPage, TaskPredicate, ArchiveFilter, TaskFields):
+    pass
+
+
+class TaskExportFilter(ExportFilter, TaskPredicate, ArchiveFilter):
+    pass
 
 
 class TaskUpdate(BaseModel):
@@ -37,3 +64,37 @@ class TaskUpdate(BaseModel):
     description: str | None = None
     status: TaskStatus | None = None
     assigned_to: str | None = None
+
+
+class TaskSelection(TaskPredicate):
+    ids: list[int] | None = Field(default=None, max_length=BULK_MAX_ITEMS)
+
+    @model_validator(mode="after")
+    def require_criteria(self) -> "TaskSelection":
+        if not self.model_dump(exclude={"case_insensitive"}, exclude_none=True):
+            raise ValueError("Provide ids or at least one filter")
+        return self
+
+
+class TaskBulkUpdate(BaseModel):
+    where: TaskSelection
+    values: TaskUpdate = TaskUpdate()
+    project_id: int | None = None
+
+    @model_validator(mode="after")
+    def require_changes(self) -> "TaskBulkUpdate":
+        if self.project_id is None and not self.values.model_dump(exclude_unset=True):
+            raise ValueError("Provide values or a target project_id")
+        return self
+
+    @model_validator(mode="after")
+    def reject_nulls(self) -> "TaskBulkUpdate":
+        # As colunas de `values` são NOT NULL; o banco recusaria o lote inteiro
+        nulls = [
+            field
+            for field, value in self.values.model_dump(exclude_unset=True).items()
+            if value is None
+        ]
+        if nulls:
+            raise ValueError(f"{', '.join(nulls)} cannot be null")
+        return self
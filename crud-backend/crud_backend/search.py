@@ -0,0 +1,100 @@
+from typing import Any, cast
+
+from sqlalchemy import (
+    Column,
+    Connection,
+    Integer,
+    MetaData,
+    Table,
+    Text,
+    event,
+    func,
+    select,
+)
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql.elements import ColumnElement
+
+# Tabelas FTS5 ficam fora do table_registry para não entrarem no create_all
+fts_metadata = MetaData()
+
+
+def fts_table_name(table_name: str) -> str:
+    return f"{table_name}_fts"
+
+
+def _fts_ddl(table_name: str, columns: tuple[str, ...]) -> list[str]:
+    fts = fts_table_name(table_name)
+    names = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{names}, content='{table_name}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table_name} BEGIN "
+        f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table_name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {names}) "
+        f"VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table_name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {names}) "
+        f"VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values}); END",
+    ]
+
+
+def register_substring_search(table: Table, *columns: str) -> None:
+    """Cria a tabela FTS5 (trigram) espelhando as colunas no SQLite.
+
+    No Postgres a busca usa os índices GIN `gin_trgm_ops` declarados no modelo.
+    """
+    Table(
+        fts_table_name(table.name),
+        fts_metadata,
+        Column("rowid", Integer, primary_key=True),
+        *(Column(column, Text) for column in columns),
+    )
+
+    def create_fts(target: Table, connection: Connection, **kw: Any) -> None:
+        if connection.dialect.name == "sqlite":
+            for statement in _fts_ddl(target.name, columns):
+                connection.exec_driver_sql(statement)
+
+    def drop_fts(target: Table, connection: Connection, **kw: Any) -> None:
+        if connection.dialect.name == "sqlite":
+            connection.exec_driver_sql(
+                f"DROP TABLE IF EXISTS {fts_table_name(target.name)}"
+            )
+
+    event.listen(table, "after_create", create_fts)
+    event.listen(table, "before_drop", drop_fts)
+
+
+def substring_match(
+    column: InstrumentedAttribute[Any],
+    value: str,
+    case_insensitive: bool,
+    dialect_name: str,
+) -> ColumnElement[bool]:
+    """Monta o filtro de substring que aproveita o índice de cada banco.
+
+    Tabelas sem espelho FTS5 no SQLite, como as de arquivo, usam LIKE.
+    """
+    pattern = f"%{value}%"
+    table = cast(Table, column.parent.local_table)
+    fts = fts_metadata.tables.get(fts_table_name(table.name))
+
+    if dialect_name != "sqlite":
+        return column.ilike(pattern) if case_insensitive else column.like(pattern)
+
+    if fts is None:
+        match = column.like(pattern)
+    else:
+        candidates = select(fts.c.rowid).where(fts.c[column.key].like(pattern))
+        match = table.c.id.in_(candidates)
+
+    # O LIKE do SQLite e o trigram do FTS5 não diferenciam maiúsculas; o instr
+    # refina o resultado
+    if case_insensitive:
+        return match
+    return match & (func.instr(column, value) > 0)
@@ -0,0 +1,63 @@
+from http import HTTPStatus
+from time import perf_counter
+from typing import TypeVar
+
+from fastapi import Response
+from pydantic import BaseModel
+from sqlalchemy.orm import load_only
+from sqlalchemy.orm.interfaces import ORMOption
+
+from crud_backend.metrics import record_serialization
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def trusted(schema: type[M], row: object, fields: tuple[str, ...] | None = None) -> M:
+    """Monta o schema a partir de uma linha do banco sem revalidar os campos.
+
+    Para schemas só com tipos simples o `model_validate` (em Rust) é mais rápido;
+    este atalho compensa quando há validadores em Python, como o `EmailStr`, ou
+    quando só parte dos campos foi carregada: os demais ficam fora da saída.
+    """
+    return schema.model_construct(
+        **{name: getattr(row, name) for name in fields or schema.model_fields}
+    )
+
+
+def from_row(schema: type[M], row: object, fields: tuple[str, ...] | None = None) -> M:
+    """Valida a linha inteira ou, com `fields`, monta só os campos carregados."""
+    if fields is None:
+        return schema.model_validate(row)
+    return trusted(schema, row, fields)
+
+
+def load_fields(
+    entity: type[object], fields: tuple[str, ...] | None, *required: str
+) -> list[ORMOption]:
+    """Carrega só as colunas pedidas, além das que a rota usa (ETag, cursor)."""
+    if fields is None:
+        return []
+    return [
+        load_only(
+            *(getattr(entity, name) for name in dict.fromkeys((*fields, *required)))
+        )
+    ]
+
+
+def json_response(
+    model: BaseModel, status_code: int = HTTPStatus.OK, exclude_unset: bool = False
+) -> Response:
+    """Serializa o modelo uma única vez, sem a revalidação do `response_model`.
+
+    O `response_model` declarado na rota continua definindo o schema do OpenAPI;
+    `exclude_unset` omite as expansões que não foram pedidas.
+    """
+    start = perf_counter()
+    content = model.model_dump_json(exclude_unset=exclude_unset)
+    record_serialization(perf_counter() - start)
+
+    return Response(
+        content=content,
+        status_code=status_code,
+        media_type="application/json",
+    )
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -7,3 +9,65 @@ class Settings(BaseSettings):
     )
 
     DATABASE_URL: str
+    DATABASE_ASYNC: bool = False
+
+    DATABASE_POOL_SIZE: int = 20
+    DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_TIMEOUT: float = 30.0
+    DATABASE_POOL_RECYCLE: int = 1800
+    DATABASE_POOL_PRE_PING: bool = True
+
+    # Réplicas de leitura: os GETs são distribuídos entre as saudáveis; escritas e
+    # leituras logo após uma escrita do mesmo cliente ficam no primário
+    DATABASE_REPLICA_URLS: list[str] = []
+    DATABASE_REPLICA_CHECK_INTERVAL: float = 5.0
+    DATABASE_REPLICA_CHECK_TIMEOUT: float = 2.0
+    READ_YOUR_WRITES_WINDOW: float = 5.0
+
+    # Limite do threadpool do AnyIO; por padrão o total de conexões do pool mais uma
+    # folga para fechar sessões e atender o que não usa o banco
+    THREADPOOL_LIMIT: int | None = None
+
+    # Comandos SQL mais lentos que o limite (em segundos; None desliga) vão para o log
+    # e para GET /admin/slow-queries; a fração EXPLAIN_RATE das consultas lentas leva
+    # junto o EXPLAIN (ANALYZE, BUFFERS)
+    SLOW_QUERY_THRESHOLD: float | None = 0.5
+    SLOW_QUERY_EXPLAIN_RATE: float = 0.0
+    SLOW_QUERY_BUFFER_SIZE: int = 100
+
+    # Token exigido no header X-Admin-Token das rotas /admin; sem ele elas ficam
+    # desligadas
+    ADMIN_TOKEN: str | None = None
+
+    # Cache da existência de clientes e projetos usado nas rotas filhas
+    ENTITY_CACHE_TTL: float = 30.0
+    ENTITY_CACHE_MAX_ENTRIES: int = 10_000
+
+    # Cache das listagens; respostas vencidas há menos de STALE_TTL são revalidadas
+    # em segundo plano. As gerações ficam no MemoryBackend de cada processo: com
+    # vários workers, a escrita feita num deles não invalida os outros, que podem
+    # servir a lista antiga por até TTL + STALE_TTL. Nesse caso use um
+    # CacheBackend compartilhado ou zere os dois prazos
+    LIST_CACHE_TTL: float = 5.0
+    LIST_CACHE_STALE_TTL: float = 30.0
+    LIST_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+
+    # Compressão das respostas; corpos menores que o mínimo seguem sem compressão
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 6
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
+    # Arquivamento das linhas `deleted` (python -m crud_backend.archive)
+    ARCHIVE_AFTER_DAYS: int = 30
+    ARCHIVE_BATCH_SIZE: int = 500
+
+    # Particionamento de `tasks` no Postgres: "hash" por project_id ou "range" mensal
+    # por created_at. Vale para o create_all e para a migração que converte a tabela
+    TASKS_PARTITIONING: Literal["none", "hash", "range"] = "none"
+    TASKS_HASH_PARTITIONS: int = 16
+    TASKS_PARTITION_MONTHS_AHEAD: int = 3
+
+
+# Instância única, sem criar engines: modelos e caches leem daqui
+settings = Settings()
@@ -0,0 +1,170 @@
+import logging
+import random
+import re
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from itertools import groupby
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import Engine, event
+
+from crud_backend.metrics import current_request, route_label
+
+logger = logging.getLogger(__name__)
+
+# O ANALYZE executa o comando de novo, então só consultas são explicadas; no SQLite,
+# sem ANALYZE, guarda-se o plano escolhido
+EXPLAIN_PREFIXES = {
+    "postgresql": "EXPLAIN (ANALYZE, BUFFERS) ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+}
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDERS = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<![:\w]):\w+|\?")
+_PLACEHOLDER_LISTS = re.compile(r"\?(?:\s*,\s*\?)+")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """Troca literais e parâmetros por `?` e resume listas como as do IN.
+
+    Assim a mesma consulta com valores ou quantidades diferentes gera o mesmo texto.
+    """
+    statement = _LITERALS.sub("?", _PLACEHOLDERS.sub("?", statement))
+    statement = _PLACEHOLDER_LISTS.sub("?, ...", statement)
+    return _SPACES.sub(" ", statement).strip()
+
+
+def _types(values: Any) -> str:
+    names = [type(value).__name__ for value in values]
+    return ", ".join(
+        name if count == 1 else f"{name} x{count}"
+        for name, count in ((name, len(list(group))) for name, group in groupby(names))
+    )
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> str:
+    """Tipos dos parâmetros, sem os valores, como `(int, str x3)`."""
+    if executemany:
+        rows = list(parameters)
+        first = parameter_shape(rows[0]) if rows else "()"
+        return f"{len(rows)} x {first}"
+    if isinstance(parameters, dict):
+        fields = ", ".join(
+            f"{name}: {type(value).__name__}" for name, value in parameters.items()
+        )
+        return f"{{{fields}}}"
+    return f"({_types(parameters or ())})"
+
+
+@dataclass
+class SlowQuery:
+    captured_at: datetime
+    duration: float
+    method: str | None
+    route: str | None
+    sql: str
+    parameters: str
+    plan: str | None = None
+
+
+class SlowQueryLog:
+    """Registra os comandos SQL mais lentos que `threshold` segundos.
+
+    Cada um vai para o log e para um buffer circular com os `size` mais recentes;
+    uma amostra (`explain_rate`) das consultas leva junto o plano de execução.
+    """
+
+    def __init__(self, threshold: float | None, explain_rate: float, size: int) -> None:
+        self.threshold = threshold
+        self.explain_rate = explain_rate
+        self.entries: deque[SlowQuery] = deque(maxlen=size)
+
+    def listen(self, engine: Engine | type[Engine]) -> None:
+        event.listen(engine, "before_cursor_execute", self.before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self.after_cursor_execute)
+
+    def remove(self, engine: Engine | type[Engine]) -> None:
+        event.remove(engine, "before_cursor_execute", self.before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", self.after_cursor_execute)
+
+    def before_cursor_execute(
+        self,
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        if self.threshold is not None:
+            context.slow_query_start = perf_counter()
+
+    def after_cursor_execute(
+        self,
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        start = getattr(context, "slow_query_start", None)
+        if start is None or self.threshold is None:
+            return
+        duration = perf_counter() - start
+        if duration < self.threshold:
+            return
+
+        request = current_request.get()
+        entry = SlowQuery(
+            captured_at=datetime.now(timezone.utc),
+            duration=duration,
+            method=request.scope["method"] if request else None,
+            route=route_label(request.scope) if request else None,
+            sql=normalize_sql(statement),
+            parameters=parameter_shape(parameters, executemany),
+        )
+        logger.warning(
+            "Slow query (%.3fs) on %s %s: %s %s",
+            duration,
+            entry.method or "-",
+            entry.route or "-",
+            entry.sql,
+            entry.parameters,
+        )
+
+        is_query = statement.lstrip()[:6].upper() == "SELECT"
+        if is_query and not executemany and random.random() < self.explain_rate:
+            entry.plan = self._explain(conn, statement, parameters)
+        self.entries.append(entry)
+
+    def _explain(self, conn: Any, statement: str, parameters: Any) -> str | None:
+        """Plano da consulta, executado no mesmo cursor DBAPI e transação."""
+        dialect = conn.dialect.name
+        prefix = EXPLAIN_PREFIXES.get(dialect)
+        if prefix is None:
+            return None
+
+        # O cursor DBAPI não dispara os eventos, então o EXPLAIN não entra nas métricas
+        cursor = conn.connection.cursor()
+        try:
+            # Um erro no EXPLAIN não pode abortar a transação da requisição
+            if dialect == "postgresql":
+                cursor.execute("SAVEPOINT slow_query_explain")
+            try:
+                cursor.execute(prefix + statement, parameters)
+                rows = cursor.fetchall()
+            except Exception:
+                if dialect == "postgresql":
+                    cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+                logger.exception("EXPLAIN failed for slow query")
+                return None
+            if dialect == "postgresql":
+                cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        finally:
+            cursor.close()
+
+        return "\n".join(str(row[-1]) for row in rows)
@@ -0,0 +1,62 @@
+import argparse
+import sys
+from typing import Any, cast
+
+from sqlalchemy import CursorResult, delete, func, insert, select, text
+from sqlalchemy.orm import Session
+
+from crud_backend.models.stats import ProjectTaskStats
+from crud_backend.models.tasks import Task, TaskStatus
+
+
+def rebuild_task_stats(session: Session, project_id: int | None = None) -> int:
+    """Recalcula os contadores a partir das tarefas, corrigindo divergências.
+
+    No Postgres a tabela de tarefas fica bloqueada para escrita durante a
+    reconstrução, para que nenhuma trigger concorrente se perca. Retorna a
+    quantidade de projetos recalculados.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        session.execute(text(f"LOCK TABLE {Task.__tablename__} IN SHARE MODE"))
+
+    counts = select(
+        Task.project_id,
+        *(func.count().filter(Task.status == status) for status in TaskStatus),
+    ).group_by(Task.project_id)
+    stale = delete(ProjectTaskStats)
+
+    if project_id is not None:
+        counts = counts.where(Task.project_id == project_id)
+        stale = stale.where(ProjectTaskStats.project_id == project_id)
+
+    session.execute(stale)
+    result = cast(
+        CursorResult[Any],
+        session.execute(
+            insert(ProjectTaskStats).from_select(
+                ["project_id", *(status.name for status in TaskStatus)], counts
+            )
+        ),
+    )
+    session.commit()
+
+    return result.rowcount
+
+
+def main(argv: list[str] | None = None) -> None:  # pragma: no cover
+    from crud_backend.database import engine
+
+    parser = argparse.ArgumentParser(
+        description="Reconstrói os contadores de tarefas por projeto."
+    )
+    parser.add_argument("--project-id", type=int)
+    args = parser.parse_args(argv)
+
+    with Session(engine) as session:
+        rebuilt = rebuild_task_stats(session, args.project_id)
+
+    sys.stdout.write(f"{rebuilt} project(s) rebuilt\n")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,47 @@
+"""add updated_at indexes
+
+Revision ID: 0b7e4c2d9f13
+Revises: c3f1d2a7b845
+Create Date: 2026-10-18 22:03:17.640125
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b7e4c2d9f13'
+down_revision: Union[str, None] = 'c3f1d2a7b845'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_projects_client_id_updated_at', 'projects', ['client_id', 'updated_at']),
+    ('ix_tasks_project_id_updated_at', 'tasks', ['project_id', 'updated_at']),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY não pode rodar dentro de uma transação
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
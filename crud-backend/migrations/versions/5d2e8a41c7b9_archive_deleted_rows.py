@@ -0,0 +1,115 @@
+"""archive deleted rows
+
+Revision ID: 5d2e8a41c7b9
+Revises: 0b7e4c2d9f13
+Create Date: 2026-10-19 09:41:27.318406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2e8a41c7b9'
+down_revision: Union[str, None] = '0b7e4c2d9f13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STATUSES = ('pending', 'doing', 'completed', 'paused', 'deleted')
+LIVE = sa.text("status <> 'deleted'")
+DELETED = sa.text("status = 'deleted'")
+
+# (nome, tabela, colunas); os índices por status passam a ignorar as linhas `deleted`
+STATUS_INDEXES = [
+    ('ix_projects_client_id_status_id', 'projects', ['client_id', 'status', 'id']),
+    ('ix_tasks_project_id_status_id', 'tasks', ['project_id', 'status', 'id']),
+]
+DELETED_INDEXES = [
+    ('ix_projects_deleted_updated_at', 'projects', ['updated_at']),
+    ('ix_tasks_deleted_updated_at', 'tasks', ['updated_at']),
+]
+
+
+def _status(name: str) -> sa.Enum:
+    # O tipo enum já existe no Postgres, criado junto das tabelas quentes
+    return postgresql.ENUM(*STATUSES, name=name, create_type=False)
+
+
+def _rebuild_status_indexes(where: sa.TextClause | None) -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in STATUS_INDEXES:
+            op.drop_index(
+                name, table_name=table, postgresql_concurrently=True, if_exists=True
+            )
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                sqlite_where=where,
+                postgresql_where=where,
+                postgresql_concurrently=True,
+            )
+
+
+def upgrade() -> None:
+    op.create_table('archived_projects',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description', sa.String(), nullable=False),
+    sa.Column('status', _status('projectstatus'), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('client_id', sa.Integer(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_archived_projects_client_id_id', 'archived_projects', ['client_id', 'id'], unique=False)
+    op.create_table('archived_tasks',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description', sa.String(), nullable=False),
+    sa.Column('assigned_to', sa.String(), nullable=False),
+    sa.Column('status', _status('taskstatus'), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_archived_tasks_project_id_id', 'archived_tasks', ['project_id', 'id'], unique=False)
+
+    # CREATE INDEX CONCURRENTLY não pode rodar dentro de uma transação
+    _rebuild_status_indexes(LIVE)
+    with op.get_context().autocommit_block():
+        for name, table, columns in DELETED_INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                sqlite_where=DELETED,
+                postgresql_where=DELETED,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(DELETED_INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+    _rebuild_status_indexes(None)
+
+    op.drop_index('ix_archived_tasks_project_id_id', table_name='archived_tasks')
+    op.drop_table('archived_tasks')
+    op.drop_index('ix_archived_projects_client_id_id', table_name='archived_projects')
+    op.drop_table('archived_projects')
@@ -0,0 +1,129 @@
+"""partition tasks
+
+Revision ID: 8c4f0b6e2a17
+Revises: 5d2e8a41c7b9
+Create Date: 2026-10-19 14:05:52.907213
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+
+from crud_backend.settings import Settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4f0b6e2a17'
+down_revision: Union[str, None] = '5d2e8a41c7b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Índices de `tasks`; no particionado são criados no pai e propagados às partições
+INDEXES = [
+    'CREATE INDEX ix_tasks_project_id_id ON tasks (project_id, id)',
+    "CREATE INDEX ix_tasks_project_id_status_id ON tasks (project_id, status, id) "
+    "WHERE status <> 'deleted'",
+    'CREATE INDEX ix_tasks_project_id_updated_at ON tasks (project_id, updated_at)',
+    "CREATE INDEX ix_tasks_deleted_updated_at ON tasks (updated_at) "
+    "WHERE status = 'deleted'",
+    *(
+        f'CREATE INDEX ix_tasks_{column}_trgm ON tasks USING gin ({column} gin_trgm_ops)'
+        for column in ('title', 'description', 'assigned_to')
+    ),
+]
+INDEX_NAMES = [statement.split()[2] for statement in INDEXES]
+
+PARTITION_BY = {'hash': 'HASH (project_id)', 'range': 'RANGE (created_at)'}
+PRIMARY_KEYS = {'hash': 'id, project_id', 'range': 'id, created_at'}
+
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _partitions(mode: str) -> list[str]:
+    settings = Settings()
+
+    if mode == 'hash':
+        modulus = settings.TASKS_HASH_PARTITIONS
+        return [
+            f'CREATE TABLE tasks_p{remainder:02d} PARTITION OF tasks '
+            f'FOR VALUES WITH (MODULUS {modulus}, REMAINDER {remainder})'
+            for remainder in range(modulus)
+        ]
+
+    # Do mês da tarefa mais antiga até os meses à frente configurados
+    oldest = op.get_bind().exec_driver_sql('SELECT min(created_at) FROM tasks_heap').scalar()
+    month = (oldest.date() if oldest else date.today()).replace(day=1)
+    last = _add_months(date.today(), settings.TASKS_PARTITION_MONTHS_AHEAD)
+    statements = []
+    while month <= last:
+        following = _add_months(month, 1)
+        statements.append(
+            f"CREATE TABLE tasks_{month:%Y_%m} PARTITION OF tasks "
+            f"FOR VALUES FROM ('{month}') TO ('{following}')"
+        )
+        month = following
+    statements.append('CREATE TABLE tasks_default PARTITION OF tasks DEFAULT')
+    return statements
+
+
+def _rebuild(mode: str) -> None:
+    """Recria `tasks` (particionada ou não) e copia as linhas da tabela atual.
+
+    A cópia segura um bloqueio exclusivo em `tasks` até o fim; em tabelas grandes
+    rode numa janela de manutenção.
+    """
+    op.execute('LOCK TABLE tasks IN ACCESS EXCLUSIVE MODE')
+    op.execute('DROP TRIGGER IF EXISTS tasks_stats ON tasks')
+    for name in INDEX_NAMES:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+    op.execute('ALTER TABLE tasks RENAME TO tasks_heap')
+    op.execute('ALTER INDEX tasks_pkey RENAME TO tasks_heap_pkey')
+    # A sequência do id passa para a nova tabela em vez de cair com a antiga
+    op.execute('ALTER SEQUENCE tasks_id_seq OWNED BY NONE')
+
+    partition_by = f' PARTITION BY {PARTITION_BY[mode]}' if mode in PARTITION_BY else ''
+    op.execute(f'CREATE TABLE tasks (LIKE tasks_heap INCLUDING DEFAULTS){partition_by}')
+    op.execute(f"ALTER TABLE tasks ADD PRIMARY KEY ({PRIMARY_KEYS.get(mode, 'id')})")
+    op.execute(
+        'ALTER TABLE tasks ADD CONSTRAINT tasks_project_id_fkey '
+        'FOREIGN KEY (project_id) REFERENCES projects (id)'
+    )
+    if mode in PARTITION_BY:
+        for statement in _partitions(mode):
+            op.execute(statement)
+
+    op.execute('INSERT INTO tasks SELECT * FROM tasks_heap')
+    op.execute('ALTER SEQUENCE tasks_id_seq OWNED BY tasks.id')
+    op.execute('DROP TABLE tasks_heap')
+
+    for statement in INDEXES:
+        op.execute(statement)
+    # Os contadores já refletem as linhas copiadas; a trigger volta só depois da cópia
+    op.execute(
+        'CREATE TRIGGER tasks_stats AFTER INSERT OR DELETE '
+        'OR UPDATE OF status, project_id ON tasks '
+        'FOR EACH ROW EXECUTE FUNCTION project_task_stats_sync()'
+    )
+
+
+def upgrade() -> None:
+    mode = Settings().TASKS_PARTITIONING
+    if op.get_bind().dialect.name != 'postgresql' or mode == 'none':
+        return
+
+    _rebuild(mode)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    partitioned = op.get_bind().exec_driver_sql(
+        "SELECT relkind = 'p' FROM pg_class WHERE relname = 'tasks'"
+    ).scalar()
+    if partitioned:
+        _rebuild('none')
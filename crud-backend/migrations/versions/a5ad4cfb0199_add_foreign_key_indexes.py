@@ -0,0 +1,49 @@
+"""add foreign key indexes
+
+Revision ID: a5ad4cfb0199
+Revises: e9f864763487
+Create Date: 2026-10-18 19:20:11.402315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5ad4cfb0199'
+down_revision: Union[str, None] = 'e9f864763487'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_projects_client_id_id', 'projects', ['client_id', 'id']),
+    ('ix_projects_client_id_status_id', 'projects', ['client_id', 'status', 'id']),
+    ('ix_tasks_project_id_id', 'tasks', ['project_id', 'id']),
+    ('ix_tasks_project_id_status_id', 'tasks', ['project_id', 'status', 'id']),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY não pode rodar dentro de uma transação
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,111 @@
+"""add project task stats
+
+Revision ID: c3f1d2a7b845
+Revises: 96588d9b938a
+Create Date: 2026-10-18 21:12:40.533217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f1d2a7b845'
+down_revision: Union[str, None] = '96588d9b938a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STATUSES = ('pending', 'doing', 'completed', 'paused', 'deleted')
+FUNCTION = 'project_task_stats_sync'
+
+
+def _flags(row: str) -> list[str]:
+    return [
+        f"CASE WHEN {row}.status = '{status}' THEN 1 ELSE 0 END" for status in STATUSES
+    ]
+
+
+def _increment(row: str) -> str:
+    assignments = ', '.join(
+        f'{status} = project_task_stats.{status} + excluded.{status}'
+        for status in STATUSES
+    )
+    return (
+        f"INSERT INTO project_task_stats (project_id, {', '.join(STATUSES)}) "
+        f"VALUES ({row}.project_id, {', '.join(_flags(row))}) "
+        f"ON CONFLICT (project_id) DO UPDATE SET {assignments}"
+    )
+
+
+def _decrement(row: str) -> str:
+    assignments = ', '.join(
+        f'{status} = {status} - {flag}' for status, flag in zip(STATUSES, _flags(row))
+    )
+    return f'UPDATE project_task_stats SET {assignments} WHERE project_id = {row}.project_id'
+
+
+def _triggers(dialect: str) -> list[str]:
+    if dialect == 'sqlite':
+        return [
+            f"CREATE TRIGGER IF NOT EXISTS tasks_stats_ai AFTER INSERT ON tasks "
+            f"BEGIN {_increment('new')}; END",
+            f"CREATE TRIGGER IF NOT EXISTS tasks_stats_ad AFTER DELETE ON tasks "
+            f"BEGIN {_decrement('old')}; END",
+            "CREATE TRIGGER IF NOT EXISTS tasks_stats_au "
+            "AFTER UPDATE OF status, project_id ON tasks "
+            "WHEN old.status IS NOT new.status OR old.project_id IS NOT new.project_id "
+            f"BEGIN {_decrement('old')}; {_increment('new')}; END",
+        ]
+
+    return [
+        f"CREATE OR REPLACE FUNCTION {FUNCTION}() RETURNS trigger "
+        "LANGUAGE plpgsql AS $$ BEGIN "
+        "IF TG_OP = 'UPDATE' AND OLD.status = NEW.status "
+        "AND OLD.project_id = NEW.project_id THEN RETURN NULL; END IF; "
+        f"IF TG_OP IN ('UPDATE', 'DELETE') THEN {_decrement('OLD')}; END IF; "
+        f"IF TG_OP IN ('UPDATE', 'INSERT') THEN {_increment('NEW')}; END IF; "
+        "RETURN NULL; END $$",
+        "CREATE TRIGGER tasks_stats AFTER INSERT OR DELETE "
+        "OR UPDATE OF status, project_id ON tasks "
+        f"FOR EACH ROW EXECUTE FUNCTION {FUNCTION}()",
+    ]
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    op.create_table('project_task_stats',
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    *(sa.Column(status, sa.Integer(), server_default='0', nullable=False) for status in STATUSES),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('project_id')
+    )
+
+    if dialect == 'postgresql':
+        # Bloqueia escritas em tasks entre a carga inicial e a criação da trigger
+        op.execute('LOCK TABLE tasks IN SHARE MODE')
+
+    counts = ', '.join(f"count(*) FILTER (WHERE status = '{status}')" for status in STATUSES)
+    op.execute(
+        f"INSERT INTO project_task_stats (project_id, {', '.join(STATUSES)}) "
+        f"SELECT project_id, {counts} FROM tasks GROUP BY project_id"
+    )
+
+    if dialect in ('sqlite', 'postgresql'):
+        for statement in _triggers(dialect):
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        for suffix in ('ai', 'ad', 'au'):
+            op.execute(f'DROP TRIGGER IF EXISTS tasks_stats_{suffix}')
+    elif dialect == 'postgresql':
+        op.execute('DROP TRIGGER IF EXISTS tasks_stats ON tasks')
+        op.execute(f'DROP FUNCTION IF EXISTS {FUNCTION}()')
+
+    op.drop_table('project_task_stats')
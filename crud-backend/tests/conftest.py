@@ -2,16 +2,26 @@ import pytest
 import factory
 import factory.fuzzy
 from datetime import datetime
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
+from urllib.parse import urlsplit
 
-from sqlalchemy import create_engine, event
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
 
 from fastapi.testclient import TestClient
+from starlette.routing import Match
 
 from crud_backend.main import app
-from crud_backend.database import get_session
+from crud_backend.entity_cache import EntityCache, MemoryBackend, get_entity_cache
+from crud_backend.list_cache import ListCache, get_list_cache
+from crud_backend.database import (
+    ThreadedSession,
+    get_primary_session,
+    get_session,
+    get_session_factory,
+)
 from crud_backend.models.clients import Client
 from crud_backend.models.projects import Project, ProjectStatus
 from crud_backend.models.registry import table_registry
@@ -48,13 +58,45 @@ class TaskFactory(factory.Factory):
     project_id = 1
 
 
-@pytest.fixture
-def app_client(session):
-    def get_session_override():
-        return session
+@pytest.fixture(params=["sync", "async"])
+def app_client(request, session, database_path):
+    if request.param == "sync":
+
+        def get_session_override():
+            return ThreadedSession(session)
+
+        @asynccontextmanager
+        async def open_session_override():
+            threaded_session = ThreadedSession(Session(session.get_bind()))
+            try:
+                yield threaded_session
+            finally:
+                await threaded_session.close()
+
+    else:
+        async_engine = create_async_engine(
+            f"sqlite+aiosqlite:///{database_path}", poolclass=NullPool
+        )
+
+        @asynccontextmanager
+        async def open_session_override():
+            async with AsyncSession(async_engine) as async_session:
+                yield async_session
+
+        async def get_session_override():
+            async with open_session_override() as async_session:
+                yield async_session
+
+    cache = EntityCache(MemoryBackend(), ttl=60)
+    # Sem TTL, cada listagem consulta o banco: os testes gravam direto na sessão
+    list_cache = ListCache(MemoryBackend(), max_bytes=1024 * 1024, ttl=0, stale_ttl=0)
 
     with TestClient(app) as client:
         app.dependency_overrides[get_session] = get_session_override
+        app.dependency_overrides[get_primary_session] = get_session_override
+        app.dependency_overrides[get_session_factory] = lambda: open_session_override
+        app.dependency_overrides[get_entity_cache] = lambda: cache
+        app.dependency_overrides[get_list_cache] = lambda: list_cache
 
         yield client
 
@@ -62,11 +104,15 @@ def app_client(session):
 
 
 @pytest.fixture
-def session():
+def database_path(tmp_path):
+    return tmp_path / "test.db"
+
+
+@pytest.fixture
+def session(database_path):
     engine = create_engine(
-        "sqlite:///:memory:",
+        f"sqlite:///{database_path}",
         connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
     )
     table_registry.metadata.create_all(engine)
 
@@ -74,6 +120,25 @@ def session():
         yield session
 
     table_registry.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def foreign_keys(session):
+    """Liga as FKs do SQLite nas conexões abertas a partir daqui."""
+
+    def enable(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    session.commit()
+    event.listen(Engine, "connect", enable)
+    session.get_bind().dispose()
+
+    yield
+
+    event.remove(Engine, "connect", enable)
 
 
 @contextmanager
@@ -92,6 +157,48 @@ def _mock_db_time(*, model, time=datetime(2024, 1, 1)):
     event.remove(model, "before_insert", fake_time_hook)
 
 
+@pytest.fixture
+def captured_statements():
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(Engine, "before_cursor_execute", capture)
+
+    yield statements
+
+    event.remove(Engine, "before_cursor_execute", capture)
+
+
+def _route_endpoint(method, url):
+    scope = {"type": "http", "method": method, "path": urlsplit(url).path}
+    for route in app.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.endpoint
+
+
+@pytest.fixture
+def budgeted_request(app_client, captured_statements):
+    """Faz a requisição e falha se a rota exceder o seu query_budget."""
+
+    def request(method, path, **kwargs):
+        captured_statements.clear()
+        res = app_client.request(method, path, **kwargs)
+
+        budget = _route_endpoint(method, path).query_budget
+        statements = [statement for statement, _ in captured_statements]
+        assert len(statements) <= budget, (
+            f"{method} {path} ran {len(statements)} statements "
+            f"(budget {budget}): {statements}"
+        )
+
+        return res
+
+    return request
+
+
 @pytest.fixture
 def mock_db_time():
     return _mock_db_time
@@ -0,0 +1,186 @@
+from datetime import datetime, timedelta
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import func, select, update
+
+from crud_backend.archive import archive_deleted
+from crud_backend.models.archive import ArchivedProject, ArchivedTask
+from crud_backend.models.projects import Project, ProjectStatus
+from crud_backend.models.stats import ProjectTaskStats
+from crud_backend.models.tasks import Task, TaskStatus
+from tests.conftest import ProjectFactory, TaskFactory
+from tests.test_indexes import _query_plan
+
+LONG_AGO = datetime(2024, 1, 1)
+RETENTION = timedelta(days=30)
+
+
+def _add_tasks(session, project, count, status, updated_at=None):
+    tasks = TaskFactory.create_batch(count, project_id=project.id, status=status)
+    session.add_all(tasks)
+    session.flush()
+    if updated_at is not None:
+        session.execute(
+            update(Task)
+            .where(Task.id.in_([task.id for task in tasks]))
+            .values(updated_at=updated_at)
+        )
+    session.commit()
+    return [task.id for task in tasks]
+
+
+def _count(session, entity):
+    return session.scalar(select(func.count()).select_from(entity))
+
+
+@pytest.fixture
+def archived(session, project):
+    """Duas tarefas arquivadas, uma removida recentemente e uma viva."""
+    old = _add_tasks(session, project, 2, TaskStatus.deleted, LONG_AGO)
+    recent = _add_tasks(session, project, 1, TaskStatus.deleted)
+    live = _add_tasks(session, project, 1, TaskStatus.doing, LONG_AGO)
+
+    report = archive_deleted(session, RETENTION, batch_size=10)
+
+    assert report.tasks == len(old)
+    return old, recent + live
+
+
+def test_archive_moves_only_old_deleted_tasks(session, archived):
+    old, kept = archived
+
+    assert session.scalars(select(ArchivedTask.id).order_by("id")).all() == old
+    assert session.scalars(select(Task.id).order_by("id")).all() == kept
+
+
+def test_archive_runs_in_batches(session, project, captured_statements):
+    _add_tasks(session, project, 5, TaskStatus.deleted, LONG_AGO)
+    captured_statements.clear()
+
+    report = archive_deleted(session, RETENTION, batch_size=2)
+
+    deletes = [sql for sql, _ in captured_statements if sql.startswith("DELETE")]
+    assert report.tasks == 5
+    assert len(deletes) == 3
+    assert _count(session, ArchivedTask) == 5
+
+
+def test_archive_keeps_task_stats(session, project, archived):
+    stats = session.get(ProjectTaskStats, project.id)
+
+    assert (stats.deleted, stats.doing) == (1, 1)
+
+
+def test_archive_moves_expired_project_with_its_tasks(session, client, project):
+    project_id = project.id
+    live = _add_tasks(session, project, 2, TaskStatus.doing)
+    session.execute(
+        update(Project)
+        .where(Project.id == project.id)
+        .values(status=ProjectStatus.deleted, updated_at=LONG_AGO)
+    )
+    recent = ProjectFactory(client_id=client.id, status=ProjectStatus.deleted)
+    session.add(recent)
+    session.commit()
+    recent_id = recent.id
+
+    report = archive_deleted(session, RETENTION, batch_size=10)
+
+    assert (report.tasks, report.projects) == (2, 1)
+    assert session.scalars(select(ArchivedTask.id).order_by("id")).all() == live
+    assert session.scalars(select(ArchivedProject.id)).all() == [project_id]
+    assert session.scalars(select(Project.id)).all() == [recent_id]
+    assert session.get(ProjectTaskStats, project_id) is None
+
+
+def test_archive_selection_uses_deleted_index(
+    session, project, archived, captured_statements
+):
+    captured_statements.clear()
+
+    archive_deleted(session, RETENTION, batch_size=10)
+
+    assert "ix_tasks_deleted_updated_at" in _query_plan(
+        session, captured_statements, "tasks"
+    )
+
+
+def test_list_tasks_hides_archived_rows(app_client, project, archived):
+    _, kept = archived
+
+    res = app_client.get(f"/projects/{project.id}/tasks/")
+
+    assert [task["id"] for task in res.json()["tasks"]] == kept
+    assert res.json()["total"] == len(kept)
+
+
+def test_list_tasks_includes_archived_rows(app_client, project, archived):
+    old, kept = archived
+    url = f"/projects/{project.id}/tasks/"
+
+    first = app_client.get(url, params={"include_archived": True, "limit": 2}).json()
+    second = app_client.get(
+        url, params={"include_archived": True, "cursor": first["next_cursor"]}
+    ).json()
+
+    ids = [task["id"] for task in first["tasks"] + second["tasks"]]
+    assert ids == sorted(old + kept)
+    assert first["total"] == len(old) + len(kept)
+
+
+def test_list_tasks_filters_archived_rows(app_client, session, project, archived):
+    old, _ = archived
+    title = session.get(ArchivedTask, old[0]).title
+
+    res = app_client.get(
+        f"/projects/{project.id}/tasks/",
+        params={"include_archived": True, "title": title, "status": "deleted"},
+    )
+
+    assert old[0] in [task["id"] for task in res.json()["tasks"]]
+    assert all(task["title"] == title for task in res.json()["tasks"])
+
+
+def test_list_projects_includes_archived_rows(app_client, session, client, project):
+    project_id = project.id
+    url = f"/clients/{client.id}/projects/"
+    session.execute(
+        update(Project)
+        .where(Project.id == project.id)
+        .values(status=ProjectStatus.deleted, updated_at=LONG_AGO)
+    )
+    session.commit()
+    archive_deleted(session, RETENTION, batch_size=10)
+
+    hot = app_client.get(url).json()
+    everything = app_client.get(url, params={"include_archived": True}).json()
+
+    assert hot["projects"] == []
+    assert [project["id"] for project in everything["projects"]] == [project_id]
+
+
+def test_export_tasks_includes_archived_rows(app_client, project, archived):
+    old, kept = archived
+
+    res = app_client.get(
+        f"/projects/{project.id}/tasks/export", params={"include_archived": True}
+    )
+
+    assert res.status_code == HTTPStatus.OK
+    assert len(res.text.splitlines()) == len(old) + len(kept)
+
+
+def test_status_filter_uses_partial_index(
+    session, app_client, captured_statements, project
+):
+    _add_tasks(session, project, 3, TaskStatus.doing)
+    captured_statements.clear()
+
+    app_client.get(f"/projects/{project.id}/tasks/?status=doing")
+
+    statement = next(sql for sql, _ in captured_statements if "FROM tasks" in sql)
+    assert "tasks.status != ?" in statement
+    assert "ix_tasks_project_id_status_id" in _query_plan(
+        session, captured_statements, "tasks"
+    )
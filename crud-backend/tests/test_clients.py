@@ -1,5 +1,8 @@
 from http import HTTPStatus
 
+from tests.conftest import ClientFactory, ProjectFactory, TaskFactory
+from crud_backend.models.projects import Project, ProjectStatus
+from crud_backend.models.tasks import TaskStatus
 from crud_backend.schemas.clients import ClientPublic
 
 
@@ -49,11 +52,50 @@ def test_create_client_duplicate_phone(app_client, client):
     assert res.json() == {"detail": "Phone already exists"}
 
 
+def test_create_clients_bulk(app_client):
+    res = app_client.post(
+        "/clients/bulk",
+        json=[
+            {"company": "A", "email": "a@example.com", "phone": "1"},
+            {"company": "B", "email": "b@example.com", "phone": "2"},
+        ],
+    )
+
+    assert res.status_code == HTTPStatus.CREATED
+    assert res.json() == {
+        "created": [
+            {"id": 1, "company": "A", "email": "a@example.com"},
+            {"id": 2, "company": "B", "email": "b@example.com"},
+        ],
+        "errors": [],
+    }
+
+
+def test_create_clients_bulk_reports_duplicates(app_client, client):
+    res = app_client.post(
+        "/clients/bulk",
+        json=[
+            {"company": "A", "email": client.email, "phone": "1"},
+            {"company": "B", "email": "b@example.com", "phone": client.phone},
+            {"company": "C", "email": "c@example.com", "phone": "3"},
+            {"company": "D", "email": "c@example.com", "phone": "4"},
+        ],
+    )
+
+    assert res.status_code == HTTPStatus.CREATED
+    assert [c["company"] for c in res.json()["created"]] == ["C"]
+    assert res.json()["errors"] == [
+        {"index": 0, "detail": "Email already exists"},
+        {"index": 1, "detail": "Phone already exists"},
+        {"index": 3, "detail": "Email already exists"},
+    ]
+
+
 def test_read_clients(app_client):
     res = app_client.get("/clients/")
 
     assert res.status_code == HTTPStatus.OK
-    assert res.json() == {"clients": []}
+    assert res.json() == {"clients": [], "next_cursor": None}
 
 
 def test_read_clients_with_client(app_client, client):
@@ -61,7 +103,27 @@ def test_read_clients_with_client(app_client, client):
     res = app_client.get("/clients/")
 
     assert res.status_code == HTTPStatus.OK
-    assert res.json() == {"clients": [client_schema]}
+    assert res.json() == {"clients": [client_schema], "next_cursor": None}
+
+
+def test_read_clients_cursor_pagination(session, app_client):
+    session.add_all(ClientFactory.create_batch(5))
+    session.commit()
+
+    first_page = app_client.get("/clients/?limit=3").json()
+    second_page = app_client.get(
+        f"/clients/?limit=3&cursor={first_page['next_cursor']}"
+    ).json()
+
+    assert [c["id"] for c in first_page["clients"]] == [1, 2, 3]
+    assert [c["id"] for c in second_page["clients"]] == [4, 5]
+    assert second_page["next_cursor"] is None
+
+
+def test_read_clients_invalid_cursor(app_client):
+    res = app_client.get("/clients/?cursor=invalid")
+
+    assert res.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
 
 
 def test_read_client(app_client, client):
@@ -81,6 +143,56 @@ def test_read_client_raise_exception(app_client):
     assert res.json() == {"detail": "Client not found"}
 
 
+def test_read_client_summary(session, app_client, client):
+    doing = ProjectFactory(client_id=client.id, status=ProjectStatus.doing)
+    paused = ProjectFactory(client_id=client.id, status=ProjectStatus.paused)
+    session.add_all([doing, paused])
+    session.commit()
+    session.bulk_save_objects(
+        TaskFactory.create_batch(3, project_id=doing.id, status=TaskStatus.completed)
+    )
+    session.bulk_save_objects(
+        TaskFactory.create_batch(1, project_id=paused.id, status=TaskStatus.pending)
+    )
+    session.commit()
+
+    res = app_client.get(f"/clients/{client.id}/summary?recent=2")
+
+    assert res.status_code == HTTPStatus.OK
+    summary = res.json()
+    assert summary["client"]["id"] == client.id
+    assert summary["projects"] == {
+        "pending": 0,
+        "doing": 1,
+        "completed": 0,
+        "paused": 1,
+        "deleted": 0,
+    }
+    assert summary["tasks"]["completed"] == 3
+    assert summary["tasks"]["pending"] == 1
+    assert sum(summary["tasks"].values()) == 4
+    assert [p["id"] for p in summary["recent_projects"]] == [paused.id, doing.id]
+    assert [t["id"] for t in summary["recent_tasks"]] == [4, 3]
+    assert summary["recent_tasks"][0]["project_id"] == paused.id
+
+
+def test_read_client_summary_without_projects(app_client, client):
+    res = app_client.get(f"/clients/{client.id}/summary")
+
+    summary = res.json()
+    assert set(summary["projects"].values()) == {0}
+    assert set(summary["tasks"].values()) == {0}
+    assert summary["recent_projects"] == []
+    assert summary["recent_tasks"] == []
+
+
+def test_read_client_summary_not_found(app_client):
+    res = app_client.get("/clients/9/summary")
+
+    assert res.status_code == HTTPStatus.NOT_FOUND
+    assert res.json() == {"detail": "Client not found"}
+
+
 def test_patch_client(app_client, client):
     res = app_client.patch(
         f"/clients/{client.id}",
@@ -147,3 +259,12 @@ def test_delete_client_raise_exception(app_client):
 
     assert res.status_code == HTTPStatus.NOT_FOUND
     assert res.json() == {"detail": "Client not found"}
+
+
+def test_delete_client_with_projects_conflict(app_client, session, client, project):
+    res = app_client.delete(f"/clients/{client.id}")
+
+    assert res.status_code == HTTPStatus.CONFLICT
+    assert res.json() == {"detail": "Client has projects"}
+    assert app_client.get(f"/clients/{client.id}").status_code == HTTPStatus.OK
+    assert session.get(Project, project.id) is not None
@@ -0,0 +1,173 @@
+import zlib
+from http import HTTPStatus
+
+import anyio
+import pytest
+from fastapi.responses import StreamingResponse
+
+from crud_backend.compression import (
+    CompressionMiddleware,
+    GzipEncoder,
+    available_encoders,
+    negotiate,
+)
+from tests.conftest import TaskFactory
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("gzip", "gzip"),
+        ("br;q=0.5, gzip;q=0.8", "gzip"),
+        ("gzip;q=0, zstd;q=0, *;q=1", "br"),
+        ("*", "zstd"),
+        ("identity", None),
+        ("gzip;q=0", None),
+        ("", None),
+    ],
+)
+def test_negotiate_respects_quality_and_preference(header, expected):
+    assert negotiate(header, ["zstd", "br", "gzip"]) == expected
+
+
+def test_gzip_is_always_available():
+    assert "gzip" in available_encoders(6, 4, 3)
+
+
+def _run(app, accept_encoding="gzip"):
+    """Executa o app pelo middleware e devolve as mensagens ASGI enviadas."""
+    messages = []
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+
+    async def receive():
+        # O cliente nunca desconecta; o StreamingResponse cancela a espera ao terminar
+        await anyio.sleep_forever()
+
+    async def send(message):
+        messages.append(message)
+
+    middleware = CompressionMiddleware(
+        app, minimum_size=64, encoders={"gzip": lambda: GzipEncoder(6)}
+    )
+    anyio.run(middleware, scope, receive, send)
+    return messages
+
+
+def test_streaming_chunks_are_flushed_as_they_arrive():
+    chunks = [b'{"id": %d}\n' % index for index in range(3)]
+
+    async def rows():
+        for chunk in chunks:
+            yield chunk
+
+    start, *bodies = _run(StreamingResponse(rows(), media_type="application/x-ndjson"))
+
+    headers = dict(start["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    # Cada pedaço já pode ser lido pelo cliente antes do fim do corpo
+    for chunk, body in zip(chunks, bodies):
+        assert decoder.decompress(body["body"]) == chunk
+    assert decoder.decompress(bodies[-1]["body"]) + decoder.flush() == b""
+    assert bodies[-1]["more_body"] is False
+
+
+def test_skips_already_encoded_responses():
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-encoding", b"br"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": b"x" * 128})
+
+    start, body = _run(app)
+
+    assert dict(start["headers"])[b"content-encoding"] == b"br"
+    assert body["body"] == b"x" * 128
+
+
+def test_large_list_is_compressed(app_client, session, project):
+    session.add_all(
+        TaskFactory.create_batch(20, project_id=project.id, description="x" * 200)
+    )
+    session.commit()
+
+    res = app_client.get(
+        f"/projects/{project.id}/tasks/", headers={"Accept-Encoding": "gzip"}
+    )
+
+    assert res.status_code == HTTPStatus.OK
+    assert res.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in res.headers["vary"]
+    assert len(res.json()["tasks"]) == 20
+
+
+def test_small_response_is_not_compressed(app_client, client):
+    res = app_client.get(f"/clients/{client.id}", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in res.headers
+    assert int(res.headers["content-length"]) == len(res.content)
+
+
+def test_identity_request_is_not_compressed(app_client, session, project):
+    session.add_all(
+        TaskFactory.create_batch(20, project_id=project.id, description="x" * 200)
+    )
+    session.commit()
+
+    res = app_client.get(
+        f"/projects/{project.id}/tasks/", headers={"Accept-Encoding": "identity"}
+    )
+
+    assert "content-encoding" not in res.headers
+
+
+def test_compressed_etag_is_weak_and_revalidates(app_client, session, project):
+    session.add_all(
+        TaskFactory.create_batch(20, project_id=project.id, description="x" * 200)
+    )
+    session.commit()
+    url = f"/projects/{project.id}/tasks/"
+
+    etag = app_client.get(url, headers={"Accept-Encoding": "gzip"}).headers["etag"]
+    res = app_client.get(
+        url, headers={"Accept-Encoding": "gzip", "If-None-Match": etag}
+    )
+
+    assert etag.startswith("W/")
+    assert res.status_code == HTTPStatus.NOT_MODIFIED
+    assert res.headers["etag"] == etag
+
+
+def test_uncompressed_small_body_shares_weak_etag(app_client, client):
+    url = f"/clients/{client.id}"
+
+    res = app_client.get(url, headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in res.headers
+    assert res.headers["etag"].startswith("W/")
+    assert "Accept-Encoding" in res.headers["vary"]
+
+
+def test_export_stream_is_compressed(app_client, session, project):
+    session.add_all(TaskFactory.create_batch(5, project_id=project.id))
+    session.commit()
+
+    res = app_client.get(
+        f"/projects/{project.id}/tasks/export", headers={"Accept-Encoding": "gzip"}
+    )
+
+    assert res.headers["content-encoding"] == "gzip"
+    assert len(res.text.splitlines()) == 5
@@ -1,3 +1,6 @@
+import subprocess
+import sys
+
 from sqlalchemy import select
 from dataclasses import asdict
 
@@ -60,3 +63,16 @@ def test_create_task(session, project):
     project = session.scalar(select(Project).where(Project.id == project.id))
 
     assert task in project.tasks
+
+
+def test_models_and_caches_do_not_create_engines():
+    script = (
+        "import sys\n"
+        "import crud_backend.models, crud_backend.entity_cache, crud_backend.list_cache\n"
+        "print('crud_backend.database' in sys.modules)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, check=True, text=True
+    )
+
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,101 @@
+from http import HTTPStatus
+
+import anyio
+
+from crud_backend.database import ThreadedSession
+from crud_backend.entity_cache import EntityCache, MemoryBackend
+
+TASK = {
+    "title": "Task",
+    "description": "Task",
+    "status": "pending",
+    "assigned_to": "Ana",
+}
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryBackend(max_entries=2)
+
+    async def scenario():
+        await backend.set("a", 1, ttl=60)
+        await backend.set("b", 2, ttl=60)
+        await backend.get("a")
+        await backend.set("c", 3, ttl=60)
+        return [await backend.get(key) for key in ("a", "b", "c")]
+
+    assert anyio.run(scenario) == [1, None, 3]
+
+
+def test_memory_backend_expires_entries():
+    now = [0.0]
+    backend = MemoryBackend(clock=lambda: now[0])
+
+    async def scenario():
+        await backend.set("a", 1, ttl=10)
+        before = await backend.get("a")
+        now[0] = 10.0
+        return before, await backend.get("a")
+
+    assert anyio.run(scenario) == (1, None)
+
+
+def test_create_task_skips_existence_query_on_hit(
+    app_client, project, captured_statements
+):
+    url = f"/projects/{project.id}/tasks/"
+    app_client.post(url, json=TASK)
+    captured_statements.clear()
+
+    res = app_client.post(url, json=TASK)
+
+    assert res.status_code == HTTPStatus.CREATED
+    assert [sql.split()[0] for sql, _ in captured_statements] == ["INSERT"]
+
+
+def test_delete_project_invalidates_cache(app_client, client, project):
+    app_client.post(f"/projects/{project.id}/tasks/", json=TASK)
+    app_client.delete(f"/projects/{project.id}/tasks/1")
+
+    app_client.delete(f"/clients/{client.id}/projects/{project.id}")
+    res = app_client.post(f"/projects/{project.id}/tasks/", json=TASK)
+
+    assert res.status_code == HTTPStatus.NOT_FOUND
+    assert res.json() == {"detail": "Project not found"}
+
+
+def test_delete_client_invalidates_cache(app_client, client):
+    project = {"title": "P", "description": "P", "status": "pending"}
+    app_client.post(f"/clients/{client.id}/projects/", json=project)
+    app_client.delete(f"/clients/{client.id}/projects/1")
+
+    app_client.delete(f"/clients/{client.id}")
+    res = app_client.post(f"/clients/{client.id}/projects/", json=project)
+
+    assert res.status_code == HTTPStatus.NOT_FOUND
+    assert res.json() == {"detail": "Client not found"}
+
+
+def test_shared_backend_keeps_workers_coherent(session, client, project):
+    backend = MemoryBackend()
+    worker_a = EntityCache(backend, ttl=60)
+    worker_b = EntityCache(backend, ttl=60)
+
+    async def scenario():
+        threaded_session = ThreadedSession(session)
+        await worker_a.project_exists(threaded_session, project.id)
+        cached = await worker_b.project_exists(threaded_session, project.id)
+        await worker_a.invalidate_project(project.id)
+        await worker_b.project_exists(threaded_session, project.id)
+        return cached
+
+    assert anyio.run(scenario) is True
+    assert worker_b.stats() == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+
+def test_readiness_reports_cache_stats(app_client, project):
+    app_client.post(f"/projects/{project.id}/tasks/", json=TASK)
+    app_client.post(f"/projects/{project.id}/tasks/", json=TASK)
+
+    stats = app_client.get("/health/ready").json()["entity_cache"]
+
+    assert stats == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
@@ -0,0 +1,132 @@
+from http import HTTPStatus
+
+import pytest
+
+from crud_backend.schemas.clients import ClientView
+from crud_backend.schemas.schemas import EXPAND_MAX_LIMIT
+from tests.conftest import ClientFactory, ProjectFactory, TaskFactory
+
+
+@pytest.fixture
+def tree(session, client):
+    """Cliente com três projetos de três tarefas cada."""
+    projects = ProjectFactory.create_batch(3, client_id=client.id)
+    session.add_all(projects)
+    session.flush()
+    for project in projects:
+        session.add_all(TaskFactory.create_batch(3, project_id=project.id))
+    session.commit()
+
+    return client
+
+
+def test_nested_expansion_implies_parent():
+    view = ClientView(expand="projects.tasks")
+
+    assert view.expansions == {"projects", "projects.tasks"}
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"expand": "tasks"},
+        {"expand": ""},
+        {"expand": "projects", "expand_limit": 0},
+        {"expand": "projects", "expand_limit": EXPAND_MAX_LIMIT + 1},
+    ],
+)
+def test_read_client_rejects_invalid_expand(app_client, client, params):
+    res = app_client.get(f"/clients/{client.id}", params=params)
+
+    assert res.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_read_client_embeds_projects_and_tasks(app_client, tree, captured_statements):
+    url = f"/clients/{tree.id}"
+    captured_statements.clear()
+
+    res = app_client.get(url, params={"expand": "projects,projects.tasks"})
+
+    assert res.status_code == HTTPStatus.OK
+    projects = res.json()["projects"]
+    assert [len(project["tasks"]) for project in projects] == [3, 3, 3]
+    assert len(captured_statements) == 3
+    assert "etag" not in res.headers
+
+
+def test_read_client_projects_only_omit_tasks(app_client, tree):
+    res = app_client.get(f"/clients/{tree.id}", params={"expand": "projects"})
+
+    projects = res.json()["projects"]
+    assert len(projects) == 3
+    assert all("tasks" not in project for project in projects)
+
+
+def test_read_client_without_expand_keeps_shape(app_client, client):
+    res = app_client.get(f"/clients/{client.id}")
+
+    assert set(res.json()) == {"id", "company", "email"}
+
+
+def test_expand_limit_caps_each_level(app_client, tree):
+    res = app_client.get(
+        f"/clients/{tree.id}",
+        params={"expand": "projects.tasks", "expand_limit": 2},
+    )
+
+    projects = res.json()["projects"]
+    assert len(projects) == 2
+    assert [len(project["tasks"]) for project in projects] == [2, 2]
+    assert projects[0]["tasks"][0]["id"] < projects[0]["tasks"][1]["id"]
+
+
+def test_expand_combines_with_fields(app_client, tree):
+    res = app_client.get(
+        f"/clients/{tree.id}", params={"expand": "projects", "fields": "company"}
+    )
+
+    assert set(res.json()) == {"company", "projects"}
+
+
+def test_list_clients_query_count_is_fixed(
+    app_client, session, tree, captured_statements
+):
+    other = ClientFactory()
+    session.add(other)
+    session.flush()
+    session.add_all(ProjectFactory.create_batch(5, client_id=other.id))
+    session.commit()
+    captured_statements.clear()
+
+    res = app_client.get("/clients/", params={"expand": "projects.tasks"})
+
+    clients = res.json()["clients"]
+    assert [len(client["projects"]) for client in clients] == [3, 5]
+    assert all(project["tasks"] == [] for project in clients[1]["projects"])
+    assert len(captured_statements) == 3
+
+
+def test_list_projects_embeds_tasks(app_client, tree, captured_statements):
+    url = f"/clients/{tree.id}/projects/"
+    captured_statements.clear()
+
+    res = app_client.get(url, params={"expand": "tasks", "limit": 2})
+
+    body = res.json()
+    assert body["total"] == 3
+    assert body["next_cursor"] is not None
+    assert [len(project["tasks"]) for project in body["projects"]] == [3, 3]
+    assert len(captured_statements) == 2
+    assert "etag" not in res.headers
+
+
+def test_read_project_embeds_tasks(app_client, session, client, project):
+    session.add_all(TaskFactory.create_batch(2, project_id=project.id))
+    session.commit()
+
+    res = app_client.get(
+        f"/clients/{client.id}/projects/{project.id}", params={"expand": "tasks"}
+    )
+
+    assert res.status_code == HTTPStatus.OK
+    assert len(res.json()["tasks"]) == 2
@@ -0,0 +1,116 @@
+import csv
+import io
+import json
+import tracemalloc
+from contextlib import asynccontextmanager
+from http import HTTPStatus
+
+import anyio
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from tests.conftest import ProjectFactory, TaskFactory
+from crud_backend.database import ThreadedSession
+from crud_backend.export import stream_rows
+from crud_backend.models.tasks import Task, TaskStatus
+from crud_backend.schemas.schemas import ExportFormat
+from crud_backend.schemas.tasks import TaskPublic
+
+
+def test_export_tasks_ndjson(session, app_client, project):
+    session.bulk_save_objects(TaskFactory.create_batch(3, project_id=project.id))
+    session.commit()
+
+    res = app_client.get(f"/projects/{project.id}/tasks/export")
+
+    assert res.status_code == HTTPStatus.OK
+    assert res.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in res.text.splitlines()]
+    assert [line["id"] for line in lines] == [1, 2, 3]
+    assert set(lines[0]) == set(TaskPublic.model_fields)
+
+
+def test_export_tasks_csv_applies_filters(session, app_client, project):
+    session.bulk_save_objects(
+        TaskFactory.create_batch(2, project_id=project.id, status=TaskStatus.doing)
+    )
+    session.bulk_save_objects(
+        TaskFactory.create_batch(3, project_id=project.id, status=TaskStatus.paused)
+    )
+    session.commit()
+
+    res = app_client.get(f"/projects/{project.id}/tasks/export?format=csv&status=doing")
+
+    assert res.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(res.text)))
+    assert [row["status"] for row in rows] == ["doing", "doing"]
+
+
+def test_export_tasks_project_not_found(app_client):
+    res = app_client.get("/projects/10/tasks/export")
+
+    assert res.status_code == HTTPStatus.NOT_FOUND
+    assert res.json() == {"detail": "Project not found"}
+
+
+def test_export_projects_ndjson(session, app_client, client):
+    session.bulk_save_objects(ProjectFactory.create_batch(4, client_id=client.id))
+    session.commit()
+
+    res = app_client.get(f"/clients/{client.id}/projects/export")
+
+    assert res.status_code == HTTPStatus.OK
+    assert len(res.text.splitlines()) == 4
+
+
+def _insert_tasks(session, count):
+    session.execute(
+        insert(Task),
+        [
+            {
+                "title": f"Task {i}",
+                "description": "x" * 200,
+                "status": TaskStatus.pending,
+                "assigned_to": "TI",
+                "project_id": 1,
+            }
+            for i in range(count)
+        ],
+    )
+    session.commit()
+
+
+def _export_peak_memory(session):
+    @asynccontextmanager
+    async def session_factory():
+        threaded_session = ThreadedSession(Session(session.get_bind()))
+        try:
+            yield threaded_session
+        finally:
+            await threaded_session.close()
+
+    async def consume():
+        exported = 0
+        async for chunk in stream_rows(
+            session_factory, select(Task), TaskPublic, ExportFormat.ndjson
+        ):
+            exported += chunk.count("\n")
+        return exported
+
+    tracemalloc.start()
+    exported = anyio.run(consume)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return exported, peak
+
+
+def test_export_memory_does_not_grow_with_row_count(session):
+    _insert_tasks(session, 2_000)
+    small_count, small_peak = _export_peak_memory(session)
+
+    _insert_tasks(session, 18_000)
+    large_count, large_peak = _export_peak_memory(session)
+
+    assert (small_count, large_count) == (2_000, 20_000)
+    assert large_peak < small_peak * 1.5
@@ -0,0 +1,106 @@
+from http import HTTPStatus
+
+import pytest
+
+from crud_backend.schemas.tasks import FilterTasks
+from tests.conftest import ProjectFactory, TaskFactory
+
+
+def _selected_columns(captured_statements, table):
+    """Colunas do SELECT principal, sem as subconsultas de metadados."""
+    query = next(sql for sql, _ in captured_statements if sql.startswith("SELECT"))
+    columns = query.split(" FROM ")[0].removeprefix("SELECT ").split(", ")
+    return {
+        column.split(".")[1].split()[0]
+        for column in columns
+        if column.startswith(f"{table}.")
+    }
+
+
+def test_fields_are_normalized_to_schema_order():
+    assert FilterTasks(fields=" status,id ,title,id").fields == "title,status,id"
+
+
+@pytest.mark.parametrize("fields", ["id,secret", "", ","])
+def test_list_rejects_unknown_or_empty_fields(app_client, project, fields):
+    res = app_client.get(f"/projects/{project.id}/tasks/", params={"fields": fields})
+
+    assert res.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_list_tasks_loads_only_requested_columns(
+    app_client, session, project, captured_statements
+):
+    session.add_all(TaskFactory.create_batch(3, project_id=project.id))
+    session.commit()
+    url = f"/projects/{project.id}/tasks/"
+    captured_statements.clear()
+
+    res = app_client.get(url, params={"fields": "id,title,status"})
+
+    assert res.status_code == HTTPStatus.OK
+    tasks = res.json()["tasks"]
+    assert len(tasks) == 3
+    assert all(set(task) == {"id", "title", "status"} for task in tasks)
+    assert _selected_columns(captured_statements, "tasks") == {
+        "id",
+        "title",
+        "status",
+    }
+
+
+def test_list_projects_fields_keep_cursor_pagination(app_client, session, client):
+    session.add_all(ProjectFactory.create_batch(3, client_id=client.id))
+    session.commit()
+    url = f"/clients/{client.id}/projects/"
+
+    first = app_client.get(url, params={"fields": "title", "limit": 2}).json()
+    second = app_client.get(
+        url, params={"fields": "title", "cursor": first["next_cursor"]}
+    ).json()
+
+    assert [set(project) for project in first["projects"]] == [{"title"}] * 2
+    assert len(second["projects"]) == 1
+    assert first["total"] == 3
+
+
+def test_list_clients_fields(app_client, client):
+    res = app_client.get("/clients/", params={"fields": "company"})
+
+    assert res.json()["clients"] == [{"company": client.company}]
+
+
+@pytest.mark.parametrize(
+    ("fixture", "path", "fields"),
+    [
+        ("client", "/clients/{client.id}", "email"),
+        ("project", "/clients/{project.client_id}/projects/{project.id}", "status"),
+        ("task", "/projects/{task.project_id}/tasks/{task.id}", "assigned_to"),
+    ],
+)
+def test_detail_fields(request, app_client, client, project, fixture, path, fields):
+    entity = request.getfixturevalue(fixture)
+    url = path.format(**{fixture: entity})
+
+    full = app_client.get(url)
+    sparse = app_client.get(url, params={"fields": fields})
+
+    assert sparse.json() == {fields: full.json()[fields]}
+    assert sparse.headers["etag"] != full.headers["etag"]
+
+
+def test_detail_rejects_unknown_fields(app_client, project, task):
+    res = app_client.get(
+        f"/projects/{task.project_id}/tasks/{task.id}", params={"fields": "phone"}
+    )
+
+    assert res.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_detail_revalidates_sparse_representation(app_client, client, project):
+    url = f"/clients/{client.id}/projects/{project.id}?fields=title"
+    etag = app_client.get(url).headers["etag"]
+
+    res = app_client.get(url, headers={"If-None-Match": etag})
+
+    assert res.status_code == HTTPStatus.NOT_MODIFIED
@@ -0,0 +1,147 @@
+from http import HTTPStatus
+
+import anyio
+import httpx
+from anyio import to_thread
+from sqlalchemy import create_engine, select
+
+from crud_backend import database
+from crud_backend.database import open_session, pool_capacity, threadpool_limit
+from crud_backend.main import app
+from crud_backend.models.registry import table_registry
+from crud_backend.pool import TimedQueuePool, pool_status
+
+
+def test_readiness_reports_pool_status(app_client):
+    res = app_client.get("/health/ready")
+
+    assert res.status_code == HTTPStatus.OK
+    assert res.json()["status"] == "ready"
+    assert res.json()["threadpool_limit"] == threadpool_limit()
+    assert set(res.json()["pool"]) == {
+        "size",
+        "checked_out",
+        "idle",
+        "overflow",
+        "checkouts",
+        "checkout_wait_seconds",
+    }
+
+
+def test_timed_queue_pool_counts_checkouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+    )
+
+    with engine.connect():
+        with engine.connect():
+            status = pool_status(engine.pool)
+
+    assert status["checked_out"] == 2
+    assert status["overflow"] == 1
+    assert status["checkouts"] == 2
+    assert status["checkout_wait_seconds"] >= 0
+
+    status = pool_status(engine.pool)
+
+    assert status["checked_out"] == 0
+    assert status["idle"] == 1
+
+    engine.dispose()
+
+
+def test_sync_sessions_beyond_pool_capacity_wait_without_threads(tmp_path, monkeypatch):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        connect_args={"check_same_thread": False},
+        poolclass=TimedQueuePool,
+        pool_size=2,
+        max_overflow=0,
+        pool_timeout=1,
+    )
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "async_engine", None)
+    monkeypatch.setattr(database.settings, "DATABASE_POOL_SIZE", 2)
+    monkeypatch.setattr(database.settings, "DATABASE_MAX_OVERFLOW", 0)
+    finished = []
+
+    async def request(number):
+        async with open_session() as session:
+            await session.execute(select(1))
+            await anyio.sleep(0.1)
+            await session.commit()
+        finished.append(number)
+
+    async def scenario():
+        # Tantas threads quanto conexões, e o dobro de requisições
+        to_thread.current_default_thread_limiter().total_tokens = 2
+        async with anyio.create_task_group() as task_group:
+            for number in range(4):
+                task_group.start_soon(request, number)
+
+    anyio.run(scenario)
+
+    assert sorted(finished) == [0, 1, 2, 3]
+    assert engine.pool.checkout_wait < 1
+
+
+def test_requests_beyond_pool_capacity_all_complete(tmp_path, monkeypatch):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        connect_args={"check_same_thread": False},
+        poolclass=TimedQueuePool,
+        pool_size=2,
+        max_overflow=0,
+        pool_timeout=1,
+    )
+    table_registry.metadata.create_all(engine)
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "async_engine", None)
+    monkeypatch.setattr(database.settings, "DATABASE_POOL_SIZE", 2)
+    monkeypatch.setattr(database.settings, "DATABASE_MAX_OVERFLOW", 0)
+    monkeypatch.setattr(database.settings, "THREADPOOL_LIMIT", None)
+    statuses = []
+
+    async def request(client):
+        statuses.append((await client.get("/clients/")).status_code)
+
+    async def scenario():
+        to_thread.current_default_thread_limiter().total_tokens = threadpool_limit()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            async with anyio.create_task_group() as task_group:
+                for _ in range(8):
+                    task_group.start_soon(request, client)
+
+    anyio.run(scenario)
+
+    assert threadpool_limit() > pool_capacity()
+    assert statuses == [HTTPStatus.OK] * 8
+    assert engine.pool.checkout_wait < 1
+
+
+def test_unused_sync_session_does_not_hold_a_connection(tmp_path, monkeypatch):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        connect_args={"check_same_thread": False},
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=1,
+    )
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "async_engine", None)
+    monkeypatch.setattr(database.settings, "DATABASE_POOL_SIZE", 1)
+    monkeypatch.setattr(database.settings, "DATABASE_MAX_OVERFLOW", 0)
+
+    async def scenario():
+        # Como nas rotas que recebem a sessão e a fábrica, mas só usam uma delas
+        async with open_session(), open_session() as session:
+            return await session.scalar(select(1))
+
+    assert anyio.run(scenario) == 1
@@ -0,0 +1,108 @@
+from http import HTTPStatus
+
+from sqlalchemy import update
+
+from tests.conftest import TaskFactory
+from crud_backend.models.tasks import Task
+
+# Sem compressão negociada a ETag segue forte
+IDENTITY = {"Accept-Encoding": "identity"}
+
+
+def test_read_client_sends_validators(app_client, client):
+    res = app_client.get(f"/clients/{client.id}", headers=IDENTITY)
+
+    assert res.headers["etag"].startswith('"')
+    assert res.headers["cache-control"] == "private, no-cache"
+    assert res.headers["last-modified"].endswith(" GMT")
+
+
+def test_read_client_not_modified(app_client, client):
+    etag = app_client.get(f"/clients/{client.id}").headers["etag"]
+
+    res = app_client.get(f"/clients/{client.id}", headers={"If-None-Match": etag})
+
+    assert res.status_code == HTTPStatus.NOT_MODIFIED
+    assert res.content == b""
+    assert res.headers["etag"] == etag
+
+
+def test_read_project_accepts_weak_and_listed_etags(app_client, client, project):
+    url = f"/clients/{client.id}/projects/{project.id}"
+    etag = app_client.get(url, headers=IDENTITY).headers["etag"]
+
+    res = app_client.get(
+        url, headers={**IDENTITY, "If-None-Match": f'"other", W/{etag}'}
+    )
+
+    assert res.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_read_task_changes_etag_after_update(session, app_client, project, task):
+    url = f"/projects/{project.id}/tasks/{task.id}"
+    etag = app_client.get(url).headers["etag"]
+
+    session.execute(update(Task).values(updated_at=task.updated_at.replace(year=2030)))
+    session.commit()
+    res = app_client.get(url, headers={"If-None-Match": etag})
+
+    assert res.status_code == HTTPStatus.OK
+    assert res.headers["etag"] != etag
+
+
+def test_list_tasks_not_modified_uses_only_metadata(
+    session, app_client, project, captured_statements
+):
+    session.bulk_save_objects(TaskFactory.create_batch(3, project_id=project.id))
+    session.commit()
+    url = f"/projects/{project.id}/tasks/?limit=2"
+    etag = app_client.get(url).headers["etag"]
+    captured_statements.clear()
+
+    res = app_client.get(url, headers={"If-None-Match": etag})
+
+    assert res.status_code == HTTPStatus.NOT_MODIFIED
+    assert len(captured_statements) == 1
+    assert "LIMIT" not in captured_statements[0][0]
+
+
+def test_list_tasks_etag_depends_on_page_and_contents(session, app_client, project):
+    session.bulk_save_objects(TaskFactory.create_batch(3, project_id=project.id))
+    session.commit()
+    url = f"/projects/{project.id}/tasks/"
+
+    first = app_client.get(f"{url}?limit=2").headers["etag"]
+    other_page = app_client.get(f"{url}?limit=2&offset=2").headers["etag"]
+    session.bulk_save_objects(TaskFactory.create_batch(1, project_id=project.id))
+    session.commit()
+    res = app_client.get(f"{url}?limit=2", headers={"If-None-Match": first})
+
+    assert first != other_page
+    assert res.status_code == HTTPStatus.OK
+    assert len(res.json()["tasks"]) == 2
+    assert res.headers["etag"] != first
+
+
+def test_list_projects_not_modified(app_client, client, project):
+    url = f"/clients/{client.id}/projects/"
+    etag = app_client.get(url).headers["etag"]
+
+    res = app_client.get(url, headers={"If-None-Match": etag})
+
+    assert res.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_list_projects_conditional_client_not_found(app_client):
+    res = app_client.get("/clients/9/projects/", headers={"If-None-Match": '"x"'})
+
+    assert res.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_list_without_total_has_no_etag(app_client, project):
+    res = app_client.get(
+        f"/projects/{project.id}/tasks/?include_total=false",
+        headers={"If-None-Match": "*"},
+    )
+
+    assert res.status_code == HTTPStatus.OK
+    assert "etag" not in res.headers
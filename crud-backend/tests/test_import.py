@@ -0,0 +1,188 @@
+import io
+import json
+from http import HTTPStatus
+
+from sqlalchemy import func, select
+
+from crud_backend import importer
+from crud_backend.importer import import_rows
+from crud_backend.models.projects import Project
+from crud_backend.models.tasks import Task, TaskStatus
+from crud_backend.schemas.schemas import ExportFormat
+from crud_backend.schemas.tasks import TaskSchema
+
+CSV_TASKS = (
+    "title,description,status,assigned_to\r\n"
+    "Task 1,First,pending,Ana\r\n"
+    "Task 2,Second,unknown,Bia\r\n"
+    "Task 3,Third,doing,Caio\r\n"
+)
+
+
+def _ndjson(rows):
+    return "".join(json.dumps(row) + "\n" for row in rows)
+
+
+def test_import_tasks_csv(session, app_client, project):
+    res = app_client.post(
+        f"/projects/{project.id}/tasks/import?format=csv",
+        files={"file": ("tasks.csv", CSV_TASKS, "text/csv")},
+    )
+
+    assert res.status_code == HTTPStatus.CREATED
+    report = res.json()
+    assert report["imported"] == 2
+    assert report["rejected"] == 1
+    assert report["errors"][0]["index"] == 2
+    assert report["errors"][0]["detail"].startswith("status:")
+    assert report["rows_per_second"] >= 0
+
+    tasks = session.scalars(select(Task).order_by(Task.id)).all()
+    assert [task.title for task in tasks] == ["Task 1", "Task 3"]
+    assert {task.project_id for task in tasks} == {project.id}
+    assert tasks[1].status == TaskStatus.doing
+
+
+def test_import_tasks_ndjson_reports_line_numbers(session, app_client, project):
+    body = _ndjson(
+        [{"title": "A", "description": "A", "status": "pending", "assigned_to": "Ana"}]
+    )
+    body += "\nnot json\n"
+    body += _ndjson([{"title": "B", "description": "B", "status": "doing"}])
+
+    res = app_client.post(
+        f"/projects/{project.id}/tasks/import",
+        files={"file": ("tasks.ndjson", body, "application/x-ndjson")},
+    )
+
+    report = res.json()
+    assert report["imported"] == 1
+    assert [error["index"] for error in report["errors"]] == [3, 4]
+    assert report["errors"][1]["detail"] == "assigned_to: Field required"
+
+
+def test_import_csv_accepts_byte_order_mark(session, app_client, project):
+    res = app_client.post(
+        f"/projects/{project.id}/tasks/import?format=csv",
+        files={"file": ("tasks.csv", "\ufeff" + CSV_TASKS, "text/csv")},
+    )
+
+    assert res.json()["imported"] == 2
+
+
+def test_import_tasks_project_not_found(app_client):
+    res = app_client.post(
+        "/projects/10/tasks/import",
+        files={"file": ("tasks.ndjson", "", "application/x-ndjson")},
+    )
+
+    assert res.status_code == HTTPStatus.NOT_FOUND
+    assert res.json() == {"detail": "Project not found"}
+
+
+def test_import_tasks_project_deleted_after_cached(
+    session, app_client, client, project, foreign_keys
+):
+    url = f"/projects/{project.id}/tasks/import"
+    empty = {"file": ("tasks.ndjson", "", "application/x-ndjson")}
+    app_client.post(url, files=empty)
+    session.delete(project)
+    session.commit()
+    body = _ndjson(
+        [{"title": "A", "description": "A", "status": "pending", "assigned_to": "Ana"}]
+    )
+
+    res = app_client.post(
+        url, files={"file": ("tasks.ndjson", body, "application/x-ndjson")}
+    )
+
+    assert res.status_code == HTTPStatus.NOT_FOUND
+    assert res.json() == {"detail": "Project not found"}
+    assert app_client.post(url, files=empty).status_code == HTTPStatus.NOT_FOUND
+
+
+def test_import_projects_ndjson(session, app_client, client):
+    body = _ndjson(
+        {"title": f"Project {i}", "description": "Imported", "status": "doing"}
+        for i in range(3)
+    )
+
+    res = app_client.post(
+        f"/clients/{client.id}/projects/import",
+        files={"file": ("projects.ndjson", body, "application/x-ndjson")},
+    )
+
+    assert res.status_code == HTTPStatus.CREATED
+    assert res.json()["imported"] == 3
+    assert (
+        session.scalar(select(func.count()).where(Project.client_id == client.id)) == 3
+    )
+
+
+def test_import_projects_client_not_found(app_client):
+    res = app_client.post(
+        "/clients/10/projects/import",
+        files={"file": ("projects.ndjson", "", "application/x-ndjson")},
+    )
+
+    assert res.status_code == HTTPStatus.NOT_FOUND
+    assert res.json() == {"detail": "Client not found"}
+
+
+def test_import_rows_writes_in_chunks(
+    session, project, monkeypatch, captured_statements
+):
+    monkeypatch.setattr(importer, "IMPORT_CHUNK_SIZE", 10)
+    rows = (
+        {"title": f"T{i}", "description": "D", "status": "paused", "assigned_to": "X"}
+        for i in range(25)
+    )
+
+    report = import_rows(
+        session,
+        io.StringIO(_ndjson(rows)),
+        ExportFormat.ndjson,
+        TaskSchema,
+        Task.__table__,
+        {"project_id": project.id},
+    )
+
+    assert report.imported == 25
+    inserts = [sql for sql, _ in captured_statements if sql.startswith("INSERT")]
+    assert len(inserts) == 3
+    assert session.scalar(select(func.count()).select_from(Task)) == 25
+
+
+def test_import_rows_caps_reported_errors(session, project, monkeypatch):
+    monkeypatch.setattr(importer, "IMPORT_MAX_ERRORS", 2)
+
+    report = import_rows(
+        session,
+        io.StringIO("{}\n" * 5),
+        ExportFormat.ndjson,
+        TaskSchema,
+        Task.__table__,
+        {"project_id": project.id},
+    )
+
+    assert report.rejected == 5
+    assert len(report.errors) == 2
+
+
+def test_import_projects_client_deleted_after_cached(
+    session, app_client, client, foreign_keys
+):
+    url = f"/clients/{client.id}/projects/import"
+    empty = {"file": ("projects.ndjson", "", "application/x-ndjson")}
+    app_client.post(url, files=empty)
+    session.delete(client)
+    session.commit()
+    body = _ndjson([{"title": "A", "description": "A", "status": "doing"}])
+
+    res = app_client.post(
+        url, files={"file": ("projects.ndjson", body, "application/x-ndjson")}
+    )
+
+    assert res.status_code == HTTPStatus.NOT_FOUND
+    assert res.json() == {"detail": "Client not found"}
+    assert app_client.post(url, files=empty).status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,80 @@
+import pytest
+
+from tests.conftest import ProjectFactory, TaskFactory
+
+
+def _query_plan(session, statements, table):
+    statement, parameters = next(
+        (statement, parameters)
+        for statement, parameters in statements
+        if statement.startswith("SELECT") and f"FROM {table}" in statement
+    )
+    plan = session.connection().exec_driver_sql(
+        f"EXPLAIN QUERY PLAN {statement}", parameters
+    )
+    return " ".join(row[-1] for row in plan)
+
+
+@pytest.mark.parametrize(
+    ("query_string", "index"),
+    [
+        ("", "ix_tasks_project_id_id"),
+        ("?status=doing", "ix_tasks_project_id_status_id"),
+    ],
+)
+def test_list_tasks_uses_project_index(
+    session, app_client, captured_statements, project, query_string, index
+):
+    session.bulk_save_objects(TaskFactory.create_batch(5, project_id=project.id))
+    session.commit()
+    captured_statements.clear()
+
+    app_client.get(f"/projects/{project.id}/tasks/{query_string}")
+
+    assert index in _query_plan(session, captured_statements, "tasks")
+
+
+def test_list_tasks_last_modified_uses_updated_at_index(
+    session, app_client, captured_statements, project
+):
+    session.bulk_save_objects(TaskFactory.create_batch(5, project_id=project.id))
+    session.commit()
+    captured_statements.clear()
+
+    app_client.get(f"/projects/{project.id}/tasks/")
+
+    plan = _query_plan(session, captured_statements, "tasks")
+    assert "ix_tasks_project_id_updated_at" in plan
+
+
+@pytest.mark.parametrize(
+    ("query_string", "index"),
+    [
+        ("", "ix_projects_client_id_id"),
+        ("?status=doing", "ix_projects_client_id_status_id"),
+    ],
+)
+def test_list_projects_uses_client_index(
+    session, app_client, captured_statements, client, query_string, index
+):
+    session.bulk_save_objects(ProjectFactory.create_batch(5, client_id=client.id))
+    session.commit()
+    captured_statements.clear()
+
+    app_client.get(f"/clients/{client.id}/projects/{query_string}")
+
+    assert index in _query_plan(session, captured_statements, "projects")
+
+
+def test_list_tasks_title_filter_uses_trigram_index(
+    session, app_client, captured_statements, project
+):
+    session.bulk_save_objects(TaskFactory.create_batch(5, project_id=project.id))
+    session.commit()
+    captured_statements.clear()
+
+    app_client.get(f"/projects/{project.id}/tasks/?title=task")
+
+    plan = _query_plan(session, captured_statements, "tasks")
+
+    assert "SCAN tasks_fts VIRTUAL TABLE INDEX 0:L" in plan
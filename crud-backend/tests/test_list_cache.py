@@ -0,0 +1,194 @@
+from http import HTTPStatus
+
+import pytest
+
+from crud_backend.entity_cache import MemoryBackend
+from crud_backend.list_cache import ListCache, get_list_cache
+from crud_backend.main import app
+from crud_backend.models.tasks import Task
+
+TASK = {
+    "title": "Task",
+    "description": "Task",
+    "status": "pending",
+    "assigned_to": "Ana",
+}
+
+
+@pytest.fixture
+def now():
+    return [0.0]
+
+
+@pytest.fixture
+def list_cache(app_client, now):
+    cache = ListCache(
+        MemoryBackend(),
+        max_bytes=1024 * 1024,
+        ttl=10,
+        stale_ttl=60,
+        clock=lambda: now[0],
+    )
+    app.dependency_overrides[get_list_cache] = lambda: cache
+    return cache
+
+
+def test_repeated_list_is_served_without_queries(
+    app_client, list_cache, project, captured_statements
+):
+    url = f"/projects/{project.id}/tasks/?limit=5"
+    app_client.post(f"/projects/{project.id}/tasks/", json=TASK)
+    first = app_client.get(url)
+    captured_statements.clear()
+
+    res = app_client.get(url)
+
+    assert res.status_code == HTTPStatus.OK
+    assert res.content == first.content
+    assert res.headers["etag"] == first.headers["etag"]
+    assert captured_statements == []
+
+
+def test_cached_list_answers_if_none_match(
+    app_client, list_cache, project, captured_statements
+):
+    url = f"/projects/{project.id}/tasks/"
+    etag = app_client.get(url).headers["etag"]
+    captured_statements.clear()
+
+    res = app_client.get(url, headers={"If-None-Match": etag})
+
+    assert res.status_code == HTTPStatus.NOT_MODIFIED
+    assert res.headers["etag"] == etag
+    assert captured_statements == []
+
+
+def test_filters_are_cached_separately(app_client, list_cache, project):
+    url = f"/projects/{project.id}/tasks/"
+    app_client.post(url, json=TASK)
+    app_client.post(url, json={**TASK, "status": "doing"})
+
+    everything = app_client.get(url).json()
+    doing = app_client.get(url, params={"status": "doing"}).json()
+
+    assert everything["total"] == 2
+    assert doing["total"] == 1
+
+
+@pytest.mark.parametrize(
+    ("method", "path", "kwargs"),
+    [
+        ("POST", "", {"json": TASK}),
+        ("POST", "bulk", {"json": [TASK]}),
+        ("PATCH", "1", {"json": {"title": "Changed"}}),
+        ("DELETE", "1", {}),
+        ("PATCH", "bulk", {"json": {"where": {"ids": [1]}, "values": {"title": "C"}}}),
+        ("DELETE", "bulk", {"json": {"ids": [1]}}),
+    ],
+)
+def test_task_writes_bump_generation(
+    app_client, list_cache, project, method, path, kwargs
+):
+    url = f"/projects/{project.id}/tasks/"
+    app_client.post(url, json=TASK)
+    before = app_client.get(url).json()
+
+    res = app_client.request(method, url + path, **kwargs)
+    assert res.status_code < HTTPStatus.BAD_REQUEST
+
+    assert app_client.get(url).json() != before
+
+
+def test_moving_tasks_bumps_target_project(app_client, list_cache, client, project):
+    other = app_client.post(
+        f"/clients/{client.id}/projects/",
+        json={"title": "Other", "description": "Other", "status": "pending"},
+    ).json()
+    app_client.post(f"/projects/{project.id}/tasks/", json=TASK)
+    target_url = f"/projects/{other['id']}/tasks/"
+    assert app_client.get(target_url).json()["total"] == 0
+
+    app_client.patch(
+        f"/projects/{project.id}/tasks/bulk",
+        json={"where": {"ids": [1]}, "project_id": other["id"]},
+    )
+
+    assert app_client.get(target_url).json()["total"] == 1
+
+
+def test_project_writes_bump_generation(app_client, list_cache, client):
+    url = f"/clients/{client.id}/projects/"
+    project = {"title": "P", "description": "P", "status": "pending"}
+    assert app_client.get(url).json()["total"] == 0
+
+    app_client.post(url, json=project)
+    assert app_client.get(url).json()["total"] == 1
+
+    app_client.patch(url + "1", json={"title": "Renamed"})
+    assert app_client.get(url).json()["projects"][0]["title"] == "Renamed"
+
+    app_client.delete(url + "1")
+    assert app_client.get(url).json()["total"] == 0
+
+
+def test_stale_entry_is_served_and_refreshed(
+    app_client, list_cache, now, session, project
+):
+    url = f"/projects/{project.id}/tasks/"
+    project_id = project.id
+    assert app_client.get(url).json()["total"] == 0
+
+    # Escrita fora das rotas: só o TTL a percebe
+    session.add(Task(**TASK, project_id=project_id))
+    session.commit()
+    now[0] = 15.0
+
+    stale = app_client.get(url)
+    fresh = app_client.get(url)
+
+    assert stale.json()["total"] == 0
+    assert fresh.json()["total"] == 1
+    assert list_cache.stats()["endpoints"]["list_tasks"] == {
+        "hits": 1,
+        "stale_hits": 1,
+        "misses": 1,
+        "hit_ratio": pytest.approx(2 / 3),
+    }
+
+
+def test_expired_entry_is_reloaded(app_client, list_cache, now, project):
+    url = f"/projects/{project.id}/tasks/"
+    app_client.get(url)
+    now[0] = 70.0
+
+    app_client.get(url)
+
+    assert list_cache.stats()["endpoints"]["list_tasks"]["misses"] == 2
+
+
+def test_memory_is_bounded(app_client, list_cache, project):
+    url = f"/projects/{project.id}/tasks/"
+    list_cache.max_bytes = len(app_client.get(url).content) * 2
+
+    app_client.get(url, params={"limit": 5})
+    app_client.get(url, params={"limit": 6})
+
+    stats = list_cache.stats()
+    assert stats["entries"] == 2
+    assert stats["bytes"] <= list_cache.max_bytes
+
+
+def test_readiness_reports_hit_ratio_per_endpoint(
+    app_client, list_cache, client, project
+):
+    for _ in range(2):
+        app_client.get(f"/clients/{client.id}/projects/")
+        app_client.get(f"/projects/{project.id}/tasks/")
+
+    stats = app_client.get("/health/ready").json()["list_cache"]
+
+    assert stats["entries"] == 2
+    assert stats["endpoints"] == {
+        endpoint: {"hits": 1, "stale_hits": 0, "misses": 1, "hit_ratio": 0.5}
+        for endpoint in ("list_projects", "list_tasks")
+    }
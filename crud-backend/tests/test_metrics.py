@@ -0,0 +1,111 @@
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import Engine, event
+
+from crud_backend.metrics import (
+    Histogram,
+    after_cursor_execute,
+    before_cursor_execute,
+    instrument_engine,
+)
+
+
+@pytest.fixture
+def instrumented_engines():
+    """Mede os comandos de todos os engines, inclusive os criados pelos testes."""
+    instrument_engine(Engine)
+
+    yield
+
+    event.remove(Engine, "before_cursor_execute", before_cursor_execute)
+    event.remove(Engine, "after_cursor_execute", after_cursor_execute)
+
+
+def _sample(app_client, series):
+    """Valor atual de uma série em /metrics, ou 0 se ela ainda não existe."""
+    res = app_client.get("/metrics")
+    for line in res.text.splitlines():
+        name, _, value = line.rpartition(" ")
+        if name == series:
+            return float(value)
+    return 0
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("demo_seconds", "Demo.", ("route",), (0.1, 1.0))
+
+    histogram.observe(("/a",), 0.05, 0.1, 0.5, 3)
+
+    assert list(histogram.render()) == [
+        "# HELP demo_seconds Demo.",
+        "# TYPE demo_seconds histogram",
+        'demo_seconds_bucket{route="/a",le="0.1"} 2',
+        'demo_seconds_bucket{route="/a",le="1.0"} 3',
+        'demo_seconds_bucket{route="/a",le="+Inf"} 4',
+        'demo_seconds_sum{route="/a"} 3.65',
+        'demo_seconds_count{route="/a"} 4',
+    ]
+
+
+def test_metrics_endpoint_uses_prometheus_text_format(app_client):
+    res = app_client.get("/metrics")
+
+    assert res.status_code == HTTPStatus.OK
+    assert res.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE http_request_duration_seconds histogram" in res.text
+    assert 'db_pool_connections{pool="primary",state="idle"}' in res.text
+
+
+def test_request_latency_by_route_template_and_status(app_client, project, task):
+    series = (
+        "http_request_duration_seconds_count"
+        '{method="GET",route="/projects/{project_id}/tasks/{task_id}",status="%s"}'
+    )
+    before = _sample(app_client, series % 200), _sample(app_client, series % 404)
+
+    app_client.get(f"/projects/{task.project_id}/tasks/{task.id}")
+    app_client.get(f"/projects/{task.project_id}/tasks/999")
+
+    after = _sample(app_client, series % 200), _sample(app_client, series % 404)
+    assert (after[0] - before[0], after[1] - before[1]) == (1, 1)
+
+
+def test_unmatched_paths_share_one_series(app_client):
+    series = (
+        'http_request_duration_seconds_count{method="GET",route="<unmatched>",'
+        'status="404"}'
+    )
+    before = _sample(app_client, series)
+
+    app_client.get("/nope/1")
+    app_client.get("/nope/2")
+
+    assert _sample(app_client, series) - before == 2
+
+
+def test_statements_are_attributed_to_route(
+    app_client, project, instrumented_engines, captured_statements
+):
+    labels = '{method="GET",route="/projects/{project_id}/tasks/"}'
+    before = _sample(app_client, f"db_statement_duration_seconds_count{labels}")
+
+    captured_statements.clear()
+    app_client.get(f"/projects/{project.id}/tasks/")
+    executed = len(captured_statements)
+
+    after = _sample(app_client, f"db_statement_duration_seconds_count{labels}")
+    assert executed > 0
+    assert after - before == executed
+
+
+def test_serialization_time_is_recorded(app_client, project, task):
+    series = (
+        'serialization_duration_seconds_count{method="GET",'
+        'route="/projects/{project_id}/tasks/{task_id}"}'
+    )
+    before = _sample(app_client, series)
+
+    app_client.get(f"/projects/{task.project_id}/tasks/{task.id}")
+
+    assert _sample(app_client, series) - before == 1
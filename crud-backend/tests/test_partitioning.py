@@ -0,0 +1,211 @@
+import json
+import os
+import subprocess
+import sys
+from contextlib import nullcontext
+from datetime import date
+from functools import partial
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from crud_backend.database import (
+    ThreadedSession,
+    get_session,
+    get_session_factory,
+)
+from crud_backend.entity_cache import MemoryBackend
+from crud_backend.list_cache import ListCache, get_list_cache
+from crud_backend.main import app
+from crud_backend.models.registry import table_registry
+from crud_backend.models.stats import stats_ddl
+from crud_backend.models.tasks import Task
+from crud_backend.partitioning import create_partitions, partition_bounds
+from tests.conftest import ClientFactory, ProjectFactory, TaskFactory
+
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+HASH_PARTITIONS = 4
+
+
+def test_hash_bounds_cover_every_remainder():
+    bounds = partition_bounds("tasks", "hash", 4, date.today(), date.today())
+
+    assert bounds == {
+        f"tasks_p0{remainder}": f"FOR VALUES WITH (MODULUS 4, REMAINDER {remainder})"
+        for remainder in range(4)
+    }
+
+
+def test_range_bounds_are_monthly_across_years():
+    bounds = partition_bounds("tasks", "range", 4, date(2026, 11, 18), date(2027, 1, 1))
+
+    assert bounds == {
+        "tasks_2026_11": "FOR VALUES FROM ('2026-11-01') TO ('2026-12-01')",
+        "tasks_2026_12": "FOR VALUES FROM ('2026-12-01') TO ('2027-01-01')",
+        "tasks_2027_01": "FOR VALUES FROM ('2027-01-01') TO ('2027-02-01')",
+        "tasks_default": "DEFAULT",
+    }
+
+
+def test_create_partitions_is_noop_without_partitioning(session):
+    assert create_partitions(session.connection(), "tasks", "none", 4, 3) == []
+
+
+@pytest.mark.parametrize(
+    ("mode", "partition_by", "primary_key"),
+    [
+        ("hash", "PARTITION BY HASH (project_id)", "PRIMARY KEY (id, project_id)"),
+        ("range", "PARTITION BY RANGE (created_at)", "PRIMARY KEY (id, created_at)"),
+    ],
+)
+def test_partitioned_model_ddl(mode, partition_by, primary_key):
+    # O modo é lido na importação dos modelos, então roda em outro processo
+    script = (
+        "import json\n"
+        "from sqlalchemy.dialects import postgresql\n"
+        "from sqlalchemy.schema import CreateTable\n"
+        "from crud_backend.models import Task\n"
+        "ddl = str(CreateTable(Task.__table__).compile(dialect=postgresql.dialect()))\n"
+        "keys = [column.key for column in Task.__mapper__.primary_key]\n"
+        "print(json.dumps({'ddl': ddl, 'keys': keys}))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        env={**os.environ, "TASKS_PARTITIONING": mode},
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    output = json.loads(result.stdout)
+
+    assert partition_by in output["ddl"]
+    assert primary_key in output["ddl"]
+    # A identidade no ORM continua só pelo id
+    assert output["keys"] == ["id"]
+
+
+@pytest.fixture
+def partitioned_engine():
+    if not POSTGRES_URL:
+        pytest.skip("TEST_POSTGRES_URL não definido")
+
+    engine = create_engine(
+        POSTGRES_URL, connect_args={"options": "-csearch_path=partitioning_test"}
+    )
+    tasks = Task.__table__
+    ddl = str(CreateTable(tasks).compile(dialect=postgresql.dialect()))
+    ddl = ddl.replace("PRIMARY KEY (id)", "PRIMARY KEY (id, project_id)")
+
+    with engine.begin() as connection:
+        connection.exec_driver_sql("DROP SCHEMA IF EXISTS partitioning_test CASCADE")
+        connection.exec_driver_sql("CREATE SCHEMA partitioning_test")
+        connection.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        table_registry.metadata.create_all(
+            connection,
+            tables=[
+                table
+                for table in table_registry.metadata.sorted_tables
+                if table is not tasks
+            ],
+        )
+        connection.exec_driver_sql(f"{ddl} PARTITION BY HASH (project_id)")
+        create_partitions(connection, "tasks", "hash", HASH_PARTITIONS, 0)
+        for index in tasks.indexes:
+            connection.execute(CreateIndex(index))
+        for statement in stats_ddl("postgresql"):
+            connection.exec_driver_sql(statement)
+
+    yield engine
+
+    with engine.begin() as connection:
+        connection.exec_driver_sql("DROP SCHEMA partitioning_test CASCADE")
+    engine.dispose()
+
+
+def test_task_routes_prune_to_one_partition(partitioned_engine):
+    with Session(partitioned_engine) as session:
+        client = ClientFactory()
+        session.add(client)
+        session.flush()
+        projects = ProjectFactory.create_batch(HASH_PARTITIONS, client_id=client.id)
+        session.add_all(projects)
+        session.flush()
+        for project in projects:
+            session.execute(
+                insert(Task),
+                [
+                    {
+                        "title": task.title,
+                        "description": task.description,
+                        "status": task.status,
+                        "assigned_to": task.assigned_to,
+                        "project_id": project.id,
+                    }
+                    for task in TaskFactory.build_batch(3)
+                ],
+            )
+        session.commit()
+        project_id = projects[0].id
+        task_id = session.scalar(
+            Task.__table__.select()
+            .with_only_columns(Task.id)
+            .where(Task.project_id == project_id)
+            .limit(1)
+        )
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if " tasks" in statement and not statement.startswith("EXPLAIN"):
+            statements.append((statement, parameters))
+
+    event.listen(partitioned_engine, "before_cursor_execute", capture)
+    try:
+        with Session(partitioned_engine) as session, TestClient(app) as client:
+            list_cache = ListCache(MemoryBackend(), max_bytes=1024, ttl=0, stale_ttl=0)
+            app.dependency_overrides[get_session] = lambda: ThreadedSession(session)
+            app.dependency_overrides[get_session_factory] = lambda: partial(
+                nullcontext, ThreadedSession(session)
+            )
+            app.dependency_overrides[get_list_cache] = lambda: list_cache
+            urls = [
+                ("GET", f"/projects/{project_id}/tasks/"),
+                ("GET", f"/projects/{project_id}/tasks/?status=doing"),
+                ("GET", f"/projects/{project_id}/tasks/{task_id}"),
+                ("PATCH", f"/projects/{project_id}/tasks/{task_id}"),
+            ]
+            for method, url in urls:
+                kwargs = {"json": {"title": "New"}} if method == "PATCH" else {}
+                assert client.request(method, url, **kwargs).status_code == 200
+    finally:
+        event.remove(partitioned_engine, "before_cursor_execute", capture)
+        app.dependency_overrides.clear()
+
+    assert statements
+    with partitioned_engine.connect() as connection:
+        for statement, parameters in statements:
+            plan = connection.exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {statement}", parameters
+            ).scalar()
+            scanned = {
+                relation
+                for relation in _relations(plan)
+                if relation.startswith("tasks_p")
+            }
+            assert len(scanned) == 1, (statement, scanned)
+
+
+def _relations(node):
+    """Tabelas lidas em qualquer nível do plano em JSON."""
+    if isinstance(node, list):
+        for item in node:
+            yield from _relations(item)
+    elif isinstance(node, dict):
+        if "Relation Name" in node:
+            yield node["Relation Name"]
+        for value in node.values():
+            yield from _relations(value)
@@ -39,6 +39,31 @@ def test_create_project_client_not_found(app_client):
     assert res.json() == {"detail": "Client not found"}
 
 
+def test_create_projects_bulk(app_client, client):
+    res = app_client.post(
+        f"/clients/{client.id}/projects/bulk",
+        json=[
+            {"title": f"Project {i}", "description": "Bulk", "status": "pending"}
+            for i in range(3)
+        ],
+    )
+
+    assert res.status_code == HTTPStatus.CREATED
+    assert [p["title"] for p in res.json()["created"]] == [
+        "Project 0",
+        "Project 1",
+        "Project 2",
+    ]
+    assert "errors" not in res.json()
+
+
+def test_create_projects_bulk_client_not_found(app_client):
+    res = app_client.post("/clients/4/projects/bulk", json=[])
+
+    assert res.status_code == HTTPStatus.NOT_FOUND
+    assert res.json() == {"detail": "Client not found"}
+
+
 def test_list_projects_should_return_5_projects(session, app_client, client):
     expected_projects = 5
     session.bulk_save_objects(ProjectFactory.create_batch(5, client_id=client.id))
@@ -60,6 +85,27 @@ def test_list_projects_pagination_should_return_2_projects(session, app_client,
     assert len(res.json()["projects"]) == expected_projects
 
 
+def test_list_projects_total_ignores_pagination(session, app_client, client):
+    session.bulk_save_objects(ProjectFactory.create_batch(5, client_id=client.id))
+    session.commit()
+
+    res = app_client.get(f"clients/{client.id}/projects/?offset=1&limit=2")
+    past_end = app_client.get(f"clients/{client.id}/projects/?offset=10")
+
+    assert res.json()["total"] == 5
+    assert past_end.json()["total"] == 5
+
+
+def test_list_projects_include_total_false(session, app_client, client):
+    session.bulk_save_objects(ProjectFactory.create_batch(2, client_id=client.id))
+    session.commit()
+
+    res = app_client.get(f"clients/{client.id}/projects/?include_total=false")
+
+    assert res.json()["total"] is None
+    assert len(res.json()["projects"]) == 2
+
+
 def test_list_projects_filter_title_should_return_5_projects(
     session, app_client, client
 ):
@@ -218,3 +264,12 @@ def test_delete_project_not_found(app_client, client):
 
     assert res.status_code == HTTPStatus.NOT_FOUND
     assert res.json() == {"detail": "Project not found"}
+
+
+def test_delete_project_with_tasks_conflict(app_client, client, project, task):
+    res = app_client.delete(f"clients/{client.id}/projects/{project.id}")
+
+    assert res.status_code == HTTPStatus.CONFLICT
+    assert res.json() == {"detail": "Project has tasks"}
+    res = app_client.get(f"clients/{client.id}/projects/{project.id}")
+    assert res.status_code == HTTPStatus.OK
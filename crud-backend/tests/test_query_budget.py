@@ -0,0 +1,92 @@
+from http import HTTPStatus
+
+import pytest
+
+CLIENT = {"company": "Budget", "email": "budget@test.com", "phone": "123"}
+PROJECT = {"title": "Budget", "description": "Budget", "status": "pending"}
+TASK = {
+    "title": "Budget",
+    "description": "Budget",
+    "status": "pending",
+    "assigned_to": "TI",
+}
+
+
+@pytest.mark.parametrize(
+    ("method", "path", "body", "status"),
+    [
+        ("POST", "/clients/", CLIENT, HTTPStatus.CREATED),
+        ("POST", "/clients/bulk", [CLIENT] * 3, HTTPStatus.CREATED),
+        ("GET", "/clients/", None, HTTPStatus.OK),
+        ("GET", "/clients/1", None, HTTPStatus.OK),
+        ("GET", "/clients/1?expand=projects.tasks", None, HTTPStatus.OK),
+        ("GET", "/clients/?expand=projects.tasks", None, HTTPStatus.OK),
+        ("GET", "/clients/9", None, HTTPStatus.NOT_FOUND),
+        ("GET", "/clients/1/summary", None, HTTPStatus.OK),
+        ("GET", "/clients/9/summary", None, HTTPStatus.NOT_FOUND),
+        ("PATCH", "/clients/1", CLIENT, HTTPStatus.OK),
+        ("PATCH", "/clients/9", CLIENT, HTTPStatus.NOT_FOUND),
+        ("DELETE", "/clients/9", None, HTTPStatus.NOT_FOUND),
+        ("POST", "/clients/1/projects/", PROJECT, HTTPStatus.CREATED),
+        ("POST", "/clients/1/projects/bulk", [PROJECT] * 3, HTTPStatus.CREATED),
+        ("POST", "/clients/9/projects/", PROJECT, HTTPStatus.NOT_FOUND),
+        ("GET", "/clients/1/projects/", None, HTTPStatus.OK),
+        ("GET", "/clients/9/projects/", None, HTTPStatus.NOT_FOUND),
+        ("GET", "/clients/1/projects/1", None, HTTPStatus.OK),
+        ("GET", "/clients/1/projects/1?expand=tasks", None, HTTPStatus.OK),
+        ("GET", "/clients/1/projects/?expand=tasks", None, HTTPStatus.OK),
+        ("GET", "/clients/1/projects/?include_archived=true", None, HTTPStatus.OK),
+        ("GET", "/clients/1/projects/9", None, HTTPStatus.NOT_FOUND),
+        ("GET", "/clients/9/projects/1", None, HTTPStatus.NOT_FOUND),
+        ("GET", "/clients/1/projects/1/stats", None, HTTPStatus.OK),
+        ("GET", "/clients/1/projects/9/stats", None, HTTPStatus.NOT_FOUND),
+        ("PATCH", "/clients/1/projects/1", {"title": "New"}, HTTPStatus.OK),
+        ("PATCH", "/clients/1/projects/1", {}, HTTPStatus.OK),
+        ("PATCH", "/clients/1/projects/9", {"title": "New"}, HTTPStatus.NOT_FOUND),
+        ("PATCH", "/clients/9/projects/1", {"title": "New"}, HTTPStatus.NOT_FOUND),
+        ("DELETE", "/clients/1/projects/9", None, HTTPStatus.NOT_FOUND),
+        ("DELETE", "/clients/9/projects/1", None, HTTPStatus.NOT_FOUND),
+        ("POST", "/projects/1/tasks/", TASK, HTTPStatus.CREATED),
+        ("POST", "/projects/1/tasks/bulk", [TASK] * 3, HTTPStatus.CREATED),
+        ("POST", "/projects/9/tasks/", TASK, HTTPStatus.NOT_FOUND),
+        ("GET", "/projects/1/tasks/", None, HTTPStatus.OK),
+        (
+            "PATCH",
+            "/projects/1/tasks/bulk",
+            {"where": {"ids": [1]}, "values": {"status": "doing"}},
+            HTTPStatus.OK,
+        ),
+        ("DELETE", "/projects/1/tasks/bulk", {"ids": [1]}, HTTPStatus.OK),
+        ("GET", "/projects/1/tasks/?status=paused", None, HTTPStatus.OK),
+        ("GET", "/projects/1/tasks/?include_archived=true", None, HTTPStatus.OK),
+        ("GET", "/projects/9/tasks/?include_archived=true", None, HTTPStatus.NOT_FOUND),
+        ("GET", "/projects/9/tasks/", None, HTTPStatus.NOT_FOUND),
+        ("GET", "/projects/1/tasks/1", None, HTTPStatus.OK),
+        ("GET", "/projects/1/tasks/9", None, HTTPStatus.NOT_FOUND),
+        ("GET", "/projects/9/tasks/1", None, HTTPStatus.NOT_FOUND),
+        ("PATCH", "/projects/1/tasks/1", {"title": "New"}, HTTPStatus.OK),
+        ("PATCH", "/projects/1/tasks/9", {"title": "New"}, HTTPStatus.NOT_FOUND),
+        ("PATCH", "/projects/9/tasks/1", {"title": "New"}, HTTPStatus.NOT_FOUND),
+        ("DELETE", "/projects/1/tasks/1", None, HTTPStatus.OK),
+        ("DELETE", "/projects/1/tasks/9", None, HTTPStatus.NOT_FOUND),
+        ("DELETE", "/projects/9/tasks/1", None, HTTPStatus.NOT_FOUND),
+    ],
+)
+def test_endpoint_stays_within_query_budget(
+    budgeted_request, client, project, task, method, path, body, status
+):
+    res = budgeted_request(method, path, json=body)
+
+    assert res.status_code == status
+
+
+def test_delete_client_stays_within_query_budget(budgeted_request, client):
+    res = budgeted_request("DELETE", f"/clients/{client.id}")
+
+    assert res.status_code == HTTPStatus.OK
+
+
+def test_delete_project_stays_within_query_budget(budgeted_request, client, project):
+    res = budgeted_request("DELETE", f"/clients/{client.id}/projects/{project.id}")
+
+    assert res.status_code == HTTPStatus.OK
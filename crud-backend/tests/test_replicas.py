@@ -0,0 +1,200 @@
+import time
+from http import HTTPStatus
+from itertools import count
+
+import anyio
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from crud_backend import database
+from crud_backend.entity_cache import EntityCache, MemoryBackend, get_entity_cache
+from crud_backend.list_cache import ListCache, get_list_cache
+from crud_backend.main import app
+from crud_backend.models.registry import table_registry
+from crud_backend.replicas import PIN_COOKIE, Replica, ReplicaSet
+from tests.conftest import ClientFactory, ProjectFactory
+
+
+def _replica_engine(path, company):
+    """Banco SQLite separado fazendo o papel de réplica, com um cliente próprio."""
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}
+    )
+    table_registry.metadata.create_all(engine)
+    with Session(engine) as session:
+        client = ClientFactory(company=company)
+        session.add(client)
+        session.flush()
+        session.add(ProjectFactory(client_id=client.id, title=company))
+        session.commit()
+    return engine
+
+
+@pytest.fixture
+def routed_client(session, client, tmp_path, monkeypatch):
+    """Cliente HTTP com as sessões reais e duas réplicas.
+
+    Cada réplica tem um cliente com o mesmo id de `client`, mas outra empresa.
+    """
+    engines = [
+        _replica_engine(tmp_path / f"replica-{index}.db", f"replica-{index}")
+        for index in range(2)
+    ]
+    cache = EntityCache(MemoryBackend(), ttl=0)
+    list_cache = ListCache(MemoryBackend(), max_bytes=1024 * 1024, ttl=0, stale_ttl=0)
+
+    # As réplicas entram depois da inicialização para não disparar o monitor
+    with TestClient(app) as http_client:
+        monkeypatch.setattr(database, "engine", session.get_bind())
+        monkeypatch.setattr(database, "async_engine", None)
+        monkeypatch.setattr(
+            database.replicas, "replicas", [Replica(engine) for engine in engines]
+        )
+        monkeypatch.setattr(database.replicas, "_turn", count())
+        app.dependency_overrides[get_entity_cache] = lambda: cache
+        app.dependency_overrides[get_list_cache] = lambda: list_cache
+
+        yield http_client
+
+    app.dependency_overrides.clear()
+    for engine in engines:
+        engine.dispose()
+
+
+@pytest.fixture
+def replicas(routed_client):
+    return database.replicas
+
+
+def _company(client, client_id):
+    return client.get(f"/clients/{client_id}").json()["company"]
+
+
+def test_reads_rotate_between_replicas(routed_client, client):
+    companies = [_company(routed_client, client.id) for _ in range(4)]
+
+    assert companies == ["replica-0", "replica-1", "replica-0", "replica-1"]
+
+
+def test_unhealthy_replica_leaves_rotation(routed_client, replicas, client):
+    replicas.replicas[0].healthy = False
+
+    assert {_company(routed_client, client.id) for _ in range(3)} == {"replica-1"}
+
+
+def test_reads_fall_back_to_primary_without_healthy_replicas(
+    routed_client, replicas, client
+):
+    for replica in replicas.replicas:
+        replica.healthy = False
+
+    assert _company(routed_client, client.id) == client.company
+
+
+def test_reads_after_write_stay_on_primary(routed_client):
+    res = routed_client.post(
+        "/clients/",
+        json={"company": "new", "email": "new@test.com", "phone": "new-phone"},
+    )
+
+    assert res.status_code == HTTPStatus.CREATED
+    assert PIN_COOKIE in res.cookies
+    assert _company(routed_client, res.json()["id"]) == "new"
+
+
+def test_expired_pin_reads_from_replica(routed_client, client):
+    routed_client.cookies.set(PIN_COOKIE, str(time.time() - 1))
+
+    assert _company(routed_client, client.id).startswith("replica-")
+
+
+def test_failed_write_does_not_pin(routed_client, client):
+    res = routed_client.post(
+        "/clients/",
+        json={"company": "dup", "email": client.email, "phone": "other-phone"},
+    )
+
+    assert res.status_code == HTTPStatus.BAD_REQUEST
+    assert PIN_COOKIE not in res.cookies
+
+
+def test_streamed_export_reads_from_replica(routed_client, client):
+    res = routed_client.get(f"/clients/{client.id}/projects/export")
+
+    assert res.json()["title"].startswith("replica-")
+
+
+def test_health_check_marks_unreachable_replica(tmp_path):
+    reachable = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    unreachable = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    replicas = ReplicaSet([Replica(reachable), Replica(unreachable)])
+
+    anyio.run(replicas.check, 1.0)
+
+    assert [replica.healthy for replica in replicas.replicas] == [True, False]
+    assert [status["healthy"] for status in replicas.status()] == [True, False]
+    assert replicas.choose() is replicas.replicas[0]
+
+
+def test_readiness_ignores_unhealthy_replica(routed_client, replicas):
+    replicas.replicas[0].healthy = False
+
+    res = routed_client.get("/health/ready")
+
+    assert res.status_code == HTTPStatus.OK
+    assert [replica["healthy"] for replica in res.json()["replicas"]] == [False, True]
+
+
+def test_readiness_pings_primary_not_replica(routed_client, tmp_path, monkeypatch):
+    unreachable = create_engine(f"sqlite:///{tmp_path / 'missing' / 'primary.db'}")
+    monkeypatch.setattr(database, "engine", unreachable)
+
+    res = routed_client.get("/health/ready")
+
+    assert res.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+
+
+@pytest.fixture
+def cached_lists(routed_client):
+    list_cache = ListCache(
+        MemoryBackend(), max_bytes=1024 * 1024, ttl=60, stale_ttl=0, replica_lag=60
+    )
+    app.dependency_overrides[get_list_cache] = lambda: list_cache
+    return list_cache
+
+
+def test_list_cache_misses_read_from_replica(routed_client, cached_lists, client):
+    url = f"/clients/{client.id}/projects/"
+
+    titles = [
+        [project["title"] for project in routed_client.get(url).json()["projects"]]
+        for _ in range(2)
+    ]
+
+    assert titles == [["replica-0"], ["replica-0"]]
+    assert cached_lists.stats()["endpoints"]["list_projects"]["misses"] == 1
+
+
+def test_list_cache_skips_replica_pages_right_after_a_write(
+    routed_client, cached_lists, client
+):
+    url = f"/clients/{client.id}/projects/"
+    routed_client.get(url)
+    created = routed_client.post(
+        url, json={"title": "New", "description": "New", "status": "pending"}
+    )
+    assert created.status_code == HTTPStatus.CREATED
+    routed_client.cookies.clear()
+
+    routed_client.get(url)
+    routed_client.get(url)
+
+    assert cached_lists.stats()["endpoints"]["list_projects"]["misses"] == 3
+
+    cached_lists.replica_lag = 0
+    routed_client.get(url)
+    routed_client.get(url)
+
+    assert cached_lists.stats()["endpoints"]["list_projects"]["misses"] == 4
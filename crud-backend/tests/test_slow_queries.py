@@ -0,0 +1,142 @@
+from collections import deque
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import Engine
+
+from crud_backend.database import get_slow_query_log, settings
+from crud_backend.main import app
+from crud_backend.slow_queries import SlowQueryLog, normalize_sql, parameter_shape
+
+ADMIN_TOKEN = "secret"
+
+
+@pytest.fixture
+def slow_log():
+    """Registra todos os comandos, com plano, de qualquer engine."""
+    log = SlowQueryLog(threshold=0, explain_rate=1.0, size=50)
+    log.listen(Engine)
+
+    yield log
+
+    log.remove(Engine)
+
+
+@pytest.fixture
+def admin_token(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", ADMIN_TOKEN)
+    return ADMIN_TOKEN
+
+
+@pytest.mark.parametrize(
+    ("statement", "normalized"),
+    [
+        (
+            "SELECT tasks.id FROM tasks\n  WHERE tasks.project_id = ? LIMIT ?",
+            "SELECT tasks.id FROM tasks WHERE tasks.project_id = ? LIMIT ?",
+        ),
+        (
+            "SELECT 1 FROM t WHERE id IN (?, ?, ?)",
+            "SELECT ? FROM t WHERE id IN (?, ...)",
+        ),
+        (
+            "SELECT a::text FROM t WHERE a = %(a_1)s AND b IN (%(b_1_1)s, %(b_1_2)s)",
+            "SELECT a::text FROM t WHERE a = ? AND b IN (?, ...)",
+        ),
+        (
+            "SELECT * FROM tasks_p01 WHERE title = 'it''s' AND id = $1",
+            "SELECT * FROM tasks_p01 WHERE title = ? AND id = ?",
+        ),
+    ],
+)
+def test_normalize_sql(statement, normalized):
+    assert normalize_sql(statement) == normalized
+
+
+@pytest.mark.parametrize(
+    ("parameters", "executemany", "shape"),
+    [
+        ((1, 2, 3, "a", None), False, "(int x3, str, NoneType)"),
+        ({"project_id": 1, "title": "a"}, False, "{project_id: int, title: str}"),
+        ([(1, "a"), (2, "b")], True, "2 x (int, str)"),
+        ((), False, "()"),
+    ],
+)
+def test_parameter_shape(parameters, executemany, shape):
+    assert parameter_shape(parameters, executemany) == shape
+
+
+def test_slow_queries_record_route_and_plan(app_client, project, slow_log, caplog):
+    app_client.get(f"/projects/{project.id}/tasks/?status=doing")
+
+    entry = next(entry for entry in slow_log.entries if "FROM tasks" in entry.sql)
+    assert (entry.method, entry.route) == ("GET", "/projects/{project_id}/tasks/")
+    assert "'doing'" not in entry.sql
+    assert entry.parameters.startswith("(int")
+    assert "ix_tasks_project_id_status_id" in entry.plan
+    assert f"GET /projects/{{project_id}}/tasks/: {entry.sql}" in caplog.text
+
+
+def test_writes_are_not_explained(app_client, project, slow_log):
+    app_client.post(
+        f"/projects/{project.id}/tasks/",
+        json={
+            "title": "Task",
+            "description": "Desc",
+            "assigned_to": "Ana",
+            "status": "doing",
+        },
+    )
+
+    entry = next(entry for entry in slow_log.entries if entry.sql.startswith("INSERT"))
+    assert entry.route == "/projects/{project_id}/tasks/"
+    assert entry.plan is None
+
+
+def test_fast_queries_are_ignored(session, project, slow_log):
+    slow_log.threshold = 60
+    session.get(type(project), project.id)
+
+    assert not slow_log.entries
+
+
+def test_buffer_keeps_most_recent(session, project, slow_log):
+    slow_log.entries = deque(maxlen=2)
+    slow_log.explain_rate = 0
+
+    for _ in range(3):
+        session.expunge_all()
+        session.get(type(project), project.id)
+
+    assert len(slow_log.entries) == 2
+    assert all(entry.route is None and entry.plan is None for entry in slow_log.entries)
+
+
+def test_admin_lists_slow_queries_newest_first(
+    app_client, project, slow_log, admin_token
+):
+    app.dependency_overrides[get_slow_query_log] = lambda: slow_log
+    app_client.get(f"/projects/{project.id}/tasks/")
+    recorded = list(slow_log.entries)
+
+    res = app_client.get("/admin/slow-queries", headers={"X-Admin-Token": admin_token})
+
+    assert res.status_code == HTTPStatus.OK
+    queries = res.json()["queries"]
+    assert [query["sql"] for query in queries] == [
+        entry.sql for entry in reversed(recorded)
+    ]
+    assert queries[0]["route"] == "/projects/{project_id}/tasks/"
+
+
+@pytest.mark.parametrize("headers", [{}, {"X-Admin-Token": "wrong"}])
+def test_admin_requires_token(app_client, admin_token, headers):
+    res = app_client.get("/admin/slow-queries", headers=headers)
+
+    assert res.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_admin_is_disabled_without_token(app_client):
+    res = app_client.get("/admin/slow-queries", headers={"X-Admin-Token": ""})
+
+    assert res.status_code == HTTPStatus.NOT_FOUND
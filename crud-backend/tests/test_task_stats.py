@@ -0,0 +1,132 @@
+from http import HTTPStatus
+
+from sqlalchemy import update
+
+from tests.conftest import ProjectFactory, TaskFactory
+from crud_backend.models.stats import ProjectTaskStats
+from crud_backend.models.tasks import TaskStatus
+from crud_backend.task_stats import rebuild_task_stats
+
+TASK = {
+    "title": "Task",
+    "description": "Task",
+    "status": "pending",
+    "assigned_to": "Ana",
+}
+
+
+def _stats(app_client, client, project):
+    res = app_client.get(f"/clients/{client.id}/projects/{project.id}/stats")
+    assert res.status_code == HTTPStatus.OK
+    return res.json()
+
+
+def test_stats_of_project_without_tasks(app_client, client, project):
+    assert _stats(app_client, client, project) == {
+        "project_id": project.id,
+        "pending": 0,
+        "doing": 0,
+        "completed": 0,
+        "paused": 0,
+        "deleted": 0,
+        "total": 0,
+    }
+
+
+def test_stats_follow_create_patch_and_delete(app_client, client, project):
+    app_client.post(f"/projects/{project.id}/tasks/", json=TASK)
+    app_client.post(f"/projects/{project.id}/tasks/bulk", json=[TASK] * 3)
+    app_client.patch(f"/projects/{project.id}/tasks/1", json={"status": "doing"})
+    app_client.patch(f"/projects/{project.id}/tasks/2", json={"title": "Renamed"})
+    app_client.delete(f"/projects/{project.id}/tasks/3")
+
+    stats = _stats(app_client, client, project)
+
+    assert stats["pending"] == 2
+    assert stats["doing"] == 1
+    assert stats["total"] == 3
+
+
+def test_stats_follow_bulk_update_and_delete(session, app_client, client, project):
+    other = ProjectFactory(client_id=client.id)
+    session.add(other)
+    session.bulk_save_objects(
+        TaskFactory.create_batch(4, project_id=project.id, status=TaskStatus.pending)
+    )
+    session.commit()
+
+    app_client.patch(
+        f"/projects/{project.id}/tasks/bulk",
+        json={"where": {"ids": [1, 2]}, "project_id": other.id},
+    )
+    app_client.patch(
+        f"/projects/{project.id}/tasks/bulk",
+        json={"where": {"ids": [3]}, "values": {"status": "completed"}},
+    )
+    app_client.request(
+        "DELETE", f"/projects/{project.id}/tasks/bulk", json={"ids": [4]}
+    )
+
+    stats = _stats(app_client, client, project)
+    moved = _stats(app_client, client, other)
+
+    assert (stats["pending"], stats["completed"], stats["total"]) == (0, 1, 1)
+    assert (moved["pending"], moved["total"]) == (2, 2)
+
+
+def test_stats_follow_import(app_client, client, project):
+    body = (
+        '{"title": "A", "description": "A", "status": "paused", "assigned_to": "X"}\n'
+    )
+
+    app_client.post(
+        f"/projects/{project.id}/tasks/import",
+        files={"file": ("tasks.ndjson", body * 3, "application/x-ndjson")},
+    )
+
+    assert _stats(app_client, client, project)["paused"] == 3
+
+
+def test_stats_project_not_found(app_client, client):
+    res = app_client.get(f"/clients/{client.id}/projects/9/stats")
+
+    assert res.status_code == HTTPStatus.NOT_FOUND
+    assert res.json() == {"detail": "Project not found"}
+
+
+def test_stats_client_not_found(app_client, project):
+    res = app_client.get(f"/clients/9/projects/{project.id}/stats")
+
+    assert res.status_code == HTTPStatus.NOT_FOUND
+    assert res.json() == {"detail": "Client not found"}
+
+
+def test_rebuild_task_stats_repairs_drift(session, client, project):
+    session.bulk_save_objects(
+        TaskFactory.create_batch(3, project_id=project.id, status=TaskStatus.doing)
+    )
+    session.commit()
+    session.execute(update(ProjectTaskStats).values(doing=42, deleted=7))
+    session.commit()
+
+    rebuilt = rebuild_task_stats(session)
+
+    stats = session.get(ProjectTaskStats, project.id, populate_existing=True)
+    assert rebuilt == 1
+    assert (stats.doing, stats.deleted, stats.pending) == (3, 0, 0)
+
+
+def test_rebuild_task_stats_for_one_project(session, client, project):
+    other = ProjectFactory(client_id=client.id)
+    session.add(other)
+    session.commit()
+    session.bulk_save_objects(TaskFactory.create_batch(2, project_id=project.id))
+    session.bulk_save_objects(TaskFactory.create_batch(2, project_id=other.id))
+    session.commit()
+    session.execute(update(ProjectTaskStats).values(paused=9))
+    session.commit()
+
+    rebuild_task_stats(session, project_id=project.id)
+
+    assert session.get(ProjectTaskStats, project.id, populate_existing=True).paused < 9
+    assert session.get(ProjectTaskStats, other.id, populate_existing=True).paused == 9
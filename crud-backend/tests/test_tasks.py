@@ -1,7 +1,10 @@
 from http import HTTPStatus
 
-from tests.conftest import TaskFactory
+from sqlalchemy import func, select
+
+from tests.conftest import ProjectFactory, TaskFactory
 from crud_backend.models.tasks import Task, TaskStatus
+from crud_backend.schemas.schemas import BULK_MAX_ITEMS
 
 
 def test_create_task(app_client, mock_db_time, project):
@@ -43,6 +46,155 @@ def test_create_task_project_not_found(app_client):
     assert res.json() == {"detail": "Project not found"}
 
 
+def test_create_tasks_bulk(session, app_client, project):
+    res = app_client.post(
+        f"/projects/{project.id}/tasks/bulk",
+        json=[
+            {
+                "title": f"Task {i}",
+                "description": "Bulk",
+                "status": "pending",
+                "assigned_to": "TI",
+            }
+            for i in range(3)
+        ],
+    )
+
+    assert res.status_code == HTTPStatus.CREATED
+    assert [t["title"] for t in res.json()["created"]] == ["Task 0", "Task 1", "Task 2"]
+    assert session.scalar(select(func.count()).select_from(Task)) == 3
+
+
+def test_create_tasks_bulk_project_not_found(app_client):
+    res = app_client.post("/projects/4/tasks/bulk", json=[])
+
+    assert res.status_code == HTTPStatus.NOT_FOUND
+    assert res.json() == {"detail": "Project not found"}
+
+
+def test_create_tasks_bulk_rejects_oversized_batch(app_client, project):
+    task = {"title": "T", "description": "D", "status": "pending", "assigned_to": "TI"}
+
+    res = app_client.post(
+        f"/projects/{project.id}/tasks/bulk", json=[task] * (BULK_MAX_ITEMS + 1)
+    )
+
+    assert res.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_update_tasks_bulk_by_filter(session, app_client, project):
+    session.bulk_save_objects(
+        TaskFactory.create_batch(3, project_id=project.id, status=TaskStatus.pending)
+    )
+    session.bulk_save_objects(
+        TaskFactory.create_batch(2, project_id=project.id, status=TaskStatus.doing)
+    )
+    session.commit()
+
+    res = app_client.patch(
+        f"/projects/{project.id}/tasks/bulk",
+        json={"where": {"status": "pending"}, "values": {"status": "completed"}},
+    )
+
+    assert res.status_code == HTTPStatus.OK
+    assert res.json() == {"affected": 3}
+    completed = app_client.get(f"/projects/{project.id}/tasks/?status=completed")
+    assert len(completed.json()["tasks"]) == 3
+
+
+def test_update_tasks_bulk_moves_tasks_by_ids(session, app_client, project):
+    other = ProjectFactory()
+    session.add(other)
+    session.bulk_save_objects(TaskFactory.create_batch(3, project_id=project.id))
+    session.commit()
+
+    res = app_client.patch(
+        f"/projects/{project.id}/tasks/bulk",
+        json={"where": {"ids": [1, 2]}, "project_id": other.id},
+    )
+
+    assert res.json() == {"affected": 2}
+    moved = app_client.get(f"/projects/{other.id}/tasks/")
+    assert [t["id"] for t in moved.json()["tasks"]] == [1, 2]
+
+
+def test_update_tasks_bulk_target_project_not_found(app_client, project):
+    res = app_client.patch(
+        f"/projects/{project.id}/tasks/bulk",
+        json={"where": {"ids": [1]}, "project_id": 99},
+    )
+
+    assert res.status_code == HTTPStatus.NOT_FOUND
+    assert res.json() == {"detail": "Target project not found"}
+
+
+def test_update_tasks_bulk_target_project_deleted_after_cached(
+    session, app_client, client, project, task, foreign_keys
+):
+    other = ProjectFactory()
+    session.add(other)
+    session.commit()
+    url = f"/projects/{project.id}/tasks/bulk"
+    app_client.patch(url, json={"where": {"ids": [99]}, "project_id": other.id})
+    session.delete(other)
+    session.commit()
+
+    res = app_client.patch(
+        url, json={"where": {"ids": [task.id]}, "project_id": other.id}
+    )
+
+    assert res.status_code == HTTPStatus.NOT_FOUND
+    assert res.json() == {"detail": "Target project not found"}
+    moved = app_client.get(f"/projects/{other.id}/tasks/")
+    assert moved.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_update_tasks_bulk_rejects_null_values(app_client, project, task):
+    url = f"/projects/{project.id}/tasks/bulk"
+
+    res = app_client.patch(
+        url, json={"where": {"ids": [task.id]}, "values": {"title": None}}
+    )
+
+    assert res.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    unchanged = app_client.get(f"/projects/{project.id}/tasks/{task.id}")
+    assert unchanged.json()["title"] == task.title
+
+
+def test_update_tasks_bulk_requires_selection(app_client, project):
+    res = app_client.patch(
+        f"/projects/{project.id}/tasks/bulk",
+        json={"where": {}, "values": {"status": "completed"}},
+    )
+
+    assert res.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_delete_tasks_bulk_by_filter(session, app_client, project):
+    session.bulk_save_objects(
+        TaskFactory.create_batch(2, project_id=project.id, assigned_to="Ana")
+    )
+    session.bulk_save_objects(
+        TaskFactory.create_batch(3, project_id=project.id, assigned_to="Bia")
+    )
+    session.commit()
+
+    res = app_client.request(
+        "DELETE", f"/projects/{project.id}/tasks/bulk", json={"assigned_to": "Ana"}
+    )
+
+    assert res.json() == {"affected": 2}
+    remaining = app_client.get(f"/projects/{project.id}/tasks/")
+    assert {t["assigned_to"] for t in remaining.json()["tasks"]} == {"Bia"}
+
+
+def test_delete_tasks_bulk_project_not_found(app_client):
+    res = app_client.request("DELETE", "/projects/10/tasks/bulk", json={"ids": [1]})
+
+    assert res.status_code == HTTPStatus.NOT_FOUND
+    assert res.json() == {"detail": "Project not found"}
+
+
 def test_list_tasks_should_return_5_tasks(session, app_client, project):
     expected_todos = 5
     session.bulk_save_objects(TaskFactory.create_batch(5, project_id=project.id))
@@ -63,6 +215,65 @@ def test_list_tasks_pagination_should_return_2_tasks(session, app_client, projec
     assert len(res.json()["tasks"]) == expected_todos
 
 
+def test_list_tasks_cursor_pagination_should_walk_all_tasks(
+    session, app_client, project
+):
+    session.bulk_save_objects(TaskFactory.create_batch(5, project_id=project.id))
+    session.commit()
+
+    first_page = app_client.get(f"/projects/{project.id}/tasks/?limit=2").json()
+    second_page = app_client.get(
+        f"/projects/{project.id}/tasks/?limit=2&cursor={first_page['next_cursor']}"
+    ).json()
+    last_page = app_client.get(
+        f"/projects/{project.id}/tasks/?limit=2&cursor={second_page['next_cursor']}"
+    ).json()
+
+    assert [t["id"] for t in first_page["tasks"]] == [1, 2]
+    assert [t["id"] for t in second_page["tasks"]] == [3, 4]
+    assert [t["id"] for t in last_page["tasks"]] == [5]
+    assert last_page["next_cursor"] is None
+
+
+def test_list_tasks_total_counts_filtered_tasks_on_every_page(
+    session, app_client, project
+):
+    session.bulk_save_objects(
+        TaskFactory.create_batch(3, project_id=project.id, status=TaskStatus.doing)
+    )
+    session.bulk_save_objects(
+        TaskFactory.create_batch(2, project_id=project.id, status=TaskStatus.paused)
+    )
+    session.commit()
+
+    first_page = app_client.get(
+        f"/projects/{project.id}/tasks/?limit=2&status=doing"
+    ).json()
+    second_page = app_client.get(
+        f"/projects/{project.id}/tasks/?limit=2&status=doing"
+        f"&cursor={first_page['next_cursor']}"
+    ).json()
+    past_end = app_client.get(f"/projects/{project.id}/tasks/?offset=10").json()
+
+    assert first_page["total"] == 3
+    assert second_page["total"] == 3
+    assert past_end == {"tasks": [], "total": 5, "next_cursor": None}
+
+
+def test_list_tasks_include_total_false_skips_count(
+    session, app_client, project, captured_statements
+):
+    session.bulk_save_objects(TaskFactory.create_batch(2, project_id=project.id))
+    session.commit()
+    captured_statements.clear()
+
+    res = app_client.get(f"/projects/{project.id}/tasks/?include_total=false")
+
+    assert res.json()["total"] is None
+    assert len(res.json()["tasks"]) == 2
+    assert not any("count(" in sql for sql, _ in captured_statements)
+
+
 def test_list_tasks_filter_title_should_return_5_tasks(session, app_client, project):
     expected_todos = 5
     session.bulk_save_objects(
@@ -75,6 +286,45 @@ def test_list_tasks_filter_title_should_return_5_tasks(session, app_client, proj
     assert len(res.json()["tasks"]) == expected_todos
 
 
+def test_list_tasks_filter_title_is_case_sensitive_by_default(
+    session, app_client, project
+):
+    session.bulk_save_objects(
+        TaskFactory.create_batch(2, project_id=project.id, title="Deploy API")
+    )
+    session.commit()
+
+    res = app_client.get(f"/projects/{project.id}/tasks/?title=deploy")
+
+    assert res.json()["tasks"] == []
+
+
+def test_list_tasks_filter_title_case_insensitive_should_return_2_tasks(
+    session, app_client, project
+):
+    expected_todos = 2
+    session.bulk_save_objects(
+        TaskFactory.create_batch(2, project_id=project.id, title="Deploy API")
+    )
+    session.commit()
+
+    res = app_client.get(
+        f"/projects/{project.id}/tasks/?title=deploy&case_insensitive=true"
+    )
+
+    assert len(res.json()["tasks"]) == expected_todos
+
+
+def test_list_tasks_filter_title_after_patch(app_client, project, task):
+    app_client.patch(
+        f"/projects/{project.id}/tasks/{task.id}", json={"title": "Renamed task"}
+    )
+
+    res = app_client.get(f"/projects/{project.id}/tasks/?title=Renamed")
+
+    assert [t["id"] for t in res.json()["tasks"]] == [task.id]
+
+
 def test_list_tasks_filter_description_should_return_5_tasks(
     session, app_client, project
 ):
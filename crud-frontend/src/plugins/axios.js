@@ -4,6 +4,8 @@ const axiosInstance = axios.create({
   baseURL: 'http://localhost:8000/',
   timeout: 1000,
   headers: { 'Content-Type': 'application/json' },
+  // Envia o cookie read_primary_until, que mantém as leituras no primário após uma escrita
+  withCredentials: true,
 })
 
 export default {